@@ -22,7 +22,15 @@ from agentlightning.adapter.messages import TraceToMessages
 from agentlightning.algorithm.base import Algorithm
 from agentlightning.algorithm.utils import batch_iter_over_dataset
 from agentlightning.reward import find_final_reward
-from agentlightning.types import Dataset, NamedResources, PromptTemplate, Rollout, RolloutMode, RolloutStatus
+from agentlightning.types import (
+    Dataset,
+    EnqueueRolloutRequest,
+    NamedResources,
+    PromptTemplate,
+    Rollout,
+    RolloutMode,
+    RolloutStatus,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -440,10 +448,12 @@ class APO(Algorithm, Generic[T_task]):
         resources: NamedResources = {resource_name: prompt.prompt_template}
         resource_update = await store.update_resources(prompt.version, resources)
 
-        rollout_ids: List[str] = []
-        for t in dataset:
-            r = await store.enqueue_rollout(input=t, mode=mode, resources_id=resource_update.resources_id)
-            rollout_ids.append(r.rollout_id)
+        rollouts = await store.enqueue_rollouts(
+            [EnqueueRolloutRequest(input=t) for t in dataset],
+            mode=mode,
+            resources_id=resource_update.resources_id,
+        )
+        rollout_ids: List[str] = [r.rollout_id for r in rollouts]
 
         deadline = time.time() + self.rollout_batch_timeout
         finished: List[Rollout] = []
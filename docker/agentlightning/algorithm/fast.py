@@ -7,7 +7,7 @@ import logging
 from datetime import datetime
 from typing import Any, List, Literal, Optional
 
-from agentlightning.types import Attempt, Dataset, Rollout, RolloutStatus, Span
+from agentlightning.types import Attempt, Dataset, EnqueueRolloutRequest, Rollout, RolloutStatus, Span
 
 from .base import Algorithm
 
@@ -120,10 +120,14 @@ class Baseline(FastAlgorithm):
                 attempt.status,
                 attempt.worker_id,
             )
-            spans = await store.query_spans(rollout_id=rollout_id)
+            if self.span_verbosity == "none":
+                continue
+            # Only load what `_span_to_string` prints, not the events, links and resources of the spans.
+            spans = await store.query_spans(
+                rollout_id=rollout_id, fields=["name", "start_time", "end_time", "attributes"]
+            )
             for span in spans:
-                if self.span_verbosity != "none":
-                    logger.info(self._span_to_string(rollout.rollout_id, attempt, span))
+                logger.info(self._span_to_string(rollout.rollout_id, attempt, span))
 
         # Attempts to adapt the spans using the adapter if provided
         try:
@@ -217,23 +221,33 @@ class Baseline(FastAlgorithm):
         for epoch in range(self.n_epochs):
             harvest_tasks: List[asyncio.Task[None]] = []
             logger.info(f"Proceeding epoch {epoch + 1}/{self.n_epochs}.")
-            for index in train_indices + val_indices:
+            pending_indices = train_indices + val_indices
+            while pending_indices:
+                queuing_rollouts = await store.query_rollouts(status_in=["queuing", "requeuing"])
+                # Keep at most "max_queue_length + 1" rollouts in the queue, filling free slots in one request.
+                num_free_slots = self.max_queue_length + 1 - len(queuing_rollouts)
+                if num_free_slots <= 0:
+                    # Sleep a bit and try again later.
+                    await asyncio.sleep(self.polling_interval)
+                    continue
+                chunk, pending_indices = pending_indices[:num_free_slots], pending_indices[num_free_slots:]
                 logger.info(
-                    f"Processing index {index}. {len(train_indices)} train indices and {len(val_indices)} val indices in total."
+                    f"Processing indices {chunk}. {len(train_indices)} train indices and {len(val_indices)} val indices in total."
                 )
-                while True:
-                    queuing_rollouts = await store.query_rollouts(status_in=["queuing", "requeuing"])
-                    if len(queuing_rollouts) <= self.max_queue_length:
-                        # Only enqueue a new rollout when there is at most "max_queue_length" rollout in the queue.
-                        sample = concatenated_dataset[index]
-                        mode = "train" if index in train_indices else "val"
-                        rollout = await store.enqueue_rollout(input=sample, mode=mode, resources_id=resources_id)
-                        harvest_tasks.append(asyncio.create_task(self._harvest_rollout_spans(rollout.rollout_id)))
-                        logger.info(f"Enqueued rollout {rollout.rollout_id} in {mode} mode with sample: {sample}")
-                        break
-                    else:
-                        # Sleep a bit and try again later.
-                        await asyncio.sleep(self.polling_interval)
+                rollouts = await store.enqueue_rollouts(
+                    [
+                        EnqueueRolloutRequest(
+                            input=concatenated_dataset[index], mode="train" if index in train_indices else "val"
+                        )
+                        for index in chunk
+                    ],
+                    resources_id=resources_id,
+                )
+                for rollout in rollouts:
+                    harvest_tasks.append(asyncio.create_task(self._harvest_rollout_spans(rollout.rollout_id)))
+                    logger.info(
+                        f"Enqueued rollout {rollout.rollout_id} in {rollout.mode} mode with sample: {rollout.input}"
+                    )
 
             # Wait for all harvest tasks to complete
             logger.info(f"Waiting for {len(harvest_tasks)} harvest tasks to complete...")
@@ -11,6 +11,7 @@ from typing import Iterable
 
 from agentlightning import setup_logging
 from agentlightning.store.client_server import LightningStoreServer
+from agentlightning.store.collection_based import DEFAULT_WATCHDOG_INTERVAL
 from agentlightning.store.memory import InMemoryLightningStore
 
 logger = logging.getLogger(__name__)
@@ -47,9 +48,19 @@ def main(argv: Iterable[str] | None = None) -> int:
         ),
     )
 
+    parser.add_argument(
+        "--watchdog-interval",
+        default=DEFAULT_WATCHDOG_INTERVAL,
+        type=float,
+        help=(
+            "Seconds between two healthcheck sweeps of the store watchdog, which detects timeout and unresponsive attempts. "
+            "Set to 0 to disable the watchdog and check the health before every store call instead."
+        ),
+    )
+
     parser.add_argument(
         "--backend",
-        choices=["memory", "mongo"],
+        choices=["memory", "sqlite", "mongo"],
         default="memory",
         help="Backend to use for the store.",
     )
@@ -58,17 +69,99 @@ def main(argv: Iterable[str] | None = None) -> int:
         default="mongodb://localhost:27017/?replicaSet=rs0",
         help="MongoDB URI to use for the store. Applicable only if --backend is 'mongo'.",
     )
+    parser.add_argument(
+        "--mongo-read-concern",
+        choices=["local", "available", "majority", "snapshot"],
+        default="local",
+        help=(
+            "Read concern of the store queries, which run outside of transactions. "
+            "Applicable only if --backend is 'mongo'."
+        ),
+    )
+    parser.add_argument(
+        "--mongo-span-write-mode",
+        choices=["transaction", "fast"],
+        default="transaction",
+        help=(
+            "Write spans in transactions, or with idempotent single-document writes without a transaction. "
+            "Applicable only if --backend is 'mongo'."
+        ),
+    )
+    parser.add_argument(
+        "--mongo-span-payload-min-bytes",
+        type=int,
+        default=None,
+        help=(
+            "Store the span attribute values of at least this many bytes zlib-compressed. "
+            "Applicable only if --backend is 'mongo'."
+        ),
+    )
+    parser.add_argument(
+        "--sqlite-path",
+        default="agentlightning.db",
+        help="Path to the SQLite database file. Applicable only if --backend is 'sqlite'.",
+    )
+    parser.add_argument(
+        "--span-spill-dir",
+        default=None,
+        help=(
+            "Directory to spill evicted spans to instead of dropping them. " "Applicable only if --backend is 'memory'."
+        ),
+    )
+    parser.add_argument(
+        "--span-spill-compress",
+        action="store_true",
+        help="Compress the spilled spans with zlib. Applicable only if --span-spill-dir is set.",
+    )
+    parser.add_argument(
+        "--journal-dir",
+        default=None,
+        help=(
+            "Directory of a write-ahead journal to recover the store from after a restart. "
+            "Applicable only if --backend is 'memory'."
+        ),
+    )
+    parser.add_argument(
+        "--journal-snapshot-interval",
+        type=float,
+        default=300.0,
+        help="Minimum seconds between two snapshots of the journal. Set to 0 to disable snapshots.",
+    )
 
     args = parser.parse_args(list(argv) if argv is not None else None)
 
     setup_logging(args.log_level)
 
+    watchdog_interval = args.watchdog_interval if args.watchdog_interval > 0 else None
+
     if args.backend == "memory":
-        store = InMemoryLightningStore()
+        store = InMemoryLightningStore(
+            watchdog_interval=watchdog_interval,
+            span_spill_dir=args.span_spill_dir,
+            span_spill_compression=args.span_spill_compress,
+            journal_dir=args.journal_dir,
+            journal_snapshot_interval=args.journal_snapshot_interval if args.journal_snapshot_interval > 0 else None,
+        )
+    elif args.backend == "sqlite":
+        from agentlightning.store.sqlite import SqliteLightningStore
+
+        store = SqliteLightningStore(args.sqlite_path, watchdog_interval=watchdog_interval)
     elif args.backend == "mongo":
+        from agentlightning.store.collection.mongo_codec import MongoPayloadCodec
         from agentlightning.store.mongo import MongoLightningStore
 
-        store = MongoLightningStore(client=args.mongo_uri)
+        span_payload_codec = (
+            MongoPayloadCodec({"attributes": {"action": "compress", "min_bytes": args.mongo_span_payload_min_bytes}})
+            if args.mongo_span_payload_min_bytes is not None
+            else None
+        )
+        store = MongoLightningStore(
+            client=args.mongo_uri,
+            watchdog_interval=watchdog_interval,
+            read_concern=args.mongo_read_concern,
+            span_write_mode=args.mongo_span_write_mode,
+            span_payload_codec=span_payload_codec,
+        )
     else:
         raise ValueError(f"Invalid backend: {args.backend}")
 
@@ -409,16 +409,15 @@ class LightningSpanExporter(SpanExporter):
 
             else:
                 # The old way: store does not support OTLP endpoint
-                for span in subtree_spans:
-                    loop = self._ensure_loop()
-                    add_otel_span_task = store.add_otel_span(
-                        rollout_id=rollout_id,
-                        attempt_id=attempt_id,
-                        sequence_id=sequence_id_decimal,
-                        readable_span=span,
-                    )
-                    fut = asyncio.run_coroutine_threadsafe(add_otel_span_task, loop)
-                    fut.result()  # Bubble up any exceptions from the coroutine.
+                loop = self._ensure_loop()
+                add_otel_spans_task = store.add_otel_spans(
+                    rollout_id=rollout_id,
+                    attempt_id=attempt_id,
+                    sequence_id=sequence_id_decimal,
+                    readable_spans=subtree_spans,
+                )
+                fut = asyncio.run_coroutine_threadsafe(add_otel_spans_task, loop)
+                fut.result()  # Bubble up any exceptions from the coroutine.
 
     def _get_root_span_ids(self) -> Iterable[int]:
         """Yield span_ids for root spans currently in the buffer.
@@ -75,6 +75,7 @@ class LitAgentRunner(Runner[T_task]):
         heartbeat_interval: float = 10.0,
         interval_jitter: float = 0.1,
         heartbeat_launch_mode: Literal["asyncio", "thread"] = "asyncio",
+        long_poll: bool = True,
     ) -> None:
         """Initialize the agent runner.
 
@@ -89,6 +90,9 @@ class LitAgentRunner(Runner[T_task]):
                 This is to avoid the overload caused by the synchronization of the runners.
             heartbeat_launch_mode: Launch mode for the heartbeat loop. Can be "asyncio" or "thread".
                 "asyncio" is the default and recommended mode. Use "thread" if you are experiencing blocking coroutines.
+            long_poll: Whether to block in the store's `dequeue_rollout` for up to `poll_interval` seconds
+                until a rollout is queued, instead of sleeping between non-blocking polls.
+                The stop event is then checked at least once per `poll_interval`.
         """
         super().__init__()
         self._tracer = tracer
@@ -97,6 +101,7 @@ class LitAgentRunner(Runner[T_task]):
         self._heartbeat_interval = heartbeat_interval
         self._interval_jitter = interval_jitter
         self._heartbeat_launch_mode = heartbeat_launch_mode
+        self._long_poll = long_poll
         self._random_state = random.Random()
 
         # Set later
@@ -303,10 +308,11 @@ class LitAgentRunner(Runner[T_task]):
                 if not isinstance(
                     self._tracer, AgentOpsTracer
                 ):  # TODO: this should be replaced with general OpenTelemetry tracer in next version
-                    for span in raw_result:
-                        await store.add_otel_span(
-                            rollout.rollout_id, rollout.attempt.attempt_id, cast(ReadableSpan, span)
-                        )
+                    await store.add_otel_spans(
+                        rollout.rollout_id,
+                        rollout.attempt.attempt_id,
+                        [cast(ReadableSpan, span) for span in raw_result],
+                    )
                 else:
                     logger.warning(
                         f"{self._log_prefix(rollout.rollout_id)} Tracer is already an OpenTelemetry tracer. "
@@ -317,8 +323,7 @@ class LitAgentRunner(Runner[T_task]):
             # Case 3: result is a list of Span (agentlightning spans)
             elif len(raw_result) > 0 and all(isinstance(t, Span) for t in raw_result):
                 # Add the spans directly to the store
-                for span in raw_result:
-                    await store.add_span(cast(Span, span))
+                await store.add_spans([cast(Span, span) for span in raw_result])
                 trace_spans = raw_result
 
             # Left over cases for list
@@ -538,7 +543,8 @@ class LitAgentRunner(Runner[T_task]):
     async def iter(self, *, event: Optional[ExecutionEvent] = None) -> None:
         """Run the runner, continuously iterating over tasks in the store.
 
-        This method polls the store for new rollouts and executes them until:
+        This method long-polls the store for new rollouts (or polls it every `poll_interval` seconds
+        when `long_poll` is disabled) and executes them until:
 
         - The event is set (if provided)
         - The max_rollouts limit is reached (if configured)
@@ -565,6 +571,23 @@ class LitAgentRunner(Runner[T_task]):
                 next_rollout: Optional[Rollout] = None
                 while not (event is not None and event.is_set()):
                     logger.debug(f"{self._log_prefix()} Try to poll for next rollout.")
+                    if self._long_poll:
+                        poll_start = time.time()
+                        next_rollout = await store.dequeue_rollout(
+                            worker_id=self.get_worker_id(), wait_timeout=self._poll_interval
+                        )
+                        if next_rollout is not None:
+                            break
+                        if time.time() - poll_start >= self._poll_interval:
+                            # The store has already waited for the whole interval.
+                            continue
+                        # Returned early without a rollout (e.g., the server is unreachable). Back off.
+                        logger.debug(
+                            f"{self._log_prefix()} Long poll returned early. Waiting for {self._poll_interval} seconds."
+                        )
+                        await self._sleep_until_next_poll(event)
+                        continue
+
                     next_rollout = await store.dequeue_rollout(worker_id=self.get_worker_id())
                     if next_rollout is None:
                         logger.debug(
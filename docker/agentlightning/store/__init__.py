@@ -4,6 +4,7 @@ from .base import LightningStore, LightningStoreCapabilities
 from .client_server import LightningStoreClient, LightningStoreServer
 from .collection_based import CollectionBasedLightningStore
 from .memory import InMemoryLightningStore
+from .sqlite import SqliteLightningStore
 from .threading import LightningStoreThreaded
 
 __all__ = [
@@ -12,6 +13,7 @@ __all__ = [
     "LightningStoreClient",
     "LightningStoreServer",
     "InMemoryLightningStore",
+    "SqliteLightningStore",
     "CollectionBasedLightningStore",
     "LightningStoreThreaded",
 ]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal, Optional, Sequence, TypedDict
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence, TypedDict
 
 from opentelemetry.sdk.trace import ReadableSpan
 
@@ -10,6 +10,7 @@ from agentlightning.types import (
     Attempt,
     AttemptedRollout,
     AttemptStatus,
+    EnqueueRolloutRequest,
     NamedResources,
     ResourcesUpdate,
     Rollout,
@@ -53,6 +54,9 @@ def _get_unset() -> _UnsetType:
 UNSET = _UnsetType()
 Unset = _UnsetType  # Alias for convenience
 
+MAX_SPAN_BATCH_SIZE = 10000
+"""Largest number of spans fetched per round trip by `iter_spans`; larger batch sizes are clamped to it."""
+
 
 class LightningStoreCapabilities(TypedDict, total=False):
     """Capability of a LightningStore implementation.
@@ -192,10 +196,48 @@ class LightningStore:
         """
         raise NotImplementedError()
 
-    async def dequeue_rollout(self, worker_id: Optional[str] = None) -> Optional[AttemptedRollout]:
+    async def enqueue_rollouts(
+        self,
+        items: Sequence[EnqueueRolloutRequest],
+        *,
+        mode: Literal["train", "val", "test"] | None = None,
+        resources_id: str | None = None,
+        config: RolloutConfig | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> Sequence[Rollout]:
+        """Persist a batch of rollouts in `queuing` state in one store operation.
+
+        Semantically equivalent to calling [`enqueue_rollout()`][agentlightning.LightningStore.enqueue_rollout]
+        for each item in order, but implementations are expected to insert the rollouts and append them
+        to the scheduling queue under a single lock or transaction.
+
+        The keyword arguments act as defaults for every item: an item's `mode`, `resources_id` and
+        `config` win when set, and an item's `metadata` is merged on top of the batch-level `metadata`.
+        When neither provides a `resources_id`, the latest resources are resolved once for the whole batch.
+
+        Args:
+            items: The rollouts to enqueue.
+            mode: Default mode for items that do not specify one.
+            resources_id: Default resource snapshot for items that do not specify one.
+            config: Default retry/timeout parameters for items that do not specify one.
+            metadata: Metadata shared by all items.
+
+        Returns:
+            The stored rollouts in `queuing` status, in the same order as `items`.
+
+        Raises:
+            NotImplementedError: Subclasses must implement batched enqueueing.
+        """
+        raise NotImplementedError()
+
+    async def dequeue_rollout(
+        self, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Optional[AttemptedRollout]:
         """Claim the oldest queued rollout and transition it to `preparing`.
 
-        This function do not block.
+        This function do not block unless `wait_timeout` is given. With a positive `wait_timeout`,
+        implementations should wait (without busy polling where possible) until a rollout is
+        enqueued or requeued, and give up after `wait_timeout` seconds.
 
         Retrieval must be FIFO across rollouts that remain in `queuing` or `requeuing`
         state. When a rollout is claimed, implementations must:
@@ -208,14 +250,46 @@ class LightningStore:
         * Optionally refresh the caller's [`Worker`][agentlightning.Worker] telemetry
           (e.g., `last_dequeue_time`) when `worker_id` is provided.
 
+        Args:
+            worker_id: Identifier of the worker claiming the rollout.
+            wait_timeout: Maximum seconds to block waiting for a rollout to be queued.
+                `None` or non-positive values return immediately.
+
         Returns:
-            The next attempt to execute, or `None` when no eligible rollouts are queued.
+            The next attempt to execute, or `None` when no eligible rollouts are queued
+            (before `wait_timeout` elapses).
 
         Raises:
             NotImplementedError: Subclasses must implement queue retrieval.
         """
         raise NotImplementedError()
 
+    async def dequeue_rollouts(
+        self, limit: int, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Sequence[AttemptedRollout]:
+        """Claim up to `limit` of the oldest queued rollouts in a single call.
+
+        Each claimed rollout goes through the same transition as in
+        [`dequeue_rollout()`][agentlightning.LightningStore.dequeue_rollout]: it becomes
+        `"preparing"` and receives a fresh attempt. Implementations should claim the whole batch
+        atomically (e.g., one lock acquisition or one transaction) so that runners buffering
+        work locally pay for a single round trip.
+
+        Args:
+            limit: Maximum number of rollouts to claim. Must be positive.
+            worker_id: Identifier of the worker claiming the rollouts.
+            wait_timeout: Maximum seconds to block until at least one rollout is queued.
+                `None` or non-positive values return immediately.
+
+        Returns:
+            The claimed rollouts in FIFO order. Empty when no eligible rollouts are queued.
+
+        Raises:
+            NotImplementedError: Subclasses must implement batch queue retrieval.
+            ValueError: Implementations must raise when `limit` is not positive.
+        """
+        raise NotImplementedError()
+
     async def start_attempt(self, rollout_id: str) -> AttemptedRollout:
         """Create a manual retry attempt for an existing rollout.
 
@@ -292,6 +366,61 @@ class LightningStore:
         """
         raise NotImplementedError()
 
+    async def add_spans(self, spans: Sequence[Span]) -> Sequence[Span]:
+        """Persist a batch of pre-constructed spans in one store operation.
+
+        Semantically equivalent to calling [`add_span()`][agentlightning.LightningStore.add_span]
+        for each span in order, but implementations are expected to validate, insert, and
+        record heartbeats for the whole batch under a single lock or transaction.
+        Spans may belong to different rollouts and attempts.
+
+        Implementations must:
+
+        * Validate every referenced rollout and attempt before persisting anything.
+        * Skip (and log) spans that already exist, exactly like `add_span()`.
+        * Update each touched attempt's heartbeat and status at most once per batch.
+
+        Args:
+            spans: Fully populated spans to persist.
+
+        Returns:
+            The stored span records, in the same order as the input.
+
+        Raises:
+            NotImplementedError: Subclasses must implement batched span persistence.
+            ValueError: Implementations must raise when any referenced rollout or attempt is missing.
+        """
+        raise NotImplementedError()
+
+    async def add_otel_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str,
+        readable_spans: Sequence[ReadableSpan],
+        sequence_id: int | None = None,
+    ) -> Sequence[Span]:
+        """Convert and persist a batch of OpenTelemetry spans for a particular attempt.
+
+        The batched counterpart of [`add_otel_span()`][agentlightning.LightningStore.add_otel_span].
+        When `sequence_id` is omitted, each span receives its own strictly increasing sequence ID
+        (in input order). When it is provided, every span in the batch shares it, which matches how
+        exporters tag all spans flushed from one subtree.
+
+        Args:
+            rollout_id: Identifier of the rollout that produced the spans.
+            attempt_id: Attempt identifier the spans belong to.
+            readable_spans: OpenTelemetry spans in SDK form.
+            sequence_id: Optional explicit ordering hint shared by all spans in the batch.
+
+        Returns:
+            The stored span records, in the same order as the input.
+
+        Raises:
+            NotImplementedError: Subclasses must implement batched span persistence.
+            ValueError: Implementations must raise when the rollout or attempt is unknown.
+        """
+        raise NotImplementedError()
+
     async def query_rollouts(
         self,
         *,
@@ -485,6 +614,28 @@ class LightningStore:
         """
         raise NotImplementedError()
 
+    async def get_next_span_sequence_ids(self, rollout_id: str, attempt_id: str, count: int) -> List[int]:
+        """Allocate `count` consecutive sequence numbers at once.
+
+        The batched counterpart of [`get_next_span_sequence_id()`][agentlightning.LightningStore.get_next_span_sequence_id],
+        for callers that number a batch of spans themselves (e.g., before
+        [`add_spans()`][agentlightning.LightningStore.add_spans]). The default implementation calls
+        `get_next_span_sequence_id()` once per number; implementations should reserve the block with one
+        counter update.
+
+        Args:
+            rollout_id: Identifier of the rollout emitting spans.
+            attempt_id: Attempt identifier for the upcoming spans.
+            count: How many sequence numbers to allocate.
+
+        Returns:
+            The allocated sequence numbers, in increasing order (empty if `count` is not positive).
+
+        Raises:
+            ValueError: Implementations must raise when the rollout or attempt does not exist.
+        """
+        return [await self.get_next_span_sequence_id(rollout_id, attempt_id) for _ in range(count)]
+
     async def wait_for_rollouts(self, *, rollout_ids: List[str], timeout: Optional[float] = None) -> List[Rollout]:
         """Block until the targeted rollouts reach a terminal status or the timeout expires.
 
@@ -532,6 +683,9 @@ class LightningStore:
         # Sorting
         sort_by: Optional[str] = "sequence_id",
         sort_order: Literal["asc", "desc"] = "asc",
+        # Projection
+        fields: Optional[Sequence[str]] = None,
+        attributes_prefix: Optional[Sequence[str]] = None,
     ) -> Sequence[Span]:
         """Return the stored spans for a rollout, optionally scoped to one attempt.
 
@@ -562,10 +716,16 @@ class LightningStore:
             sort_by: Field to sort by. Must be a numeric or string field of
                 [`Span`][agentlightning.Span].
             sort_order: Order to sort by.
+            fields: Fields of [`Span`][agentlightning.Span] to load, or `None` for all of them.
+                `rollout_id`, `attempt_id`, `sequence_id`, `trace_id` and `span_id` are always loaded;
+                the other fields are left empty (e.g., `{}`, `[]` or `None`).
+            attributes_prefix: Only load the attributes whose key starts with one of these prefixes,
+                e.g., `["gen_ai."]`. Implies loading `attributes`.
 
         Returns:
             An ordered list of spans (possibly empty).
             The return value is not guaranteed to be a list.
+            Spans loaded with a projection are read-only views: they must not be written back to the store.
 
         Raises:
             NotImplementedError: Subclasses must implement the query.
@@ -573,6 +733,105 @@ class LightningStore:
         """
         raise NotImplementedError()
 
+    async def iter_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str | Literal["latest"] | None = None,
+        *,
+        after_sequence_id: Optional[int] = None,
+        after_span_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Span]:
+        """Stream the spans of a rollout in `(sequence_id, span_id)` order, fetching them batch by batch.
+
+        Unlike [`query_spans()`][agentlightning.LightningStore.query_spans], only one batch is held in memory
+        at a time, which suits rollouts with many spans. An interrupted iteration can be resumed by passing
+        the `sequence_id` and `span_id` of the last span received as the cursor.
+
+        The default implementation pages through `query_spans()` by offset, holding back the spans tied on
+        the last `sequence_id` of a batch until the whole tied group is read, and locates a cursor with a
+        binary search over the offsets. Stores that support it override this with keyset pagination,
+        where the cost of a batch does not grow with its position.
+
+        Args:
+            rollout_id: Identifier of the rollout being inspected.
+            attempt_id: Attempt identifier to filter by. `"latest"` is resolved once, when the iteration starts.
+                `None` streams the spans across every attempt.
+            after_sequence_id: Only yield spans after this sequence ID.
+            after_span_id: Together with `after_sequence_id`, also yield the spans with a sequence ID equal
+                to `after_sequence_id` and a span ID greater than `after_span_id`.
+            batch_size: Number of spans fetched per round trip to the storage, at most `MAX_SPAN_BATCH_SIZE`.
+
+        Yields:
+            Spans in ascending order of `(sequence_id, span_id)`.
+
+        Raises:
+            ValueError: If `batch_size` is not positive, or `after_span_id` is given without `after_sequence_id`.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        batch_size = min(batch_size, MAX_SPAN_BATCH_SIZE)
+        if after_span_id is not None and after_sequence_id is None:
+            raise ValueError("after_span_id requires after_sequence_id")
+        if attempt_id == "latest":
+            latest_attempt = await self.get_latest_attempt(rollout_id)
+            if latest_attempt is None:
+                return
+            attempt_id = latest_attempt.attempt_id
+
+        def _after_cursor(span: Span) -> bool:
+            if after_sequence_id is None:
+                return True
+            if after_span_id is None:
+                return span.sequence_id > after_sequence_id
+            return (span.sequence_id, span.span_id) > (after_sequence_id, after_span_id)
+
+        async def _span_at(offset: int) -> Optional[Span]:
+            spans = await self.query_spans(
+                rollout_id, attempt_id, sort_by="sequence_id", sort_order="asc", limit=1, offset=offset
+            )
+            return spans[0] if spans else None
+
+        offset = 0
+        if after_sequence_id is not None:
+
+            def _at_or_after_cursor(span: Optional[Span]) -> bool:
+                return span is None or span.sequence_id >= after_sequence_id
+
+            # Offset of the first span with a sequence ID of at least `after_sequence_id`:
+            # exponential search for an upper bound, then binary search below it.
+            low, high = 0, 1
+            while not _at_or_after_cursor(await _span_at(high - 1)):
+                low, high = high, high * 2
+            while low < high - 1:
+                middle = (low + high - 1) // 2
+                if _at_or_after_cursor(await _span_at(middle)):
+                    high = middle + 1
+                else:
+                    low = middle + 1
+            offset = low
+
+        # Spans tied on the last sequence ID read so far, which the next batch may continue.
+        tied: List[Span] = []
+        while True:
+            batch = await self.query_spans(
+                rollout_id, attempt_id, sort_by="sequence_id", sort_order="asc", limit=batch_size, offset=offset
+            )
+            spans = tied + list(batch)
+            if len(batch) < batch_size:
+                ready, tied = spans, []
+            else:
+                last_sequence_id = spans[-1].sequence_id
+                ready = [span for span in spans if span.sequence_id != last_sequence_id]
+                tied = [span for span in spans if span.sequence_id == last_sequence_id]
+            # Each tied group is complete here, so sorting puts it in span_id order.
+            for span in sorted(ready, key=lambda span: (span.sequence_id, span.span_id)):
+                if _after_cursor(span):
+                    yield span
+            if len(batch) < batch_size:
+                return
+            offset += batch_size
+
     async def add_resources(self, resources: NamedResources) -> ResourcesUpdate:
         """Persist a new immutable snapshot of named resources and mark it as latest.
 
@@ -8,9 +8,11 @@ import os
 import threading
 import time
 import traceback
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import (
     Any,
+    AsyncIterator,
     Awaitable,
     Callable,
     Dict,
@@ -30,7 +32,7 @@ from fastapi import APIRouter, Body, Depends, FastAPI, HTTPException
 from fastapi import Query as FastAPIQuery
 from fastapi import Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest as PbExportTraceServiceRequest,
@@ -45,6 +47,7 @@ from agentlightning.types import (
     Attempt,
     AttemptedRollout,
     AttemptStatus,
+    EnqueueRolloutRequest,
     NamedResources,
     PaginatedResult,
     ResourcesUpdate,
@@ -60,6 +63,7 @@ from agentlightning.utils.otlp import handle_otlp_export, spans_from_proto
 from agentlightning.utils.server_launcher import LaunchMode, PythonServerLauncher, PythonServerLauncherArgs
 
 from .base import UNSET, LightningStore, LightningStoreCapabilities, Unset
+from .collection_based import CollectionBasedLightningStore
 
 server_logger = logging.getLogger("agentlightning.store.server")
 client_logger = logging.getLogger("agentlightning.store.client")
@@ -67,6 +71,12 @@ client_logger = logging.getLogger("agentlightning.store.client")
 API_V1_PREFIX = "/v1"
 API_AGL_PREFIX = "/agl"
 API_V1_AGL_PREFIX = API_V1_PREFIX + API_AGL_PREFIX
+NDJSON_CHUNK_SIZE = 64 * 1024
+"""Streamed NDJSON lines are flushed to the client in chunks of about this many bytes."""
+MAX_SEQUENCE_IDS_PER_REQUEST = 10000
+"""Largest block of span sequence IDs reserved by one `/spans/next/batch` request."""
+EMPTY_LIST_QUERY_VALUE = "\x00"
+"""Only value of a list query parameter standing for an empty list, which a query string cannot express."""
 
 T = TypeVar("T")
 T_model = TypeVar("T_model", bound=BaseModel)
@@ -80,8 +90,23 @@ class RolloutRequest(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class EnqueueRolloutsRequest(BaseModel):
+    items: List[EnqueueRolloutRequest]
+    mode: Optional[Literal["train", "val", "test"]] = None
+    resources_id: Optional[str] = None
+    config: Optional[RolloutConfig] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
 class DequeueRolloutRequest(BaseModel):
     worker_id: Optional[str] = None
+    wait_timeout: Optional[float] = None
+
+
+class DequeueRolloutsRequest(BaseModel):
+    limit: int
+    worker_id: Optional[str] = None
+    wait_timeout: Optional[float] = None
 
 
 class QueryRolloutsRequest(BaseModel):
@@ -103,6 +128,10 @@ class WaitForRolloutsRequest(BaseModel):
     timeout: Optional[float] = None
 
 
+class AddSpansRequest(BaseModel):
+    spans: List[Span]
+
+
 class NextSequenceIdRequest(BaseModel):
     rollout_id: str
     attempt_id: str
@@ -112,6 +141,16 @@ class NextSequenceIdResponse(BaseModel):
     sequence_id: int
 
 
+class NextSequenceIdsRequest(BaseModel):
+    rollout_id: str
+    attempt_id: str
+    count: int
+
+
+class NextSequenceIdsResponse(BaseModel):
+    sequence_ids: List[int]
+
+
 class UpdateRolloutRequest(BaseModel):
     input: Optional[TaskInput] = None
     mode: Optional[Literal["train", "val", "test"]] = None
@@ -172,6 +211,18 @@ class QuerySpansRequest(BaseModel):
     # Sorting
     sort_by: Optional[str] = "sequence_id"
     sort_order: Literal["asc", "desc"] = "asc"
+    # Projection
+    fields: Optional[List[str]] = Field(FastAPIQuery(default=None))
+    attributes_prefix: Optional[List[str]] = Field(FastAPIQuery(default=None))
+
+
+class IterSpansRequest(BaseModel):
+    rollout_id: str
+    attempt_id: Optional[str] = None
+    # Keyset cursor
+    after_sequence_id: Optional[int] = None
+    after_span_id: Optional[str] = None
+    batch_size: int = 1000
 
 
 class QueryWorkersRequest(BaseModel):
@@ -187,6 +238,18 @@ class QueryWorkersRequest(BaseModel):
     filter_logic: Literal["and", "or"] = "and"
 
 
+def _encode_list_query(values: Sequence[str]) -> List[str]:
+    """Values of a list query parameter, with an empty list sent as `EMPTY_LIST_QUERY_VALUE`."""
+    return list(values) if values else [EMPTY_LIST_QUERY_VALUE]
+
+
+def _decode_list_query(values: Optional[List[str]]) -> Optional[List[str]]:
+    """Inverse of `_encode_list_query`. A parameter that was not sent stays None."""
+    if values == [EMPTY_LIST_QUERY_VALUE]:
+        return []
+    return values
+
+
 class CachedStaticFiles(StaticFiles):
     def file_response(self, *args: Any, **kwargs: Any) -> Response:
         resp = super().file_response(*args, **kwargs)
@@ -201,6 +264,8 @@ class LightningStoreServer(LightningStore):
     Delegates all operations to an underlying store implementation.
 
     Healthcheck and watchdog relies on the underlying store.
+    If the underlying store runs a background watchdog, it's started when the server starts up
+    (in every worker process) and stopped when the server shuts down.
 
     `agl store` is a convenient CLI to start a store server.
 
@@ -264,7 +329,7 @@ class LightningStoreServer(LightningStore):
                 "The store is not thread-safe. Please be careful when using the store server and the underlying store in different threads."
             )
 
-        self.app: FastAPI | None = FastAPI(title="LightningStore Server")
+        self.app: FastAPI | None = FastAPI(title="LightningStore Server", lifespan=self._lifespan)
         self.server_launcher = PythonServerLauncher(
             app=self.app,
             args=self.launcher_args,
@@ -411,6 +476,18 @@ class LightningStoreServer(LightningStore):
         await self.server_launcher.stop()
         server_logger.info("Lightning store server stopped.")
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Run the store's healthcheck watchdog on the serving event loop."""
+        store = self.store
+        if isinstance(store, CollectionBasedLightningStore):
+            await store.start_watchdog()
+        try:
+            yield
+        finally:
+            if isinstance(store, CollectionBasedLightningStore):
+                await store.stop_watchdog()
+
     def _setup_routes(self):
         """Set up FastAPI routes for all store operations."""
         assert self.app is not None
@@ -529,12 +606,31 @@ class LightningStoreServer(LightningStore):
                 metadata=request.metadata,
             )
 
+        @api.post(API_AGL_PREFIX + "/queues/rollouts/enqueue/batch", status_code=201, response_model=List[Rollout])
+        async def enqueue_rollouts(request: EnqueueRolloutsRequest):  # pyright: ignore[reportUnusedFunction]
+            return await self.enqueue_rollouts(
+                request.items,
+                mode=request.mode,
+                resources_id=request.resources_id,
+                config=request.config,
+                metadata=request.metadata,
+            )
+
         @api.post(API_AGL_PREFIX + "/queues/rollouts/dequeue", response_model=Optional[AttemptedRollout])
         async def dequeue_rollout(  # pyright: ignore[reportUnusedFunction]
             request: DequeueRolloutRequest | None = Body(None),
         ):
             worker_id = request.worker_id if request else None
-            return await self.dequeue_rollout(worker_id=worker_id)
+            wait_timeout = request.wait_timeout if request else None
+            return await self.dequeue_rollout(worker_id=worker_id, wait_timeout=wait_timeout)
+
+        @api.post(API_AGL_PREFIX + "/queues/rollouts/dequeue/batch", response_model=List[AttemptedRollout])
+        async def dequeue_rollouts(request: DequeueRolloutsRequest):  # pyright: ignore[reportUnusedFunction]
+            if request.limit <= 0:
+                raise HTTPException(status_code=400, detail="limit must be positive")
+            return await self.dequeue_rollouts(
+                request.limit, worker_id=request.worker_id, wait_timeout=request.wait_timeout
+            )
 
         @api.post(API_AGL_PREFIX + "/rollouts", status_code=201, response_model=AttemptedRollout)
         async def start_rollout(request: RolloutRequest):  # pyright: ignore[reportUnusedFunction]
@@ -690,9 +786,22 @@ class LightningStoreServer(LightningStore):
         async def add_span(span: Span):  # pyright: ignore[reportUnusedFunction]
             return await self.add_span(span)
 
+        @api.post(API_AGL_PREFIX + "/spans/batch", status_code=201, response_model=List[Span])
+        async def add_spans(request: AddSpansRequest):  # pyright: ignore[reportUnusedFunction]
+            return await self.add_spans(request.spans)
+
         @api.get(API_AGL_PREFIX + "/spans", response_model=PaginatedResult[Span])
         async def query_spans(params: QuerySpansRequest = Depends()):  # pyright: ignore[reportUnusedFunction]
             _validate_paginated_request(params, Span)
+            fields = _decode_list_query(params.fields)
+            attributes_prefix = _decode_list_query(params.attributes_prefix)
+            if fields is not None:
+                unknown_fields = [field for field in fields if field not in Span.model_fields]
+                if unknown_fields:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Invalid fields: {', '.join(unknown_fields)}, allowed fields are: {', '.join(Span.model_fields.keys())}",
+                    )
             spans = await self.query_spans(
                 params.rollout_id,
                 params.attempt_id,
@@ -709,14 +818,61 @@ class LightningStoreServer(LightningStore):
                 sort_order=params.sort_order,
                 limit=params.limit,
                 offset=params.offset,
+                fields=fields,
+                attributes_prefix=attributes_prefix,
             )
             return _build_paginated_response(spans, limit=params.limit, offset=params.offset)
 
+        @api.get(API_AGL_PREFIX + "/spans/stream")
+        async def iter_spans(params: IterSpansRequest = Depends()):  # pyright: ignore[reportUnusedFunction]
+            if params.batch_size <= 0:
+                raise HTTPException(status_code=400, detail="batch_size must be greater than 0")
+            if params.after_span_id is not None and params.after_sequence_id is None:
+                raise HTTPException(status_code=400, detail="after_span_id requires after_sequence_id")
+            spans = self.iter_spans(
+                params.rollout_id,
+                params.attempt_id,
+                after_sequence_id=params.after_sequence_id,
+                after_span_id=params.after_span_id,
+                batch_size=params.batch_size,
+            )
+            # Fetch the first span before the response starts, so that errors still map to a status code.
+            try:
+                first_span: Optional[Span] = await spans.__anext__()
+            except StopAsyncIteration:
+                first_span = None
+
+            async def _ndjson() -> AsyncIterator[bytes]:
+                if first_span is None:
+                    return
+                chunk: List[bytes] = [first_span.model_dump_json().encode(), b"\n"]
+                chunk_size = len(chunk[0]) + 1
+                async for span in spans:
+                    line = span.model_dump_json().encode()
+                    chunk.extend([line, b"\n"])
+                    chunk_size += len(line) + 1
+                    if chunk_size >= NDJSON_CHUNK_SIZE:
+                        yield b"".join(chunk)
+                        chunk, chunk_size = [], 0
+                if chunk:
+                    yield b"".join(chunk)
+
+            return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
         @api.post(API_AGL_PREFIX + "/spans/next", response_model=NextSequenceIdResponse)
         async def get_next_span_sequence_id(request: NextSequenceIdRequest):  # pyright: ignore[reportUnusedFunction]
             sequence_id = await self.get_next_span_sequence_id(request.rollout_id, request.attempt_id)
             return NextSequenceIdResponse(sequence_id=sequence_id)
 
+        @api.post(API_AGL_PREFIX + "/spans/next/batch", response_model=NextSequenceIdsResponse)
+        async def get_next_span_sequence_ids(  # pyright: ignore[reportUnusedFunction]
+            request: NextSequenceIdsRequest,
+        ):
+            if request.count > MAX_SEQUENCE_IDS_PER_REQUEST:
+                raise HTTPException(status_code=400, detail=f"count must not exceed {MAX_SEQUENCE_IDS_PER_REQUEST}")
+            sequence_ids = await self.get_next_span_sequence_ids(request.rollout_id, request.attempt_id, request.count)
+            return NextSequenceIdsResponse(sequence_ids=sequence_ids)
+
         @api.post(API_AGL_PREFIX + "/waits/rollouts", response_model=List[Rollout])
         async def wait_for_rollouts(request: WaitForRolloutsRequest):  # pyright: ignore[reportUnusedFunction]
             return await self.wait_for_rollouts(rollout_ids=request.rollout_ids, timeout=request.timeout)
@@ -736,6 +892,7 @@ class LightningStoreServer(LightningStore):
             from prometheus_client import (
                 CONTENT_TYPE_LATEST,
                 Counter,
+                Gauge,
                 Histogram,
                 generate_latest,
             )
@@ -758,6 +915,22 @@ class LightningStoreServer(LightningStore):
             buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10],
         )
 
+        store = self.store
+        if isinstance(store, CollectionBasedLightningStore):
+            watchdog_store: CollectionBasedLightningStore[Any] = store
+            Gauge(
+                "store_watchdog_last_sweep_seconds",
+                "Duration of the most recent healthcheck sweep of the store watchdog",
+            ).set_function(lambda: watchdog_store.watchdog_stats()["last_sweep_seconds"])
+            Gauge(
+                "store_watchdog_max_sweep_seconds",
+                "Longest healthcheck sweep of the store watchdog",
+            ).set_function(lambda: watchdog_store.watchdog_stats()["max_sweep_seconds"])
+            Gauge(
+                "store_watchdog_sweeps",
+                "Number of completed healthcheck sweeps of the store watchdog",
+            ).set_function(lambda: watchdog_store.watchdog_stats()["sweeps"])
+
         @app.middleware("http")
         async def prometheus_http_middleware(  # pyright: ignore[reportUnusedFunction]
             request: Request, call_next: Callable[[Request], Awaitable[Response]]
@@ -788,8 +961,8 @@ class LightningStoreServer(LightningStore):
         async def _trace_handler(request: PbExportTraceServiceRequest) -> None:
             spans = await spans_from_proto(request, self)
             server_logger.debug(f"Received {len(spans)} OTLP spans: {', '.join([span.name for span in spans])}")
-            for span in spans:
-                await self.add_span(span)
+            if spans:
+                await self.add_spans(spans)
 
         # Reserved methods for OTEL traces
         # https://opentelemetry.io/docs/specs/otlp/#otlphttp-request
@@ -889,6 +1062,35 @@ class LightningStoreServer(LightningStore):
             self._client = LightningStoreClient(self.endpoint)
         return await getattr(self._client, method_name)(*args, **kwargs)
 
+    async def _iter_store_method(self, method_name: str, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        """Same as `_call_store_method`, for the methods returning an async iterator.
+
+        The lock of a store that is not thread-safe is only held while fetching each item.
+        """
+        if self.store is not None and self.store.capabilities.get("zero_copy", False):
+            async for item in getattr(self.store, method_name)(*args, **kwargs):
+                yield item
+            return
+
+        if os.getpid() == self._owner_pid:
+            iterator: AsyncIterator[Any] = getattr(self.store, method_name)(*args, **kwargs)
+            if self.store is not None and self.store.capabilities.get("thread_safe", False):
+                async for item in iterator:
+                    yield item
+                return
+            while True:
+                with self._lock:
+                    try:
+                        item = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                yield item
+
+        if self._client is None:
+            self._client = LightningStoreClient(self.endpoint)
+        async for item in getattr(self._client, method_name)(*args, **kwargs):
+            yield item
+
     async def start_rollout(
         self,
         input: TaskInput,
@@ -923,8 +1125,54 @@ class LightningStoreServer(LightningStore):
             metadata,
         )
 
-    async def dequeue_rollout(self, worker_id: Optional[str] = None) -> Optional[AttemptedRollout]:
-        return await self._call_store_method("dequeue_rollout", worker_id)
+    async def enqueue_rollouts(
+        self,
+        items: Sequence[EnqueueRolloutRequest],
+        *,
+        mode: Literal["train", "val", "test"] | None = None,
+        resources_id: str | None = None,
+        config: RolloutConfig | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> Sequence[Rollout]:
+        return await self._call_store_method(
+            "enqueue_rollouts",
+            items,
+            mode=mode,
+            resources_id=resources_id,
+            config=config,
+            metadata=metadata,
+        )
+
+    async def dequeue_rollout(
+        self, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Optional[AttemptedRollout]:
+        if (
+            wait_timeout is not None
+            and wait_timeout > 0
+            and isinstance(self.store, CollectionBasedLightningStore)
+            and (self.store.capabilities.get("zero_copy", False) or os.getpid() == self._owner_pid)
+        ):
+            # Block on the queue without holding the server lock; each claim is a regular non-blocking dequeue.
+            return await self.store.poll_rollout_queue(
+                lambda: self._call_store_method("dequeue_rollout", worker_id), wait_timeout
+            )
+        return await self._call_store_method("dequeue_rollout", worker_id, wait_timeout)
+
+    async def dequeue_rollouts(
+        self, limit: int, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Sequence[AttemptedRollout]:
+        if (
+            wait_timeout is not None
+            and wait_timeout > 0
+            and isinstance(self.store, CollectionBasedLightningStore)
+            and (self.store.capabilities.get("zero_copy", False) or os.getpid() == self._owner_pid)
+        ):
+            # Block on the queue without holding the server lock; each claim is a regular non-blocking dequeue.
+            async def _claim() -> Optional[Sequence[AttemptedRollout]]:
+                return (await self._call_store_method("dequeue_rollouts", limit, worker_id)) or None
+
+            return (await self.store.poll_rollout_queue(_claim, wait_timeout)) or []
+        return await self._call_store_method("dequeue_rollouts", limit, worker_id, wait_timeout)
 
     async def start_attempt(self, rollout_id: str) -> AttemptedRollout:
         return await self._call_store_method("start_attempt", rollout_id)
@@ -1016,9 +1264,15 @@ class LightningStoreServer(LightningStore):
     async def add_span(self, span: Span) -> Span:
         return await self._call_store_method("add_span", span)
 
+    async def add_spans(self, spans: Sequence[Span]) -> Sequence[Span]:
+        return await self._call_store_method("add_spans", spans)
+
     async def get_next_span_sequence_id(self, rollout_id: str, attempt_id: str) -> int:
         return await self._call_store_method("get_next_span_sequence_id", rollout_id, attempt_id)
 
+    async def get_next_span_sequence_ids(self, rollout_id: str, attempt_id: str, count: int) -> List[int]:
+        return await self._call_store_method("get_next_span_sequence_ids", rollout_id, attempt_id, count)
+
     async def add_otel_span(
         self,
         rollout_id: str,
@@ -1034,6 +1288,21 @@ class LightningStoreServer(LightningStore):
             sequence_id,
         )
 
+    async def add_otel_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str,
+        readable_spans: Sequence[ReadableSpan],
+        sequence_id: int | None = None,
+    ) -> Sequence[Span]:
+        return await self._call_store_method(
+            "add_otel_spans",
+            rollout_id,
+            attempt_id,
+            readable_spans,
+            sequence_id,
+        )
+
     async def wait_for_rollouts(self, *, rollout_ids: List[str], timeout: Optional[float] = None) -> List[Rollout]:
         return await self._call_store_method("wait_for_rollouts", rollout_ids=rollout_ids, timeout=timeout)
 
@@ -1055,6 +1324,8 @@ class LightningStoreServer(LightningStore):
         offset: int = 0,
         sort_by: Optional[str] = "sequence_id",
         sort_order: Literal["asc", "desc"] = "asc",
+        fields: Optional[Sequence[str]] = None,
+        attributes_prefix: Optional[Sequence[str]] = None,
     ) -> PaginatedResult[Span]:
         return await self._call_store_method(
             "query_spans",
@@ -1073,8 +1344,29 @@ class LightningStoreServer(LightningStore):
             offset=offset,
             sort_by=sort_by,
             sort_order=sort_order,
+            fields=fields,
+            attributes_prefix=attributes_prefix,
         )
 
+    async def iter_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str | Literal["latest"] | None = None,
+        *,
+        after_sequence_id: Optional[int] = None,
+        after_span_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Span]:
+        async for span in self._iter_store_method(
+            "iter_spans",
+            rollout_id,
+            attempt_id,
+            after_sequence_id=after_sequence_id,
+            after_span_id=after_span_id,
+            batch_size=batch_size,
+        ):
+            yield span
+
     async def update_rollout(
         self,
         rollout_id: str,
@@ -1426,10 +1718,41 @@ class LightningStoreClient(LightningStore):
         )
         return Rollout.model_validate(data)
 
-    async def dequeue_rollout(self, worker_id: Optional[str] = None) -> Optional[AttemptedRollout]:
+    async def enqueue_rollouts(
+        self,
+        items: Sequence[EnqueueRolloutRequest],
+        *,
+        mode: Literal["train", "val", "test"] | None = None,
+        resources_id: str | None = None,
+        config: RolloutConfig | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> Sequence[Rollout]:
+        if not items:
+            return []
+        data = await self._request_json(
+            "post",
+            "/queues/rollouts/enqueue/batch",
+            json=EnqueueRolloutsRequest(
+                items=list(items),
+                mode=mode,
+                resources_id=resources_id,
+                config=config,
+                metadata=metadata,
+            ).model_dump(mode="json"),
+        )
+        return [Rollout.model_validate(item) for item in data]
+
+    async def dequeue_rollout(
+        self, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Optional[AttemptedRollout]:
         """
         Dequeue a rollout from the server queue.
 
+        Args:
+            worker_id: Identifier of the worker claiming the rollout.
+            wait_timeout: If positive, long-poll: the server holds the request for up to
+                `wait_timeout` seconds until a rollout is enqueued or requeued.
+
         Returns:
             AttemptedRollout if a rollout is available, None if queue is empty.
 
@@ -1440,8 +1763,12 @@ class LightningStoreClient(LightningStore):
         session = await self._get_session()
         url = f"{self.server_address}/queues/rollouts/dequeue"
         request_kwargs: Dict[str, Any] = {}
-        if worker_id is not None:
-            request_kwargs["json"] = {"worker_id": worker_id}
+        if worker_id is not None or wait_timeout is not None:
+            request_kwargs["json"] = DequeueRolloutRequest(worker_id=worker_id, wait_timeout=wait_timeout).model_dump(
+                exclude_none=True
+            )
+        if wait_timeout is not None and wait_timeout > 0:
+            request_kwargs["timeout"] = self._long_poll_timeout(wait_timeout)
         try:
             async with session.post(url, **request_kwargs) as resp:
                 resp.raise_for_status()
@@ -1457,6 +1784,59 @@ class LightningStoreClient(LightningStore):
             # Else ignore the exception because the server is not ready yet
             return None
 
+    async def dequeue_rollouts(
+        self, limit: int, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Sequence[AttemptedRollout]:
+        """
+        Claim up to `limit` rollouts from the server queue in one request.
+
+        Args:
+            limit: Maximum number of rollouts to claim.
+            worker_id: Identifier of the worker claiming the rollouts.
+            wait_timeout: If positive, long-poll until at least one rollout is available.
+
+        Returns:
+            The claimed rollouts. Empty if the queue is empty.
+
+        Note:
+            Like [`dequeue_rollout()`][agentlightning.LightningStoreClient.dequeue_rollout], this method
+            does NOT retry on failures and returns an empty list instead.
+        """
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        session = await self._get_session()
+        url = f"{self.server_address}/queues/rollouts/dequeue/batch"
+        request_kwargs: Dict[str, Any] = {
+            "json": DequeueRolloutsRequest(limit=limit, worker_id=worker_id, wait_timeout=wait_timeout).model_dump(
+                exclude_none=True
+            )
+        }
+        if wait_timeout is not None and wait_timeout > 0:
+            request_kwargs["timeout"] = self._long_poll_timeout(wait_timeout)
+        try:
+            async with session.post(url, **request_kwargs) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+                self._dequeue_was_successful = True
+                return [AttemptedRollout.model_validate(item) for item in data]
+        except Exception as e:
+            if self._dequeue_was_successful:
+                if self._dequeue_first_unsuccessful:
+                    client_logger.warning(f"dequeue_rollouts failed with exception: {e}")
+                    self._dequeue_first_unsuccessful = False
+            client_logger.debug("dequeue_rollouts failed with exception. Details:", exc_info=True)
+            # Else ignore the exception because the server is not ready yet
+            return []
+
+    def _long_poll_timeout(self, wait_timeout: float) -> aiohttp.ClientTimeout:
+        """The server holds long-poll requests open while waiting; extend the read deadline accordingly."""
+        return aiohttp.ClientTimeout(
+            total=self._request_timeout + wait_timeout,
+            connect=self._connection_timeout,
+            sock_connect=self._connection_timeout,
+            sock_read=self._request_timeout + wait_timeout,
+        )
+
     async def start_attempt(self, rollout_id: str) -> AttemptedRollout:
         data = await self._request_json(
             "post",
@@ -1673,6 +2053,24 @@ class LightningStoreClient(LightningStore):
         response = NextSequenceIdResponse.model_validate(data)
         return response.sequence_id
 
+    async def get_next_span_sequence_ids(self, rollout_id: str, attempt_id: str, count: int) -> List[int]:
+        if count <= 0:
+            return []
+        sequence_ids: List[int] = []
+        # Large blocks are reserved in chunks, within the server limit.
+        for start in range(0, count, MAX_SEQUENCE_IDS_PER_REQUEST):
+            data = await self._request_json(
+                "post",
+                "/spans/next/batch",
+                json=NextSequenceIdsRequest(
+                    rollout_id=rollout_id,
+                    attempt_id=attempt_id,
+                    count=min(MAX_SEQUENCE_IDS_PER_REQUEST, count - start),
+                ).model_dump(),
+            )
+            sequence_ids.extend(NextSequenceIdsResponse.model_validate(data).sequence_ids)
+        return sequence_ids
+
     async def add_otel_span(
         self,
         rollout_id: str,
@@ -1693,6 +2091,41 @@ class LightningStoreClient(LightningStore):
         await self.add_span(span)
         return span
 
+    async def add_spans(self, spans: Sequence[Span]) -> Sequence[Span]:
+        if not spans:
+            return []
+        data = await self._request_json(
+            "post",
+            "/spans/batch",
+            json={"spans": [span.model_dump(mode="json") for span in spans]},
+        )
+        return [Span.model_validate(item) for item in data]
+
+    async def add_otel_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str,
+        readable_spans: Sequence[ReadableSpan],
+        sequence_id: int | None = None,
+    ) -> Sequence[Span]:
+        if not readable_spans:
+            return []
+        if sequence_id is None:
+            # One round trip reserves the whole block, instead of one per span.
+            sequence_ids = await self.get_next_span_sequence_ids(rollout_id, attempt_id, len(readable_spans))
+        else:
+            sequence_ids = [sequence_id] * len(readable_spans)
+        spans = [
+            Span.from_opentelemetry(
+                readable_span,
+                rollout_id=rollout_id,
+                attempt_id=attempt_id,
+                sequence_id=span_sequence_id,
+            )
+            for readable_span, span_sequence_id in zip(readable_spans, sequence_ids)
+        ]
+        return await self.add_spans(spans)
+
     async def wait_for_rollouts(self, *, rollout_ids: List[str], timeout: Optional[float] = None) -> List[Rollout]:
         """Wait for rollouts to complete.
 
@@ -1732,6 +2165,8 @@ class LightningStoreClient(LightningStore):
         offset: int = 0,
         sort_by: Optional[str] = "sequence_id",
         sort_order: Literal["asc", "desc"] = "asc",
+        fields: Optional[Sequence[str]] = None,
+        attributes_prefix: Optional[Sequence[str]] = None,
     ) -> PaginatedResult[Span]:
         params: List[Tuple[str, Any]] = [("rollout_id", rollout_id)]
         if attempt_id is not None:
@@ -1758,10 +2193,103 @@ class LightningStoreClient(LightningStore):
             params.append(("sort_order", sort_order))
         params.append(("limit", limit))
         params.append(("offset", offset))
+        if fields is not None:
+            params.extend(("fields", field) for field in _encode_list_query(fields))
+        if attributes_prefix is not None:
+            if isinstance(attributes_prefix, str):
+                attributes_prefix = [attributes_prefix]
+            params.extend(("attributes_prefix", prefix) for prefix in _encode_list_query(attributes_prefix))
         data = await self._request_json("get", "/spans", params=params)
         items = [Span.model_validate(item) for item in data["items"]]
         return PaginatedResult(items=items, limit=data["limit"], offset=data["offset"], total=data["total"])
 
+    async def iter_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str | Literal["latest"] | None = None,
+        *,
+        after_sequence_id: Optional[int] = None,
+        after_span_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Span]:
+        """Stream the spans as NDJSON, decoding them one line at a time.
+
+        When the connection drops, the stream is resumed after the last span received
+        (with the same retry schedule as the other requests).
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if after_span_id is not None and after_sequence_id is None:
+            raise ValueError("after_span_id requires after_sequence_id")
+        session = await self._get_session()
+        url = f"{self.server_address}/spans/stream"
+        # No deadline for the whole stream, but the server must keep sending.
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=self._connection_timeout,
+            sock_connect=self._connection_timeout,
+            sock_read=self._request_timeout,
+        )
+
+        attempts = (0.0,) + self._retry_delays
+        last_exc: Exception | None = None
+        for delay in attempts:
+            if delay:
+                client_logger.info(f"Waiting {delay} seconds before resuming the span stream of {rollout_id}")
+                await asyncio.sleep(delay)
+            params: List[Tuple[str, Any]] = [("rollout_id", rollout_id), ("batch_size", batch_size)]
+            if attempt_id is not None:
+                params.append(("attempt_id", attempt_id))
+            if after_sequence_id is not None:
+                params.append(("after_sequence_id", after_sequence_id))
+            if after_span_id is not None:
+                params.append(("after_span_id", after_span_id))
+            try:
+                async with session.get(url, params=params, timeout=timeout) as resp:
+                    resp.raise_for_status()
+                    buffer = bytearray()
+                    async for chunk in resp.content.iter_any():
+                        buffer.extend(chunk)
+                        end = buffer.rfind(b"\n")
+                        if end < 0:
+                            continue
+                        lines = bytes(buffer[:end]).split(b"\n")
+                        del buffer[: end + 1]
+                        for line in lines:
+                            if not line:
+                                continue
+                            span = Span.model_validate_json(line)
+                            # Resume after this span if the connection drops.
+                            if attempt_id == "latest":
+                                attempt_id = span.attempt_id
+                            after_sequence_id, after_span_id = span.sequence_id, span.span_id
+                            yield span
+                    if buffer.strip():
+                        raise aiohttp.ClientPayloadError("Span stream ended in the middle of a line")
+                    return
+            except aiohttp.ClientResponseError as cre:
+                client_logger.debug(f"ClientResponseError: {cre.status} {cre.message}", exc_info=True)
+                if 400 <= cre.status < 500 and cre.status != 408:
+                    raise
+                last_exc = cre
+                if not await self._wait_until_healthy(session):
+                    break
+            except (
+                aiohttp.ClientPayloadError,
+                aiohttp.ServerDisconnectedError,
+                aiohttp.ClientConnectorError,
+                aiohttp.ClientOSError,
+                asyncio.TimeoutError,
+            ) as net_exc:
+                client_logger.debug(f"Network/session issue: {net_exc}", exc_info=True)
+                last_exc = net_exc
+                client_logger.info(f"Span stream of {rollout_id} interrupted; it will be resumed.")
+                if not await self._wait_until_healthy(session):
+                    break
+
+        assert last_exc is not None
+        raise last_exc
+
     async def update_rollout(
         self,
         rollout_id: str,
@@ -1,7 +1,24 @@
 # Copyright (c) Microsoft. All rights reserved.
 
-from .base import Collection, FilterOptions, KeyValue, LightningCollections, PaginatedResult, Queue, SortOptions
-from .memory import DequeBasedQueue, DictBasedKeyValue, InMemoryLightningCollections, ListBasedCollection
+from .base import (
+    Collection,
+    FilterOptions,
+    KeyValue,
+    LightningCollections,
+    PaginatedResult,
+    Projection,
+    Queue,
+    SortOptions,
+)
+from .journal import CollectionJournal, JournalRestoreStats
+from .memory import (
+    DequeBasedQueue,
+    DictBasedKeyValue,
+    InMemoryLightningCollections,
+    ListBasedCollection,
+    SpanCollection,
+)
+from .spill import SpanSpill, SpanSpillStats
 
 __all__ = [
     "Collection",
@@ -9,10 +26,16 @@ __all__ = [
     "KeyValue",
     "FilterOptions",
     "SortOptions",
+    "Projection",
     "PaginatedResult",
     "LightningCollections",
     "ListBasedCollection",
     "DequeBasedQueue",
     "DictBasedKeyValue",
     "InMemoryLightningCollections",
+    "SpanCollection",
+    "SpanSpill",
+    "SpanSpillStats",
+    "CollectionJournal",
+    "JournalRestoreStats",
 ]
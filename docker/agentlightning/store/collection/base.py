@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import copy
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -18,6 +19,7 @@ from typing import (
     Sequence,
     Tuple,
     Type,
+    TypedDict,
     TypeVar,
     cast,
 )
@@ -42,6 +44,17 @@ K = TypeVar("K")
 V = TypeVar("V")
 
 
+class Projection(TypedDict, total=False):
+    """The part of each item that a query loads. The other fields take their default values."""
+
+    fields: Sequence[str]
+    """The fields to load. The primary keys are always loaded. Defaults to all the fields."""
+    key_prefixes: Mapping[str, Sequence[str]]
+    """For mapping fields, keep only the keys starting with one of the prefixes, e.g., `{"attributes": ["gen_ai."]}`."""
+    defaults: Mapping[str, Any]
+    """The values of the fields that are not loaded. Required fields that are not loaded must have one."""
+
+
 class Collection(Generic[T]):
     """Behaves like a list of items. Supporting addition, updating, and deletion of items."""
 
@@ -66,6 +79,7 @@ class Collection(Generic[T]):
         sort: Optional[SortOptions] = None,
         limit: int = -1,
         offset: int = 0,
+        projection: Optional[Projection] = None,
     ) -> PaginatedResult[T]:
         """Query the collection with the given filters, sort order, and pagination.
 
@@ -84,6 +98,10 @@ class Collection(Generic[T]):
             offset:
                 Number of items to skip from the start of the *matching* items.
 
+            projection:
+                The part of each item to load. See [`Projection`][agentlightning.store.collection.Projection].
+                Projected items are built without validation and must not be written back to the collection.
+
         Returns:
             PaginatedResult with items, limit, offset, and total matched items.
         """
@@ -106,6 +124,33 @@ class Collection(Generic[T]):
         """
         raise NotImplementedError()
 
+    async def query_after(
+        self,
+        keys: Sequence[str],
+        filter: Optional[FilterOptions] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: int = -1,
+    ) -> Sequence[T]:
+        """Keyset pagination: the matching items in ascending order of `keys`, strictly after a cursor.
+
+        Unlike `offset` in [`query()`][agentlightning.store.collection.Collection.query], the cost of a page
+        does not grow with its position, and items inserted before the cursor do not shift the next pages.
+
+        Args:
+            keys: The fields to order by, e.g., `["sequence_id", "span_id"]`. They should uniquely identify
+                an item among the matches, otherwise items tied with the cursor are skipped.
+            filter: The filters to apply to the collection.
+                See [`FilterOptions`][agentlightning.store.collection.FilterOptions].
+            after: Values of the keys of the last item of the previous page, or None to start from the first item.
+                A shorter cursor compares with the leading keys only, e.g., `[5]` starts after every
+                item whose first key is 5.
+            limit: Max number of items to return. Use -1 for "no limit".
+
+        Returns:
+            The page of items, in ascending order of `keys`.
+        """
+        raise NotImplementedError()
+
     async def insert(self, items: Sequence[T]) -> None:
         """Add the given items to the collection.
 
@@ -265,6 +310,47 @@ class LightningCollections:
         """Dictionary (counter) of span sequence IDs."""
         raise NotImplementedError()
 
+    @property
+    def latest_attempt_ids(self) -> KeyValue[str, str]:
+        """Dictionary (pointer) from rollout ID to the ID of its latest attempt.
+
+        Maintained by [`insert_attempts()`][agentlightning.store.collection.LightningCollections.insert_attempts].
+        """
+        raise NotImplementedError()
+
+    async def insert_attempts(self, attempts: Sequence[Attempt]) -> None:
+        """Insert the given attempts and advance the latest-attempt pointer of their rollouts.
+
+        Attempts of a rollout must be inserted in increasing `sequence_id` order, which is
+        how the store allocates them.
+        """
+        await self.attempts.insert(attempts)
+        latest_attempts: Dict[str, Attempt] = {}
+        for attempt in attempts:
+            current = latest_attempts.get(attempt.rollout_id)
+            if current is None or attempt.sequence_id > current.sequence_id:
+                latest_attempts[attempt.rollout_id] = attempt
+        for rollout_id, attempt in latest_attempts.items():
+            await self.latest_attempt_ids.set(rollout_id, attempt.attempt_id)
+
+    async def get_latest_attempt(self, rollout_id: str) -> Optional[Attempt]:
+        """Get the attempt with the highest `sequence_id` of the rollout, or None if it has no attempts.
+
+        Follows the latest-attempt pointer with a primary-key lookup. Rollouts without a pointer
+        (e.g., persisted before the pointer existed) fall back to a sorted lookup.
+        """
+        attempt_id = await self.latest_attempt_ids.get(rollout_id)
+        if attempt_id is not None:
+            attempt = await self.attempts.get(
+                {"rollout_id": {"exact": rollout_id}, "attempt_id": {"exact": attempt_id}}
+            )
+            if attempt is not None:
+                return attempt
+        return await self.attempts.get(
+            filter={"rollout_id": {"exact": rollout_id}},
+            sort={"name": "sequence_id", "order": "desc"},
+        )
+
     def atomic(self, *args: Any, **kwargs: Any) -> AsyncContextManager[Self]:
         """Perform a atomic operation on the collections.
 
@@ -281,6 +367,24 @@ class LightningCollections:
         async with self.atomic() as collections:
             return await callback(collections)
 
+    def read(self, *args: Any, **kwargs: Any) -> AsyncContextManager[Self]:
+        """Open a read-only view of the collections, consistent for the duration of the block.
+
+        The block must not write. Subclasses override it with a read path that does not block writers
+        (e.g., without the write lock or the write transaction); the default falls back to
+        [`atomic()`][agentlightning.store.collection.LightningCollections.atomic].
+
+        Args:
+            *args: Arguments to pass to the operation.
+            **kwargs: Keyword arguments to pass to the operation.
+        """
+        return self.atomic(*args, **kwargs)
+
+    async def execute_read(self, callback: Callable[[Self], Awaitable[T]]) -> T:
+        """Execute the given read-only callback within a [`read()`][agentlightning.store.collection.LightningCollections.read] block."""
+        async with self.read() as collections:
+            return await callback(collections)
+
 
 FilterMap = Mapping[str, FilterField]
 
@@ -354,3 +458,50 @@ def resolve_sort_options(sort: Optional[SortOptions]) -> Tuple[Optional[str], Li
         raise ValueError(f"Unsupported sort order '{sort_order}'")
 
     return sort_name, sort_order
+
+
+def resolve_projection_fields(
+    projection: Projection, model_fields: Sequence[str], primary_keys: Sequence[str]
+) -> List[str]:
+    """The fields loaded by a projection: the requested fields plus the primary keys, in model order."""
+    fields = projection.get("fields")
+    if fields is None:
+        return list(model_fields)
+    unknown = [field for field in fields if field not in model_fields]
+    if unknown:
+        raise ValueError(f"Projected fields do not exist in the model: {', '.join(unknown)}")
+    loaded = set(fields) | set(primary_keys)
+    return [field for field in model_fields if field in loaded]
+
+
+def project_document(
+    document: Mapping[str, Any], projection: Projection, model_fields: Sequence[str], primary_keys: Sequence[str]
+) -> Dict[str, Any]:
+    """Apply a projection to the fields of an item, before it is built."""
+    values: Dict[str, Any] = {}
+    for field in resolve_projection_fields(projection, model_fields, primary_keys):
+        if field in document:
+            values[field] = document[field]
+    for field, prefixes in projection.get("key_prefixes", {}).items():
+        mapping = values.get(field)
+        if isinstance(mapping, Mapping):
+            prefix_tuple = tuple(prefixes)
+            values[field] = {
+                key: value for key, value in cast(Mapping[str, Any], mapping).items() if key.startswith(prefix_tuple)
+            }
+    for field, default in projection.get("defaults", {}).items():
+        if field not in values:
+            # Copied, so that a caller mutating one projected item does not affect the others.
+            values[field] = copy.deepcopy(default)
+    return values
+
+
+def project_item(item: T, projection: Projection, primary_keys: Sequence[str]) -> T:
+    """Apply a projection to an item already in memory.
+
+    The loaded values are shared with the original item (not copied), and the result is not validated.
+    """
+    model_type = cast(Any, type(item))
+    model_fields: List[str] = list(model_type.model_fields)
+    document = {field: getattr(item, field) for field in model_fields}
+    return cast(T, model_type.model_construct(**project_document(document, projection, model_fields, primary_keys)))
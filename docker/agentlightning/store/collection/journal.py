@@ -0,0 +1,402 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Write-ahead journal and snapshots for the in-memory collections."""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Sequence, Tuple, TypedDict
+
+from pydantic import TypeAdapter
+
+if TYPE_CHECKING:
+    from .memory import InMemoryLightningCollections
+
+__all__ = ["CollectionJournal", "JournalRestoreStats"]
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_CHUNK_SIZE = 1000
+_GENERATION_PATTERN = re.compile(r"^(journal|snapshot)-(\d+)\.log$")
+
+# (collection name, operation, payload). The payload of a record is its encoded line;
+# an empty collection name marks a snapshot capture, whose payload is the captured collections.
+_Entry = Tuple[str, str, Any]
+
+
+class JournalRestoreStats(TypedDict):
+    """What [`CollectionJournal.restore()`][agentlightning.store.collection.journal.CollectionJournal.restore] replayed."""
+
+    generation: int
+    """Generation of the snapshot the state was restored from (0 if there was none)."""
+    snapshot_records: int
+    """Number of records read from the snapshot."""
+    journal_records: int
+    """Number of records replayed from the journal after the snapshot."""
+    seconds: float
+    """Wall-clock time spent restoring."""
+
+
+class CollectionJournal:
+    """Append-only journal of the mutations of [`InMemoryLightningCollections`][agentlightning.store.collection.InMemoryLightningCollections],
+    with periodic snapshots, so that an in-memory store can be rebuilt after a restart.
+
+    Mutations are serialized when they are recorded, so a record holds the state of the items at that point,
+    and a background writer thread appends them to the journal in batches every `flush_interval` seconds.
+    Only the records written successfully count as durable for [`flush()`][agentlightning.store.collection.journal.CollectionJournal.flush]:
+    when a write fails, the records are kept and retried by the next batch, and `flush()` raises until then.
+
+    Once `snapshot_interval` seconds and `snapshot_min_records` records have passed since the last snapshot,
+    the next atomic block captures the collections and starts a new journal generation. The writer then
+    dumps the capture to `snapshot-<generation>.log` and deletes the files of the older generations.
+    The capture holds references to the items; items mutated in place after the capture are always
+    recorded again by the store, so replaying the next generation converges to the in-memory state.
+    If the snapshot cannot be written, the older generations are kept and the restore replays them instead.
+    Snapshots and journals share the same record format: one `<collection>\\t<operation>\\t<JSON payload>` line
+    per record.
+
+    Spans evicted from memory are journaled as evicted and are not restored, even if they were spilled:
+    the spill files do not outlive the process. Their rollouts keep reporting the spans as evicted after the restore.
+
+    Args:
+        directory: Directory of the journal and snapshot files. Created if missing; existing files are restored.
+        flush_interval: Seconds between two batched writes of the background writer.
+        snapshot_interval: Minimum seconds between two snapshots. Set to `None` to disable snapshots.
+        snapshot_min_records: Minimum number of records journaled since the last snapshot to take a new one.
+        fsync: Whether to fsync the journal after every batch. Without it, a batch survives a crash of the
+            process but not necessarily a power failure.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        flush_interval: float = 0.05,
+        snapshot_interval: float | None = 300.0,
+        snapshot_min_records: int = 10_000,
+        fsync: bool = False,
+    ) -> None:
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_min_records = snapshot_min_records
+        self._generation = max(self._generations(), default=0)
+        self._records_since_snapshot = 0
+        self._last_snapshot_time = time.monotonic()
+        self._writer = _JournalWriter(directory, self._generation, flush_interval, fsync)
+        self._finalizer = weakref.finalize(self, self._writer.close)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def generation(self) -> int:
+        """The current journal generation, incremented by every snapshot."""
+        return self._generation
+
+    def register(self, name: str, operations: Sequence[str], adapter: TypeAdapter[Any]) -> None:
+        """Declare the adapter of the payloads of some operations of a collection.
+
+        Payloads of other operations must be plain JSON values.
+        """
+        for operation in operations:
+            self._writer.adapters[(name, operation)] = adapter
+
+    def record(self, name: str, operation: str, payload: Any) -> None:
+        """Append a mutation to the journal. The payload is serialized here; I/O happens in the background."""
+        self._writer.append((name, operation, self._writer.encode(name, operation, payload)))
+        self._records_since_snapshot += 1
+
+    def maybe_snapshot(self, collections: InMemoryLightningCollections) -> bool:
+        """Capture a snapshot if one is due. Must be called while no mutation is in progress.
+
+        Returns:
+            Whether a snapshot was captured.
+        """
+        if self._snapshot_interval is None or self._records_since_snapshot < self._snapshot_min_records:
+            return False
+        if time.monotonic() - self._last_snapshot_time < self._snapshot_interval:
+            return False
+        self.snapshot(collections)
+        return True
+
+    def snapshot(self, collections: InMemoryLightningCollections) -> None:
+        """Capture the collections and start a new journal generation.
+
+        Only references are captured here; the snapshot file is written by the background writer.
+        """
+        self._generation += 1
+        self._writer.append(("", str(self._generation), collections.capture()))
+        self._records_since_snapshot = 0
+        self._last_snapshot_time = time.monotonic()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every record appended so far has been written.
+
+        Returns:
+            False if the timeout elapsed first.
+
+        Raises:
+            RuntimeError: If the journal failed to write some of these records.
+        """
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Write the pending records and stop the background writer."""
+        self._finalizer()
+
+    def _generations(self) -> List[int]:
+        generations: List[int] = []
+        for path in glob.glob(os.path.join(self._directory, "*.log")):
+            match = _GENERATION_PATTERN.match(os.path.basename(path))
+            if match:
+                generations.append(int(match.group(2)))
+        return generations
+
+    def restore(self, apply: Callable[[str, str, Any], None]) -> JournalRestoreStats:
+        """Replay the latest snapshot and the journal generations after it through `apply`.
+
+        Must be called after all the collections are registered, and before any record is appended.
+        A torn record at the end of a journal (e.g., from a crash in the middle of a write) is skipped.
+        """
+        start_time = time.perf_counter()
+        snapshot_generations = [
+            generation
+            for generation in self._generations()
+            if os.path.exists(os.path.join(self._directory, f"snapshot-{generation:06d}.log"))
+        ]
+        generation = max(snapshot_generations, default=0)
+        snapshot_records = 0
+        if generation > 0:
+            snapshot_records = self._replay(os.path.join(self._directory, f"snapshot-{generation:06d}.log"), apply)
+        journal_records = 0
+        for journal_generation in sorted(g for g in set(self._generations()) if g >= generation):
+            path = os.path.join(self._directory, f"journal-{journal_generation:06d}.log")
+            if os.path.exists(path):
+                journal_records += self._replay(path, apply)
+        stats = JournalRestoreStats(
+            generation=generation,
+            snapshot_records=snapshot_records,
+            journal_records=journal_records,
+            seconds=time.perf_counter() - start_time,
+        )
+        if snapshot_records or journal_records:
+            logger.info(
+                "Restored the in-memory collections from %s: %d snapshot and %d journal records in %.2fs",
+                self._directory,
+                snapshot_records,
+                journal_records,
+                stats["seconds"],
+            )
+        return stats
+
+    def _replay(self, path: str, apply: Callable[[str, str, Any], None]) -> int:
+        count = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning("Skipping a torn record at the end of %s", path)
+                    break
+                raw_name, raw_operation, raw_payload = line.rstrip(b"\n").split(b"\t", 2)
+                name, operation = raw_name.decode("utf-8"), raw_operation.decode("utf-8")
+                adapter = self._writer.adapters.get((name, operation))
+                payload = adapter.validate_json(raw_payload) if adapter is not None else json.loads(raw_payload)
+                apply(name, operation, payload)
+                count += 1
+        return count
+
+
+def _truncate_torn_tail(path: str) -> None:
+    """Drop a partially written record at the end of a journal, so that new records start on a fresh line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Scan backwards for the end of the last complete record.
+        position = size
+        while position > 0:
+            step = min(64 * 1024, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                f.truncate(position - step + newline + 1)
+                return
+            position -= step
+        f.truncate(0)
+
+
+class _JournalWriter:
+    """Background thread owning the journal files. Kept apart from the journal so that it can be finalized."""
+
+    def __init__(self, directory: str, generation: int, flush_interval: float, fsync: bool) -> None:
+        self.directory = directory
+        self.adapters: Dict[Tuple[str, str], TypeAdapter[Any]] = {}
+        self._entries: Deque[_Entry] = deque()
+        self._appended = 0
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+        self._generation = generation
+        journal_path = self._path("journal", generation)
+        _truncate_torn_tail(journal_path)
+        self._file = open(journal_path, "ab")
+        self._written = 0
+        self._error: Exception | None = None
+        self._appended_until_flush = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="agl-collection-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, entry: _Entry) -> None:
+        self._entries.append(entry)
+        self._appended += 1
+
+    def _path(self, kind: str, generation: int) -> str:
+        return os.path.join(self.directory, f"{kind}-{generation:06d}.log")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._flush_interval):
+            self._drain()
+        self._drain()
+
+    def encode(self, name: str, operation: str, payload: Any) -> bytes:
+        """Serialize one record into its journal line."""
+        adapter = self.adapters.get((name, operation))
+        if adapter is None:
+            encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        else:
+            encoded = adapter.dump_json(payload)
+        return name.encode("utf-8") + b"\t" + operation.encode("utf-8") + b"\t" + encoded + b"\n"
+
+    def _drain(self) -> None:
+        """Write the pending records, up to the first failure. Failed entries are put back for the next drain."""
+        while self._entries:
+            if self._entries[0][0] == "":
+                # Snapshot capture: the records before it have been written to the current generation.
+                entry = self._entries.popleft()
+                try:
+                    self._rotate(int(entry[1]), entry[2])
+                except Exception as exc:
+                    self._fail(exc, [entry])
+                    return
+                self._count(1)
+                continue
+            batch: List[_Entry] = []
+            while self._entries and self._entries[0][0] != "":
+                batch.append(self._entries.popleft())
+            position = self._file.tell()
+            try:
+                self._write([line for _, _, line in batch])
+            except Exception as exc:
+                try:
+                    # Drop a partial write, so that the retried batch is not duplicated or torn.
+                    self._file.truncate(position)
+                except Exception:
+                    pass
+                self._fail(exc, batch)
+                return
+            self._count(len(batch))
+
+    def _count(self, written: int) -> None:
+        with self._appended_until_flush:
+            self._written += written
+            self._error = None
+            self._appended_until_flush.notify_all()
+
+    def _fail(self, exc: Exception, entries: Sequence[_Entry]) -> None:
+        if self._error is None:
+            logger.error("Failed to write the collection journal in %s, retrying", self.directory, exc_info=exc)
+        else:
+            logger.debug("Failed again to write the collection journal in %s: %r", self.directory, exc)
+        self._entries.extendleft(reversed(entries))
+        with self._appended_until_flush:
+            self._error = exc
+            self._appended_until_flush.notify_all()
+
+    def _write(self, buffer: Sequence[bytes]) -> None:
+        if not buffer:
+            return
+        self._file.write(b"".join(buffer))
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def _rotate(self, generation: int, capture: List[Tuple[str, str, List[Any]]]) -> None:
+        # The new journal is opened first, so that a failure leaves the current generation in use.
+        new_file = open(self._path("journal", generation), "ab")
+        old_generation = self._generation
+        self._file.close()
+        self._generation = generation
+        self._file = new_file
+
+        snapshot_path = self._path("snapshot", generation)
+        temp_path = snapshot_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                for name, operation, items in capture:
+                    for start in range(0, len(items), _SNAPSHOT_CHUNK_SIZE):
+                        f.write(self._encode_captured(name, operation, items[start : start + _SNAPSHOT_CHUNK_SIZE]))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, snapshot_path)
+        except Exception:
+            # The records are all in the journals of the older generations, which are kept.
+            logger.exception("Failed to write snapshot %s of the in-memory collections", snapshot_path)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        for generation_to_remove in range(old_generation + 1):
+            for kind in ("journal", "snapshot"):
+                path = self._path(kind, generation_to_remove)
+                if os.path.exists(path):
+                    os.remove(path)
+        logger.info("Wrote snapshot %s of the in-memory collections", snapshot_path)
+
+    def _encode_captured(self, name: str, operation: str, items: List[Any]) -> bytes:
+        # Captured items may be mutated by the event loop while being dumped; the mutation is journaled again anyway.
+        for attempt in range(3):
+            try:
+                return self.encode(name, operation, items)
+            except RuntimeError:
+                if attempt == 2:
+                    raise
+        raise AssertionError("unreachable")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        target = self._appended
+        with self._appended_until_flush:
+            self._appended_until_flush.wait_for(
+                lambda: self._written >= target or self._error is not None or self._stopped.is_set(), timeout
+            )
+            if self._written >= target:
+                return True
+            if self._error is not None:
+                raise RuntimeError(f"The collection journal in {self.directory} failed to write") from self._error
+            return False
+
+    def close(self) -> None:
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._file.close()
+        if self._entries:
+            logger.error(
+                "Closed the collection journal in %s with %d records not written", self.directory, len(self._entries)
+            )
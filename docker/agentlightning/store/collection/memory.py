@@ -3,27 +3,41 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import heapq
+import itertools
 import logging
 import weakref
 from collections import deque
 from contextlib import asynccontextmanager
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Awaitable,
+    Callable,
     Deque,
     Dict,
     Iterable,
+    Iterator,
     List,
     Literal,
     Mapping,
     MutableMapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Type,
     TypeVar,
     Union,
+    cast,
 )
 
+from pydantic import TypeAdapter
+
+if TYPE_CHECKING:
+    from typing import Self
+
 from agentlightning.types import (
     Attempt,
     FilterField,
@@ -41,12 +55,17 @@ from .base import (
     FilterMap,
     KeyValue,
     LightningCollections,
+    Projection,
     Queue,
     normalize_filter_options,
+    project_item,
     resolve_sort_options,
 )
+from .journal import CollectionJournal, JournalRestoreStats
+from .spill import SpanSpill
 
 T = TypeVar("T")  # Recommended to be a BaseModel, not a dict
+T_result = TypeVar("T_result")
 K = TypeVar("K")
 V = TypeVar("V")
 
@@ -161,6 +180,55 @@ def _get_sort_value(item: object, sort_by: str) -> Any:
     return value
 
 
+def _allowed_index_values(ops: FilterField) -> Optional[List[Any]]:
+    """The values a field may take under `exact`/`within` operators, or None if it is unconstrained or
+    uses operators that a hash index cannot answer."""
+    allowed: Optional[List[Any]] = None
+    for op_name, expected in ops.items():
+        if expected is None:
+            continue
+        if op_name == "exact":
+            values = [expected]
+        elif op_name == "within" and isinstance(expected, (list, tuple, set, frozenset)):
+            values = list(expected)  # type: ignore
+        else:
+            return None
+        # Operators on the same field are AND-ed together.
+        allowed = values if allowed is None else [value for value in allowed if value in values]
+    if allowed is None:
+        return None
+    return list(dict.fromkeys(allowed)) if _all_hashable(allowed) else None
+
+
+def _all_hashable(values: Sequence[Any]) -> bool:
+    try:
+        for value in values:
+            hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+_UNSORTABLE = object()
+"""Sort value recorded in ordered indexes for items that `_get_sort_value` rejects."""
+
+
+def _iter_entries_desc(entries: List[Tuple[Any, int, Tuple[Any, ...], T]]) -> Iterator[T]:
+    """Walk ordered-index entries from the largest sort value down.
+
+    Entries with equal sort values are yielded in insertion order, mirroring `list.sort(reverse=True)`.
+    """
+    end = len(entries)
+    while end > 0:
+        start = end - 1
+        value = entries[start][0]
+        while start > 0 and entries[start - 1][0] == value:
+            start -= 1
+        for idx in range(start, end):
+            yield entries[idx][3]
+        end = start
+
+
 class ListBasedCollection(Collection[T]):
     """In-memory implementation of Collection using a nested dict for O(1) primary-key lookup.
 
@@ -184,9 +252,31 @@ class ListBasedCollection(Collection[T]):
     3. If the sort_by field is a timestamp, the null values are treated as infinity.
     4. If the sort_by field is not a timestamp, the null values are treated as empty string
        if the field is str-like, 0 if the field is int-like, 0.0 if the field is float-like.
+
+    Secondary indexes:
+
+    Fields listed in `indexes` get a hash index (value -> items) maintained on every insert, update,
+    upsert and delete. When a query has no primary-key prefix, `exact` and `within` filters on an
+    indexed field are answered from the index, so the cost scales with the number of candidates
+    rather than the collection size. Indexed values must be hashable.
+
+    Fields listed in `sorted_indexes` get an ordered index keyed by the same sort value as above
+    (ties are kept in insertion order). Unfiltered queries sorted by such a field read the requested
+    page straight from the index instead of sorting the collection. Other paginated sorts select the
+    page with a heap (top-k) rather than a full sort.
+
+    Items must be written back via `update()`/`upsert()` after being mutated in place, otherwise the
+    indexes go stale.
     """
 
-    def __init__(self, items: List[T], item_type: Type[T], primary_keys: Sequence[str]):
+    def __init__(
+        self,
+        items: List[T],
+        item_type: Type[T],
+        primary_keys: Sequence[str],
+        indexes: Sequence[str] = (),
+        sorted_indexes: Sequence[str] = (),
+    ):
         if not primary_keys:
             raise ValueError("primary_keys must be non-empty")
 
@@ -197,6 +287,29 @@ class ListBasedCollection(Collection[T]):
         self._item_type: Type[T] = item_type
         self._primary_keys: Tuple[str, ...] = tuple(primary_keys)
 
+        model_fields = getattr(item_type, "model_fields", None)
+        for field_name in [*indexes, *sorted_indexes]:
+            if model_fields is not None and field_name not in model_fields:
+                raise ValueError(f"Cannot index '{field_name}': field does not exist on {item_type.__name__}")
+        # field -> value -> primary key values -> item
+        self._indexes: Dict[str, Dict[Any, Dict[Tuple[Any, ...], T]]] = {field_name: {} for field_name in indexes}
+        # primary key values -> indexed values at the last write, to unindex items mutated in place
+        self._indexed_values: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+        # primary key values -> insertion sequence, to return index hits in insertion order
+        self._insertion_seq: Dict[Tuple[Any, ...], int] = {}
+        self._next_insertion_seq = 0
+        # field -> [(sort value, insertion sequence, primary key values, item)], ascending
+        self._sorted_indexes: Dict[str, List[Tuple[Any, int, Tuple[Any, ...], T]]] = {
+            field_name: [] for field_name in sorted_indexes
+        }
+        # primary key values -> sort values at the last write
+        self._sorted_values: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+        # field -> number of items whose sort value cannot be ordered; the index is unusable while non-zero
+        self._unsortable_counts: Dict[str, int] = {field_name: 0 for field_name in sorted_indexes}
+        # Set by InMemoryLightningCollections when the mutations are journaled.
+        self._journal: Optional[CollectionJournal] = None
+        self._journal_name = ""
+
         # Pre-populate the collection with the given items.
         for item in items or []:
             self._mutate_single(item, mode="insert")
@@ -282,6 +395,103 @@ class ListBasedCollection(Collection[T]):
         # We should always return inside the loop.
         raise RuntimeError("Unreachable")
 
+    def _index_item(self, key_values: Tuple[Any, ...], item: T, inserted: bool) -> None:
+        """Point the secondary indexes at the latest version of the item."""
+        if not self._indexes and not self._sorted_indexes:
+            return
+        if inserted:
+            self._insertion_seq[key_values] = self._next_insertion_seq
+            self._next_insertion_seq += 1
+        else:
+            self._unindex_hashed(key_values)
+        if self._indexes:
+            values = tuple(getattr(item, field_name, None) for field_name in self._indexes)
+            for (field_name, index), value in zip(self._indexes.items(), values):
+                index.setdefault(value, {})[key_values] = item
+            self._indexed_values[key_values] = values
+        if self._sorted_indexes:
+            self._index_sorted(key_values, item)
+
+    def _unindex_item(self, key_values: Tuple[Any, ...]) -> None:
+        """Remove the item from the secondary indexes, using the values recorded at the last write."""
+        if not self._indexes and not self._sorted_indexes:
+            return
+        self._unindex_hashed(key_values)
+        seq = self._insertion_seq.pop(key_values, None)
+        old_values = self._sorted_values.pop(key_values, None)
+        if seq is None or old_values is None:
+            return
+        for field_name, old_value in zip(self._sorted_indexes, old_values):
+            self._remove_sorted_entry(field_name, old_value, seq)
+
+    def _unindex_hashed(self, key_values: Tuple[Any, ...]) -> None:
+        values = self._indexed_values.pop(key_values, None)
+        if values is None:
+            return
+        for index, value in zip(self._indexes.values(), values):
+            bucket = index.get(value)
+            if bucket is None:
+                continue
+            bucket.pop(key_values, None)
+            if not bucket:
+                del index[value]
+
+    def _index_sorted(self, key_values: Tuple[Any, ...], item: T) -> None:
+        seq = self._insertion_seq[key_values]
+        old_values = self._sorted_values.get(key_values)
+        new_values: List[Any] = []
+        for idx, (field_name, entries) in enumerate(self._sorted_indexes.items()):
+            try:
+                value = _get_sort_value(item, field_name)
+            except ValueError:
+                value = _UNSORTABLE
+            old_value = old_values[idx] if old_values is not None else _UNSORTABLE
+            if (
+                old_values is not None
+                and value is not _UNSORTABLE
+                and old_value is not _UNSORTABLE
+                and old_value == value
+            ):
+                # Sort value unchanged: swap in the new item without moving the entry.
+                entries[bisect.bisect_left(entries, (value, seq))] = (value, seq, key_values, item)
+            else:
+                if old_values is not None:
+                    self._remove_sorted_entry(field_name, old_value, seq)
+                value = self._insert_sorted_entry(field_name, value, seq, key_values, item)
+            new_values.append(value)
+        self._sorted_values[key_values] = tuple(new_values)
+
+    def _insert_sorted_entry(self, field_name: str, value: Any, seq: int, key_values: Tuple[Any, ...], item: T) -> Any:
+        """Insert an entry and return the sort value actually recorded."""
+        if value is not _UNSORTABLE:
+            try:
+                bisect.insort(self._sorted_indexes[field_name], (value, seq, key_values, item))
+                return value
+            except TypeError:
+                # Not comparable with the other values (e.g., mixed types); sorting by it must fail as usual.
+                pass
+        self._unsortable_counts[field_name] += 1
+        return _UNSORTABLE
+
+    def _remove_sorted_entry(self, field_name: str, value: Any, seq: int) -> None:
+        if value is _UNSORTABLE:
+            self._unsortable_counts[field_name] -= 1
+            return
+        entries = self._sorted_indexes[field_name]
+        del entries[bisect.bisect_left(entries, (value, seq))]
+
+    def _iter_sorted(self, sort_by: str, sort_order: Literal["asc", "desc"]) -> Optional[Iterator[T]]:
+        """Iterate over all items in sort order using an ordered index, or None if there is no usable one.
+
+        The order is identical to a stable sort of the items in insertion order.
+        """
+        entries = self._sorted_indexes.get(sort_by)
+        if entries is None or self._unsortable_counts[sort_by]:
+            return None
+        if sort_order == "asc":
+            return (entry[3] for entry in entries)
+        return _iter_entries_desc(entries)
+
     def _mutate_single(self, item: T, mode: MutationMode) -> None:
         """Core mutation logic shared by insert, update, upsert, and delete."""
         self._ensure_item_type(item)
@@ -300,6 +510,7 @@ class ListBasedCollection(Collection[T]):
                 if not exists:
                     self._size += 1
                 parent[final_key] = item
+            self._index_item(key_values, item, inserted=not exists)
 
         elif mode in ("update", "delete"):
             # For update/delete we must not create missing paths.
@@ -315,12 +526,37 @@ class ListBasedCollection(Collection[T]):
 
             if mode == "update":
                 parent[final_key] = item
+                self._index_item(key_values, item, inserted=False)
             else:  # delete
                 del parent[final_key]
                 self._size -= 1
+                self._unindex_item(key_values)
         else:
             raise ValueError(f"Unknown mutation mode: {mode}")
 
+    def _mutate_many(self, items: Sequence[T], mode: MutationMode) -> None:
+        """Apply the mutation item by item, journaling the items that were applied (even if a later one fails)."""
+        applied = 0
+        try:
+            for item in items:
+                self._mutate_single(item, mode=mode)
+                applied += 1
+        finally:
+            if self._journal is not None and applied:
+                self._journal.record(self._journal_name, mode, list(items[:applied]))
+
+    def _iter_in_insertion_order(self) -> Iterator[T]:
+        """Iterate over all items, depth-first in the insertion order of every level of the nested dicts."""
+        stack: List[Iterator[Any]] = [iter(self._items.values())]
+        while stack:
+            for value in stack[-1]:
+                if isinstance(value, dict):
+                    stack.append(iter(cast(Dict[Any, Any], value).values()))
+                    break
+                yield value
+            else:
+                stack.pop()
+
     def _iter_items(
         self,
         root: Optional[Mapping[Any, Any]] = None,
@@ -402,7 +638,17 @@ class ListBasedCollection(Collection[T]):
                 break
             pk_values_prefix.append(value)
 
+        if len(pk_values_prefix) == len(self._primary_keys) - 1:
+            looked_up = self._lookup_last_primary_key(
+                pk_values_prefix, prefix_sources, filters, must_filters, filter_logic
+            )
+            if looked_up is not None:
+                return looked_up
+
         if not pk_values_prefix:
+            indexed_items = self._iter_indexed_items(filters, must_filters, filter_logic)
+            if indexed_items is not None:
+                return indexed_items
             return self._iter_items(filters=filters, must_filters=must_filters, filter_logic=filter_logic)
 
         try:
@@ -434,12 +680,108 @@ class ListBasedCollection(Collection[T]):
             # No items exist for this primary-key prefix.
             return ()
 
+    def _lookup_last_primary_key(
+        self,
+        pk_values_prefix: List[Any],
+        constraint_sources: List[FilterMap],
+        filters: Optional[FilterMap],
+        must_filters: Optional[FilterMap],
+        filter_logic: Literal["and", "or"],
+    ) -> Optional[List[T]]:
+        """Answer an `exact`/`within` constraint on the last primary key with point lookups below the prefix.
+
+        Keeps a duplicate check of a few keys (e.g., span IDs) from scanning the whole rollout.
+        Returns None when the constraint does not apply, when a scan is cheaper, or when the matches
+        cannot be put back in scan order, in which case the caller must scan.
+        """
+        allowed: Optional[List[Any]] = None
+        for source in constraint_sources:
+            field_ops = source.get(self._primary_keys[-1])
+            values = _allowed_index_values(field_ops) if field_ops else None
+            if values is not None and (allowed is None or len(values) < len(allowed)):
+                allowed = values
+        if allowed is None:
+            return None
+
+        if pk_values_prefix:
+            try:
+                parent, final_key = self._locate_node(pk_values_prefix, create_missing=False)
+            except KeyError:
+                return []
+            leaf = parent.get(final_key)
+            if not isinstance(leaf, dict):
+                return []
+        else:
+            leaf = self._items
+        if len(allowed) > len(leaf):  # type: ignore
+            return None
+
+        matches: List[T] = []
+        for value in allowed:
+            item = leaf.get(value)  # type: ignore
+            if item is not None and _item_matches_filters(item, filters, filter_logic, must_filters):
+                matches.append(item)
+        if len(matches) > 1:
+            if not self._indexes and not self._sorted_indexes:
+                # The insertion order is not tracked, and only a scan yields the items in that order.
+                return None
+            matches.sort(key=lambda item: self._insertion_seq[self._extract_primary_key_values(item)])
+        return matches
+
+    def _iter_indexed_items(
+        self,
+        filters: Optional[FilterMap],
+        must_filters: Optional[FilterMap],
+        filter_logic: Literal["and", "or"],
+    ) -> Optional[Iterable[T]]:
+        """Answer the filters from the most selective secondary index.
+
+        Only `exact`/`within` constraints that every match must satisfy are eligible.
+        Returns None when no index applies, in which case the caller must scan.
+        """
+        if not self._indexes:
+            return None
+
+        constraint_sources: List[FilterMap] = []
+        if must_filters:
+            constraint_sources.append(must_filters)
+        if filter_logic == "and" and filters:
+            constraint_sources.append(filters)
+
+        best: Optional[List[Dict[Tuple[Any, ...], T]]] = None
+        best_size = -1
+        for source in constraint_sources:
+            for field_name, ops in source.items():
+                index = self._indexes.get(field_name)
+                if index is None:
+                    continue
+                allowed = _allowed_index_values(ops)
+                if allowed is None:
+                    continue
+                buckets = [index[value] for value in allowed if value in index]
+                size = sum(len(bucket) for bucket in buckets)
+                if best is None or size < best_size:
+                    best, best_size = buckets, size
+
+        if best is None:
+            return None
+        candidates: Dict[Tuple[Any, ...], T] = {}
+        for bucket in best:
+            candidates.update(bucket)
+        # Items move between buckets as they are updated; restore the insertion order of a full scan.
+        return [
+            item
+            for key, item in sorted(candidates.items(), key=lambda entry: self._insertion_seq[entry[0]])
+            if _item_matches_filters(item, filters, filter_logic, must_filters)
+        ]
+
     async def query(
         self,
         filter: Optional[FilterOptions] = None,
         sort: Optional[SortOptions] = None,
         limit: int = -1,
         offset: int = 0,
+        projection: Optional[Projection] = None,
     ) -> PaginatedResult[T]:
         """Query the collection with filters, sort order, and pagination.
 
@@ -448,9 +790,40 @@ class ListBasedCollection(Collection[T]):
             sort: Options describing which field to sort by and in which order.
             limit: Max number of items to return. Use -1 for "no limit".
             offset: Number of items to skip from the start of the *matching* items.
+            projection: The part of each item to return. Applied to the page only, after pagination.
         """
+        result = self._query_page(filter, sort, limit, offset)
+        if projection is None:
+            return result
+        return PaginatedResult(
+            items=[project_item(item, projection, self._primary_keys) for item in result.items],
+            limit=result.limit,
+            offset=result.offset,
+            total=result.total,
+        )
+
+    def _query_page(
+        self,
+        filter: Optional[FilterOptions],
+        sort: Optional[SortOptions],
+        limit: int,
+        offset: int,
+    ) -> PaginatedResult[T]:
         filters, must_filters, filter_logic = normalize_filter_options(filter)
         sort_by, sort_order = resolve_sort_options(sort)
+
+        if sort_by and not filters and not must_filters:
+            # Unfiltered: read the page straight from the ordered index if there is one.
+            ordered = self._iter_sorted(sort_by, sort_order)
+            if ordered is not None:
+                stop = None if limit == -1 else offset + limit
+                return PaginatedResult(
+                    items=list(itertools.islice(ordered, offset, stop)),
+                    limit=limit,
+                    offset=offset,
+                    total=self._size,
+                )
+
         items_iter: Iterable[T] = self._iter_matching_items(filters, must_filters, filter_logic)
 
         # No sorting: stream through items and apply pagination on the fly.
@@ -483,12 +856,24 @@ class ListBasedCollection(Collection[T]):
 
         total_matched = len(all_matches)
         reverse = sort_order == "desc"
-        all_matches.sort(key=lambda x: _get_sort_value(x, sort_by), reverse=reverse)
 
-        if limit == -1:
-            paginated_items = all_matches[offset:]
+        def sort_key(x: T) -> Any:
+            return _get_sort_value(x, sort_by)
+
+        if limit != -1 and offset + limit < total_matched:
+            # Only the first `offset + limit` items are needed: top-k selection instead of a full sort.
+            # Both heapq functions are stable, exactly like `list.sort`.
+            if reverse:
+                top_items = heapq.nlargest(offset + limit, all_matches, key=sort_key)
+            else:
+                top_items = heapq.nsmallest(offset + limit, all_matches, key=sort_key)
+            paginated_items = top_items[offset:]
         else:
-            paginated_items = all_matches[offset : offset + limit]
+            all_matches.sort(key=sort_key, reverse=reverse)
+            if limit == -1:
+                paginated_items = all_matches[offset:]
+            else:
+                paginated_items = all_matches[offset : offset + limit]
 
         return PaginatedResult(
             items=paginated_items,
@@ -497,6 +882,35 @@ class ListBasedCollection(Collection[T]):
             total=total_matched,
         )
 
+    async def query_after(
+        self,
+        keys: Sequence[str],
+        filter: Optional[FilterOptions] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: int = -1,
+    ) -> List[T]:
+        """Keyset pagination over the matching items, with top-k selection when `limit` is set.
+
+        Only the current page is materialized and sorted; the cost of a page does not depend on its position.
+        """
+        if not keys:
+            raise ValueError("keys must be non-empty")
+        if after is not None and len(after) > len(keys):
+            raise ValueError(f"Cursor {after!r} has more values than the keys {list(keys)!r}")
+        filters, must_filters, filter_logic = normalize_filter_options(filter)
+
+        def key_of(item: T) -> Tuple[Any, ...]:
+            return tuple(_get_sort_value(item, key) for key in keys)
+
+        items_iter: Iterable[T] = self._iter_matching_items(filters, must_filters, filter_logic)
+        if after:
+            cursor = tuple(after)
+            items_iter = (item for item in items_iter if key_of(item)[: len(cursor)] > cursor)
+
+        if limit == -1:
+            return sorted(items_iter, key=key_of)
+        return heapq.nsmallest(limit, items_iter, key=key_of)
+
     async def get(
         self,
         filter: Optional[FilterOptions] = None,
@@ -505,6 +919,13 @@ class ListBasedCollection(Collection[T]):
         """Return the first (or best-sorted) item that matches the given filters, or None."""
         filters, must_filters, filter_logic = normalize_filter_options(filter)
         sort_by, sort_order = resolve_sort_options(sort)
+
+        if sort_by and not filters and not must_filters:
+            # Unfiltered: the best item is at one end of the ordered index.
+            ordered = self._iter_sorted(sort_by, sort_order)
+            if ordered is not None:
+                return next(ordered, None)
+
         items_iter: Iterable[T] = self._iter_matching_items(filters, must_filters, filter_logic)
 
         if not sort_by:
@@ -539,8 +960,7 @@ class ListBasedCollection(Collection[T]):
         Raises:
             ValueError: If any item with the same primary keys already exists.
         """
-        for item in items:
-            self._mutate_single(item, mode="insert")
+        self._mutate_many(items, mode="insert")
 
     async def update(self, items: Sequence[T]) -> None:
         """Update the given items.
@@ -548,13 +968,11 @@ class ListBasedCollection(Collection[T]):
         Raises:
             ValueError: If any item with the given primary keys does not exist.
         """
-        for item in items:
-            self._mutate_single(item, mode="update")
+        self._mutate_many(items, mode="update")
 
     async def upsert(self, items: Sequence[T]) -> None:
         """Upsert the given items (insert if missing, otherwise update)."""
-        for item in items:
-            self._mutate_single(item, mode="upsert")
+        self._mutate_many(items, mode="upsert")
 
     async def delete(self, items: Sequence[T]) -> None:
         """Delete the given items.
@@ -562,11 +980,128 @@ class ListBasedCollection(Collection[T]):
         Raises:
             ValueError: If any item with the given primary keys does not exist.
         """
-        # We use a two-phase approach to avoid partial deletion if one fails:
-        # first compute key_values to validate, then perform deletions.
-        for item in items:
-            # _mutate_single will validate existence and update size.
-            self._mutate_single(item, mode="delete")
+        # _mutate_single will validate existence and update size.
+        self._mutate_many(items, mode="delete")
+
+
+class SpanCollection(ListBasedCollection[Span]):
+    """Span collection whose evicted rollouts can be kept in a [`SpanSpill`][agentlightning.store.collection.spill.SpanSpill].
+
+    Queries touching a spilled rollout transparently read its spans back from disk and merge them with the
+    spans of that rollout still in memory. Queries pinned to specific rollouts (`exact`/`within` on
+    `rollout_id`, as issued by the store) only read those rollouts back. Spilled spans are read-only, and
+    `size()` only counts the resident spans.
+
+    Args:
+        spill: Where evicted spans go. Without a spill, evicted spans are dropped.
+    """
+
+    def __init__(self, spill: Optional[SpanSpill] = None):
+        super().__init__(items=[], item_type=Span, primary_keys=["rollout_id", "attempt_id", "span_id"])
+        self._spill = spill
+        self._dropped_rollout_ids: Set[str] = set()
+
+    @property
+    def spill(self) -> Optional[SpanSpill]:
+        return self._spill
+
+    @property
+    def dropped_rollout_ids(self) -> Set[str]:
+        """Rollouts whose spans were evicted without a spill, and are therefore lost."""
+        return self._dropped_rollout_ids
+
+    def evict_rollout(self, rollout_id: str) -> int:
+        """Remove all spans of a rollout from memory, spilling them first if a spill is configured.
+
+        Returns:
+            The number of spans evicted.
+        """
+        subtree = self._items.get(rollout_id)
+        if not subtree:
+            return 0
+        spans = list(self._iter_items(root={rollout_id: subtree}))
+        if self._spill is not None:
+            self._spill.append(rollout_id, spans)
+        else:
+            self._dropped_rollout_ids.add(rollout_id)
+        self._remove_rollout(rollout_id, spans)
+        if self._journal is not None:
+            self._journal.record(self._journal_name, "evict", rollout_id)
+        return len(spans)
+
+    def _remove_rollout(self, rollout_id: str, spans: Optional[Sequence[Span]] = None) -> None:
+        if spans is None:
+            subtree = self._items.get(rollout_id)
+            spans = list(self._iter_items(root={rollout_id: subtree})) if subtree else []
+        for span in spans:
+            self._mutate_single(span, mode="delete")
+        self._items.pop(rollout_id, None)
+
+    def _spilled_view(self, filter: Optional[FilterOptions]) -> Optional[ListBasedCollection[Span]]:
+        """A temporary collection holding the spilled and resident spans of the rollouts the filter can
+        match, or None if none of them has been spilled."""
+        if self._spill is None or not self._spill.rollout_ids():
+            return None
+        filters, must_filters, filter_logic = normalize_filter_options(filter)
+        rollout_ids: Optional[List[Any]] = None
+        constraint_sources = [must_filters] if must_filters else []
+        if filter_logic == "and" and filters:
+            constraint_sources.append(filters)
+        for source in constraint_sources:
+            if "rollout_id" in source:
+                rollout_ids = _allowed_index_values(source["rollout_id"])
+                if rollout_ids is not None:
+                    break
+        if rollout_ids is None:
+            rollout_ids = list(self._spill.rollout_ids() | set(self._items))
+        elif not any(rollout_id in self._spill for rollout_id in rollout_ids):
+            return None
+
+        view = ListBasedCollection(items=[], item_type=Span, primary_keys=self._primary_keys)
+        for rollout_id in rollout_ids:
+            if rollout_id in self._spill:
+                for span in self._spill.read(rollout_id):
+                    view._mutate_single(span, mode="upsert")
+            subtree = self._items.get(rollout_id)
+            if subtree:
+                for span in self._iter_items(root={rollout_id: subtree}):
+                    view._mutate_single(span, mode="upsert")
+        return view
+
+    async def query(
+        self,
+        filter: Optional[FilterOptions] = None,
+        sort: Optional[SortOptions] = None,
+        limit: int = -1,
+        offset: int = 0,
+        projection: Optional[Projection] = None,
+    ) -> PaginatedResult[Span]:
+        view = self._spilled_view(filter)
+        if view is not None:
+            return await view.query(filter=filter, sort=sort, limit=limit, offset=offset, projection=projection)
+        return await super().query(filter=filter, sort=sort, limit=limit, offset=offset, projection=projection)
+
+    async def query_after(
+        self,
+        keys: Sequence[str],
+        filter: Optional[FilterOptions] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: int = -1,
+    ) -> List[Span]:
+        view = self._spilled_view(filter)
+        if view is not None:
+            return await view.query_after(keys, filter=filter, after=after, limit=limit)
+        return await super().query_after(keys, filter=filter, after=after, limit=limit)
+
+    async def get(
+        self,
+        filter: Optional[FilterOptions] = None,
+        sort: Optional[SortOptions] = None,
+    ) -> Optional[Span]:
+        view = self._spilled_view(filter)
+        if view is not None:
+            return await view.get(filter=filter, sort=sort)
+        return await super().get(filter=filter, sort=sort)
 
 
 class DequeBasedQueue(Queue[T]):
@@ -580,6 +1115,8 @@ class DequeBasedQueue(Queue[T]):
         self._item_type: Type[T] = item_type
         if items:
             self._items.extend(items)
+        self._journal: Optional[CollectionJournal] = None
+        self._journal_name = ""
 
     def item_type(self) -> Type[T]:
         return self._item_type
@@ -597,6 +1134,8 @@ class DequeBasedQueue(Queue[T]):
             if not isinstance(item, self._item_type):
                 raise TypeError(f"Expected item of type {self._item_type.__name__}, got {type(item).__name__}")
             self._items.append(item)
+        if self._journal is not None and items:
+            self._journal.record(self._journal_name, "enqueue", list(items))
         return items
 
     async def dequeue(self, limit: int = 1) -> Sequence[T]:
@@ -605,6 +1144,8 @@ class DequeBasedQueue(Queue[T]):
         out: List[T] = []
         for _ in range(min(limit, len(self._items))):
             out.append(self._items.popleft())
+        if self._journal is not None and out:
+            self._journal.record(self._journal_name, "dequeue", len(out))
         return out
 
     async def peek(self, limit: int = 1) -> Sequence[T]:
@@ -627,6 +1168,8 @@ class DictBasedKeyValue(KeyValue[K, V]):
 
     def __init__(self, data: Optional[Mapping[K, V]] = None):
         self._values: Dict[K, V] = dict(data) if data else {}
+        self._journal: Optional[CollectionJournal] = None
+        self._journal_name = ""
 
     async def has(self, key: K) -> bool:
         return key in self._values
@@ -636,8 +1179,12 @@ class DictBasedKeyValue(KeyValue[K, V]):
 
     async def set(self, key: K, value: V) -> None:
         self._values[key] = value
+        if self._journal is not None:
+            self._journal.record(self._journal_name, "set", [[key, value]])
 
     async def pop(self, key: K, default: V | None = None) -> V | None:
+        if self._journal is not None and key in self._values:
+            self._journal.record(self._journal_name, "pop", key)
         return self._values.pop(key, default)
 
     async def size(self) -> int:
@@ -648,19 +1195,41 @@ class InMemoryLightningCollections(LightningCollections):
     """In-memory implementation of LightningCollections using Python data structures.
 
     Serves as the storage base for [`InMemoryLightningStore`][agentlightning.InMemoryLightningStore].
+
+    Args:
+        span_spill: Where to keep the spans evicted by `evict_spans_for_rollout`. They are dropped if not set.
+        journal: Journal to record every mutation to. The collections are first restored from it.
     """
 
-    def __init__(self):
+    def __init__(self, span_spill: Optional[SpanSpill] = None, journal: Optional[CollectionJournal] = None):
         self._lock = _LoopAwareAsyncLock()
-        self._rollouts = ListBasedCollection(items=[], item_type=Rollout, primary_keys=["rollout_id"])
-        self._attempts = ListBasedCollection(items=[], item_type=Attempt, primary_keys=["rollout_id", "attempt_id"])
-        self._spans = ListBasedCollection(
-            items=[], item_type=Span, primary_keys=["rollout_id", "attempt_id", "span_id"]
+        # Odd while an atomic block is running; read blocks compare it before and after running lock-free.
+        self._write_version = 0
+        # Secondary indexes back the status/mode/worker filters used by the store and the healthcheck,
+        # and the most common sort keys (rollout listings and latest-resources lookups).
+        self._rollouts = ListBasedCollection(
+            items=[],
+            item_type=Rollout,
+            primary_keys=["rollout_id"],
+            indexes=["status", "mode"],
+            sorted_indexes=["start_time"],
+        )
+        self._attempts = ListBasedCollection(
+            items=[], item_type=Attempt, primary_keys=["rollout_id", "attempt_id"], indexes=["status", "worker_id"]
         )
-        self._resources = ListBasedCollection(items=[], item_type=ResourcesUpdate, primary_keys=["resources_id"])
-        self._workers = ListBasedCollection(items=[], item_type=Worker, primary_keys=["worker_id"])
+        self._spans = SpanCollection(spill=span_spill)
+        self._resources = ListBasedCollection(
+            items=[], item_type=ResourcesUpdate, primary_keys=["resources_id"], sorted_indexes=["update_time"]
+        )
+        self._workers = ListBasedCollection(items=[], item_type=Worker, primary_keys=["worker_id"], indexes=["status"])
         self._rollout_queue = DequeBasedQueue(items=[], item_type=str)
         self._span_sequence_ids = DictBasedKeyValue[str, int](data={})  # rollout_id -> sequence_id
+        self._latest_attempt_ids = DictBasedKeyValue[str, str](data={})  # rollout_id -> attempt_id
+
+        self._journal = journal
+        self._restore_stats: Optional[JournalRestoreStats] = None
+        if journal is not None:
+            self._attach_journal(journal)
 
     @property
     def rollouts(self) -> ListBasedCollection[Rollout]:
@@ -671,7 +1240,7 @@ class InMemoryLightningCollections(LightningCollections):
         return self._attempts
 
     @property
-    def spans(self) -> ListBasedCollection[Span]:
+    def spans(self) -> SpanCollection:
         return self._spans
 
     @property
@@ -690,18 +1259,145 @@ class InMemoryLightningCollections(LightningCollections):
     def span_sequence_ids(self) -> DictBasedKeyValue[str, int]:
         return self._span_sequence_ids
 
+    @property
+    def latest_attempt_ids(self) -> DictBasedKeyValue[str, str]:
+        return self._latest_attempt_ids
+
+    @property
+    def journal(self) -> Optional[CollectionJournal]:
+        return self._journal
+
+    @property
+    def restore_stats(self) -> Optional[JournalRestoreStats]:
+        """What was restored from the journal at construction, or None without a journal."""
+        return self._restore_stats
+
+    def _journaled(
+        self,
+    ) -> Dict[str, Union[ListBasedCollection[Any], DequeBasedQueue[Any], DictBasedKeyValue[Any, Any]]]:
+        return {
+            "rollouts": self._rollouts,
+            "attempts": self._attempts,
+            "spans": self._spans,
+            "resources": self._resources,
+            "workers": self._workers,
+            "rollout_queue": self._rollout_queue,
+            "span_sequence_ids": self._span_sequence_ids,
+            "latest_attempt_ids": self._latest_attempt_ids,
+        }
+
+    def _attach_journal(self, journal: CollectionJournal) -> None:
+        """Restore the collections from the journal, then record their mutations to it."""
+        journaled = self._journaled()
+        for name, target in journaled.items():
+            if isinstance(target, ListBasedCollection):
+                journal.register(name, ["insert", "update", "upsert", "delete"], TypeAdapter(List[target.item_type()]))
+        self._restore_stats = journal.restore(self._replay_journal_record)
+        for name, target in journaled.items():
+            target._journal = journal
+            target._journal_name = name
+
+    def _replay_journal_record(self, name: str, operation: str, payload: Any) -> None:
+        target = self._journaled()[name]
+        if isinstance(target, ListBasedCollection):
+            if operation == "evict":
+                # The spill files of the previous process are gone: its spilled spans are lost as well.
+                self._spans._remove_rollout(payload)
+                self._spans.dropped_rollout_ids.add(payload)
+            elif operation == "dropped":
+                self._spans.dropped_rollout_ids.update(payload)
+            elif operation == "delete":
+                for item in payload:
+                    try:
+                        target._mutate_single(item, mode="delete")
+                    except ValueError:
+                        pass
+            else:
+                for item in payload:
+                    target._mutate_single(item, mode="upsert")
+        elif isinstance(target, DequeBasedQueue):
+            if operation == "enqueue":
+                target._items.extend(payload)
+            else:
+                for _ in range(min(payload, len(target._items))):
+                    target._items.popleft()
+        else:
+            if operation == "set":
+                for key, value in payload:
+                    target._values[key] = value
+            else:
+                target._values.pop(payload, None)
+
+    def capture(self) -> List[Tuple[str, str, List[Any]]]:
+        """References to the current content of every collection, as `(name, operation, payload)` journal records.
+
+        The rollouts whose spans were evicted are captured as dropped, so that their spans are still reported
+        as evicted after a restore from the snapshot. This includes the spilled rollouts, since the spill files
+        do not outlive the process.
+
+        Used by [`CollectionJournal.snapshot()`][agentlightning.store.collection.journal.CollectionJournal.snapshot];
+        must be called while no mutation is in progress.
+        """
+        captured: List[Tuple[str, str, List[Any]]] = []
+        for name, target in self._journaled().items():
+            if isinstance(target, ListBasedCollection):
+                captured.append((name, "upsert", list(target._iter_in_insertion_order())))
+            elif isinstance(target, DequeBasedQueue):
+                captured.append((name, "enqueue", list(target._items)))
+            else:
+                captured.append((name, "set", [[key, value] for key, value in target._values.items()]))
+        dropped = set(self._spans.dropped_rollout_ids)
+        if self._spans.spill is not None:
+            dropped.update(self._spans.spill.rollout_ids())
+        captured.append(("spans", "dropped", sorted(dropped)))
+        return captured
+
     @asynccontextmanager
     async def atomic(self, *args: Any, **kwargs: Any):
-        """In-memory collections apply a lock outside. It doesn't need to manipulate the collections inside."""
+        """In-memory collections apply a lock outside. It doesn't need to manipulate the collections inside.
+
+        With a journal, a due snapshot is captured at the end of the block, while the lock is still held.
+        """
         async with self._lock:
-            yield self
+            self._write_version += 1
+            try:
+                yield self
+                if self._journal is not None:
+                    self._journal.maybe_snapshot(self)
+            finally:
+                self._write_version += 1
 
-    async def evict_spans_for_rollout(self, rollout_id: str) -> None:
-        """Evict all spans for a given rollout ID.
+    @asynccontextmanager
+    async def read(self, *args: Any, **kwargs: Any):
+        """Read the live collections without taking the lock.
+
+        In-memory operations never suspend, so a read block that does not suspend either cannot observe a
+        write halfway. Use [`execute_read()`][agentlightning.store.collection.InMemoryLightningCollections.execute_read]
+        to also be safe against blocks that do.
+        """
+        yield self
 
-        Uses private API for efficiency.
+    async def execute_read(self, callback: Callable[[Self], Awaitable[T_result]]) -> T_result:
+        """Run the read-only callback without the lock, and validate it against the write version.
+
+        If an atomic block was running or has committed while the callback was suspended, the result may mix
+        states, and the callback is run again under the lock instead.
         """
-        self._spans._items.pop(rollout_id, [])  # pyright: ignore[reportPrivateUsage]
+        version = self._write_version
+        if version % 2 == 0:
+            try:
+                result = await callback(self)
+            except Exception:
+                if self._write_version == version:
+                    raise
+            else:
+                if self._write_version == version:
+                    return result
+        return await self.execute(callback)
+
+    async def evict_spans_for_rollout(self, rollout_id: str) -> None:
+        """Evict all spans for a given rollout ID, spilling them to disk if a span spill is configured."""
+        self._spans.evict_rollout(rollout_id)
 
 
 class _LoopAwareAsyncLock:
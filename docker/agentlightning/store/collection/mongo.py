@@ -6,8 +6,9 @@ import asyncio
 import logging
 import re
 import threading
+import uuid
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -16,12 +17,16 @@ from typing import (
     Dict,
     Generic,
     List,
+    Literal,
     Mapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Type,
+    TypedDict,
     TypeVar,
+    Union,
     cast,
 )
 
@@ -29,12 +34,30 @@ if TYPE_CHECKING:
     from typing import Self
 
 from pydantic import BaseModel, TypeAdapter
-from pymongo import AsyncMongoClient, ReadPreference, WriteConcern
+from pymongo import (
+    AsyncMongoClient,
+    DeleteOne,
+    IndexModel,
+    InsertOne,
+    ReadPreference,
+    ReplaceOne,
+    ReturnDocument,
+    UpdateOne,
+    WriteConcern,
+)
 from pymongo.asynchronous.client_session import AsyncClientSession
 from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.database import AsyncDatabase
-from pymongo.errors import CollectionInvalid, ConnectionFailure, DuplicateKeyError, OperationFailure, PyMongoError
+from pymongo.errors import (
+    BulkWriteError,
+    CollectionInvalid,
+    ConnectionFailure,
+    DuplicateKeyError,
+    OperationFailure,
+    PyMongoError,
+)
 from pymongo.read_concern import ReadConcern
+from pymongo.results import BulkWriteResult
 
 from agentlightning.types import (
     Attempt,
@@ -47,7 +70,18 @@ from agentlightning.types import (
     Worker,
 )
 
-from .base import Collection, KeyValue, LightningCollections, Queue, normalize_filter_options, resolve_sort_options
+from .base import (
+    Collection,
+    KeyValue,
+    LightningCollections,
+    Projection,
+    Queue,
+    normalize_filter_options,
+    project_document,
+    resolve_projection_fields,
+    resolve_sort_options,
+)
+from .mongo_codec import MongoPayloadCodec
 
 T_model = TypeVar("T_model", bound=BaseModel)
 
@@ -58,6 +92,12 @@ T_mapping = TypeVar("T_mapping", bound=Mapping[str, Any])
 K = TypeVar("K")
 V = TypeVar("V")
 
+RANGE_PAGINATION_MIN_OFFSET = 1000
+"""Sorted queries from this offset on locate their page with a range condition instead of `skip()`."""
+
+DEFAULT_QUEUE_CONSUMED_TTL = 3600
+"""Seconds a consumed queue item is kept before the TTL index deletes it."""
+
 logger = logging.getLogger(__name__)
 
 
@@ -145,15 +185,64 @@ def _build_mongo_filter(filter_options: Optional[FilterOptions]) -> Dict[str, An
     return {"$and": must_conditions}
 
 
+def _build_keyset_filter(
+    keys: Sequence[str], after: Sequence[Any], directions: Optional[Sequence[int]] = None
+) -> Dict[str, Any]:
+    """Mongo condition selecting the documents strictly after the cursor in the order of the keys.
+
+    `(k1, k2) > (a1, a2)` expands to `k1 > a1 OR (k1 == a1 AND k2 > a2)`.
+    The keys are ascending unless `directions` says otherwise (1 for ascending, -1 for descending).
+    The cursor values must not be null. Null (or missing) values sort before all the others in Mongo,
+    so they come after the cursor on a descending key, although `$lt` does not match them.
+    """
+    branches: List[Dict[str, Any]] = []
+    for depth in range(len(after)):
+        branch: Dict[str, Any] = {key: value for key, value in zip(keys[:depth], after[:depth])}
+        if directions is not None and directions[depth] < 0:
+            branch["$or"] = [{keys[depth]: {"$lt": after[depth]}}, {keys[depth]: None}]
+        else:
+            branch[keys[depth]] = {"$gt": after[depth]}
+        branches.append(branch)
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+def _build_mongo_projection(
+    projection: Projection, model_fields: Sequence[str], primary_keys: Sequence[str]
+) -> Dict[str, Any]:
+    """Mongo projection loading the projected fields, with the key prefixes filtered on the server.
+
+    A filtered mapping field becomes `$arrayToObject` over the entries whose key starts with one of the prefixes.
+    """
+    mongo_projection: Dict[str, Any] = {} if "_id" in model_fields else {"_id": 0}
+    for field in resolve_projection_fields(projection, model_fields, primary_keys):
+        mongo_projection[field] = 1
+    for field, prefixes in projection.get("key_prefixes", {}).items():
+        if field not in mongo_projection:
+            continue
+        conditions = [{"$eq": [{"$indexOfCP": ["$$entry.k", {"$literal": prefix}]}, 0]} for prefix in prefixes]
+        mongo_projection[field] = {
+            "$arrayToObject": {
+                "$filter": {
+                    "input": {"$objectToArray": {"$ifNull": [f"${field}", {"$literal": {}}]}},
+                    "as": "entry",
+                    "cond": {"$or": conditions} if conditions else False,
+                }
+            }
+        }
+    return mongo_projection
+
+
 async def _ensure_collection(
     db: AsyncDatabase[Mapping[str, Any]],
     collection_name: str,
     primary_keys: Optional[Sequence[str]] = None,
     extra_indexes: Optional[Sequence[Sequence[str]]] = None,
+    index_models: Optional[Sequence[IndexModel]] = None,
 ) -> bool:
     """Ensure the backing MongoDB collection exists.
 
     This method is idempotent and safe to call multiple times.
+    `index_models` are indexes with options (e.g., partial or TTL indexes), created with one command.
     """
     # Create collection if it doesn't exist yet
     try:
@@ -187,7 +276,7 @@ async def _ensure_collection(
     if extra_indexes:
         for index in extra_indexes:
             try:
-                await db[collection_name].create_index(index, name=f"idx_{'_'.join(index)}")
+                await db[collection_name].create_index(_index_keys(index), name=_index_name(index))
             except OperationFailure as exc:
                 logger.debug(f"Index for collection '{collection_name}' already exists. No need to create it: {exc!r}")
                 # Ignore "index already exists" type errors
@@ -196,9 +285,38 @@ async def _ensure_collection(
                 else:
                     raise
 
+    if index_models:
+        try:
+            await db[collection_name].create_indexes(list(index_models))
+        except OperationFailure as exc:
+            logger.debug(f"Index for collection '{collection_name}' already exists. No need to create it: {exc!r}")
+            # Ignore "index already exists" type errors, e.g., an existing TTL index with another expiry
+            if exc.code in (68, 85, 86):  # IndexOptionsConflict, IndexKeySpecsConflict, etc.
+                pass
+            else:
+                raise
+
     return True
 
 
+def _index_keys(index: Sequence[str]) -> List[Tuple[str, int]]:
+    """Key specification of an index, where a leading `-` marks a descending field (e.g., `-sequence_id`)."""
+    return [(field[1:], -1) if field.startswith("-") else (field, 1) for field in index]
+
+
+def _index_name(index: Sequence[str]) -> str:
+    return "idx_" + "_".join(f"{field[1:]}_desc" if field.startswith("-") else field for field in index)
+
+
+def _with_read_concern(
+    collection: AsyncCollection[Mapping[str, Any]], read_concern: Optional[ReadConcern]
+) -> AsyncCollection[Mapping[str, Any]]:
+    """Return a view of the collection with the given read concern, or the collection itself if None."""
+    if read_concern is None:
+        return collection
+    return collection.with_options(read_concern=read_concern)
+
+
 class MongoClientPool(Generic[T_mapping]):
     """A pool of MongoDB clients, each binded to a specific event loop.
 
@@ -209,6 +327,10 @@ class MongoClientPool(Generic[T_mapping]):
     ```
 
     Use the client pool with a context manager to ensure all clients are closed when the context is exited.
+
+    The pool also remembers which collections (and their indexes) have been provisioned on the server,
+    so that the provisioning round trips happen once per pool rather than before every operation.
+    See [`ensure_collection`][agentlightning.store.collection.mongo.MongoClientPool.ensure_collection].
     """
 
     def __init__(self, client: AsyncMongoClient[T_mapping]):
@@ -219,6 +341,11 @@ class MongoClientPool(Generic[T_mapping]):
 
         self._collection_pool: Dict[Tuple[int, str, str], AsyncCollection[T_mapping]] = {}
 
+        # Provisioned (database, collection) pairs. The server-side state is shared by all event loops.
+        self._provisioned_collections: Set[Tuple[str, str]] = set()
+        # Serializes the first provisioning of a collection within each event loop.
+        self._provision_locks: Dict[Tuple[int, str, str], asyncio.Lock] = {}
+
     async def __aenter__(self) -> Self:
         return self
 
@@ -285,6 +412,59 @@ class MongoClientPool(Generic[T_mapping]):
             self._collection_pool.setdefault(key, collection)
         return collection
 
+    async def ensure_collection(
+        self,
+        database_name: str,
+        collection_name: str,
+        primary_keys: Optional[Sequence[str]] = None,
+        extra_indexes: Optional[Sequence[Sequence[str]]] = None,
+        index_models: Optional[Sequence[IndexModel]] = None,
+    ) -> AsyncCollection[T_mapping]:
+        """Get the collection, creating it and its indexes on the server the first time.
+
+        Once provisioned, later calls (from any event loop) return the pooled collection without
+        contacting the server. Concurrent first calls within an event loop provision only once.
+        Call [`invalidate_collections`][agentlightning.store.collection.mongo.MongoClientPool.invalidate_collections]
+        after dropping a collection or its indexes to provision them again.
+        """
+        if (database_name, collection_name) in self._provisioned_collections:
+            return await self.get_collection(database_name, collection_name)
+
+        lock_key = (id(asyncio.get_running_loop()), database_name, collection_name)
+        with self._lock:
+            provision_lock = self._provision_locks.setdefault(lock_key, asyncio.Lock())
+        async with provision_lock:
+            # Another task may have provisioned the collection while we were waiting.
+            if (database_name, collection_name) not in self._provisioned_collections:
+                client = await self.get_client()
+                await _ensure_collection(
+                    cast(AsyncDatabase[Mapping[str, Any]], client[database_name]),
+                    collection_name,
+                    primary_keys,
+                    extra_indexes,
+                    index_models,
+                )
+                with self._lock:
+                    self._provisioned_collections.add((database_name, collection_name))
+        return await self.get_collection(database_name, collection_name)
+
+    def invalidate_collections(
+        self, database_name: Optional[str] = None, collection_name: Optional[str] = None
+    ) -> None:
+        """Forget that collections have been provisioned, so that the next use creates them and their indexes again.
+
+        Args:
+            database_name: Only forget the collections of this database. All databases if None.
+            collection_name: Only forget the collections with this name. All collections if None.
+        """
+        with self._lock:
+            self._provisioned_collections = {
+                (database, collection)
+                for database, collection in self._provisioned_collections
+                if (database_name is not None and database != database_name)
+                or (collection_name is not None and collection != collection_name)
+            }
+
 
 class MongoBasedCollection(Collection[T_model]):
     """Mongo-based implementation of Collection.
@@ -296,7 +476,12 @@ class MongoBasedCollection(Collection[T_model]):
         partition_id: The partition ID. Used to partition the collection into multiple collections.
         primary_keys: The primary keys of the collection.
         item_type: The type of the items in the collection.
-        extra_indexes: The extra indexes to create on the collection.
+        extra_indexes: The extra (possibly compound) indexes to create on the collection.
+            A leading `-` on a field makes it descending in the index.
+        ordered_writes: Whether the bulk writes stop at the first failing item (ordered) or attempt
+            all the items (unordered, which lets the server apply them in parallel).
+        payload_codec: Stores the oversized field values compressed or in a blob collection,
+            and restores them when reading. See [`MongoPayloadCodec`][agentlightning.store.collection.mongo_codec.MongoPayloadCodec].
     """
 
     def __init__(
@@ -308,6 +493,8 @@ class MongoBasedCollection(Collection[T_model]):
         primary_keys: Sequence[str],
         item_type: Type[T_model],
         extra_indexes: Sequence[Sequence[str]] = [],
+        ordered_writes: bool = True,
+        payload_codec: Optional[MongoPayloadCodec] = None,
     ):
         if isinstance(client_pool, AsyncMongoClient):
             self._client_pool = MongoClientPool(client_pool)
@@ -316,9 +503,11 @@ class MongoBasedCollection(Collection[T_model]):
         self._database_name = database_name
         self._collection_name = collection_name
         self._partition_id = partition_id
-        self._collection_created = False
         self._extra_indexes = [list(index) for index in extra_indexes]
+        self._ordered_writes = ordered_writes
+        self._payload_codec = payload_codec
         self._session: Optional[AsyncClientSession] = None
+        self._read_concern: Optional[ReadConcern] = None
 
         if not primary_keys:
             raise ValueError("primary_keys must be non-empty")
@@ -335,16 +524,21 @@ class MongoBasedCollection(Collection[T_model]):
 
         It will also create a unique index across the configured primary key fields.
         """
-        if not self._collection_created:
-            client = await self._client_pool.get_client()
-            self._collection_created = await _ensure_collection(
-                client[self._database_name], self._collection_name, self._primary_keys, self._extra_indexes
-            )
+        collection = await self._client_pool.ensure_collection(
+            self._database_name, self._collection_name, self._primary_keys, self._extra_indexes
+        )
+        if self._payload_codec is not None and self._payload_codec.offloads:
+            # Created up front, since the blobs may be written within a transaction.
+            await self._client_pool.ensure_collection(self._database_name, self._payload_codec.blob_collection_name)
+        return _with_read_concern(collection, self._read_concern)
 
-        return await self._client_pool.get_collection(self._database_name, self._collection_name)
+    def with_session(
+        self, session: AsyncClientSession, read_concern: Optional[ReadConcern] = None
+    ) -> MongoBasedCollection[T_model]:
+        """Create a new collection with the same configuration but a new session.
 
-    def with_session(self, session: AsyncClientSession) -> MongoBasedCollection[T_model]:
-        """Create a new collection with the same configuration but a new session."""
+        The read concern applies to the operations outside of a transaction.
+        """
         collection = MongoBasedCollection(
             client_pool=self._client_pool,
             database_name=self._database_name,
@@ -353,9 +547,11 @@ class MongoBasedCollection(Collection[T_model]):
             primary_keys=self._primary_keys,
             item_type=self._item_type,
             extra_indexes=self._extra_indexes,
+            ordered_writes=self._ordered_writes,
+            payload_codec=self._payload_codec,
         )
-        collection._collection_created = self._collection_created
         collection._session = session
+        collection._read_concern = read_concern
         return collection
 
     def primary_keys(self) -> Sequence[str]:
@@ -369,16 +565,6 @@ class MongoBasedCollection(Collection[T_model]):
         collection = await self.ensure_collection()
         return await collection.count_documents({"partition_id": self._partition_id}, session=self._session)
 
-    def _pk_filter(self, item: T_model) -> Dict[str, Any]:
-        """Build a Mongo filter for the primary key(s) of a model instance."""
-        data = item.model_dump()
-        missing = [pk for pk in self._primary_keys if pk not in data]
-        if missing:
-            raise ValueError(f"Missing primary key fields {missing} on item {item!r}")
-        pk_filter: Dict[str, Any] = {"partition_id": self._partition_id}
-        pk_filter.update({pk: data[pk] for pk in self._primary_keys})
-        return pk_filter
-
     def _ensure_item_type(self, item: T_model) -> None:
         if not isinstance(item, self._item_type):
             raise TypeError(f"Expected item of type {self._item_type.__name__}, got {type(item).__name__}")
@@ -406,135 +592,388 @@ class MongoBasedCollection(Collection[T_model]):
 
         return combined
 
+    def _resolve_sort(self, sort: Optional[SortOptions]) -> Optional[List[Tuple[str, int]]]:
+        """The Mongo sort specification of the sort options."""
+        sort_name, sort_order = resolve_sort_options(sort)
+        if sort_name is None:
+            return None
+        model_fields = getattr(self._item_type, "model_fields", {})
+        if sort_name not in model_fields:
+            raise ValueError(
+                f"Failed to sort items by '{sort_name}': field does not exist on {self._item_type.__name__}"
+            )
+        direction = 1 if sort_order == "asc" else -1
+        return [(sort_name, direction)]
+
+    async def _seek(
+        self,
+        collection: AsyncCollection[Mapping[str, Any]],
+        mongo_filter: Dict[str, Any],
+        sort_spec: List[Tuple[str, int]],
+        offset: int,
+    ) -> Optional[Dict[str, Any]]:
+        """Turn a large offset into a range condition starting right after the `offset - 1`-th match.
+
+        Only the sort keys of the skipped documents are read, instead of the whole documents.
+        Returns None if the range cannot be expressed (null sort values at the boundary), and an impossible
+        condition if there are not enough matches.
+        """
+        boundary = await collection.find_one(
+            mongo_filter,
+            projection={name: 1 for name, _ in sort_spec},
+            sort=sort_spec,
+            skip=offset - 1,
+            session=self._session,
+        )
+        if boundary is None:
+            return {"_id": {"$exists": False}}
+        values = [boundary.get(name) for name, _ in sort_spec]
+        if any(value is None for value in values):
+            # `$gt`/`$lt` do not order null against the other types.
+            return None
+        keys = [name for name, _ in sort_spec]
+        directions = [direction for _, direction in sort_spec]
+        return _build_keyset_filter(keys, values, directions)
+
     async def query(
         self,
         filter: Optional[FilterOptions] = None,
         sort: Optional[SortOptions] = None,
         limit: int = -1,
         offset: int = 0,
+        projection: Optional[Projection] = None,
     ) -> PaginatedResult[T_model]:
         """Mongo-based implementation of Collection.query.
 
         The handling of null-values in sorting is different from memory-based implementation.
         In MongoDB, null values are treated as less than non-null values.
-        """
-        await self.ensure_collection()
 
+        A projection is pushed down to the server, so the fields that are not loaded are never transferred.
+
+        `total` is derived from the page when the page is the last one, so `count_documents` only runs
+        when there are (or might be) more matches than returned. Sorted pages at a large offset
+        are located with a range condition instead of `skip()` over whole documents.
+        """
         combined = self._inject_partition_filter(filter)
         mongo_filter = _build_mongo_filter(cast(FilterOptions, combined))
+        sort_spec = self._resolve_sort(sort)
 
         collection = await self.ensure_collection()
-        total = await collection.count_documents(mongo_filter, session=self._session)
 
         if limit == 0:
+            total = await collection.count_documents(mongo_filter, session=self._session)
             return PaginatedResult[T_model](items=[], limit=0, offset=offset, total=total)
 
-        cursor = collection.find(mongo_filter, session=self._session)
+        if sort_spec is not None:
+            # `_id` breaks the ties, so that consecutive pages neither repeat nor skip documents with equal
+            # sort values, and the boundary document of a range page is well defined.
+            sort_spec = sort_spec + [("_id", sort_spec[0][1])]
+
+        page_filter = mongo_filter
+        skip = offset
+        if sort_spec is not None and offset >= RANGE_PAGINATION_MIN_OFFSET:
+            range_filter = await self._seek(collection, mongo_filter, sort_spec, offset)
+            if range_filter is not None:
+                page_filter = {"$and": [mongo_filter, range_filter]}
+                skip = 0
+
+        mongo_projection = (
+            _build_mongo_projection(projection, list(self._item_type.model_fields), self._primary_keys)
+            if projection is not None
+            else None
+        )
+        cursor = collection.find(page_filter, projection=mongo_projection, session=self._session)
+        if sort_spec is not None:
+            cursor = cursor.sort(sort_spec)
+        if skip > 0:
+            cursor = cursor.skip(skip)
+        if limit > 0:
+            cursor = cursor.limit(limit)
 
-        sort_name, sort_order = resolve_sort_options(sort)
-        if sort_name is not None:
-            model_fields = getattr(self._item_type, "model_fields", {})
-            if sort_name not in model_fields:
-                raise ValueError(
-                    f"Failed to sort items by '{sort_name}': field does not exist on {self._item_type.__name__}"
-                )
-            direction = 1 if sort_order == "asc" else -1
-            cursor = cursor.sort(sort_name, direction)
+        items = await self._from_documents([raw async for raw in cursor], projection)
+
+        if (limit < 0 or len(items) < limit) and (items or offset == 0):
+            # The page reaches the end of the matches.
+            total = offset + len(items)
+        else:
+            total = await collection.count_documents(mongo_filter, session=self._session)
 
-        if offset > 0:
-            cursor = cursor.skip(offset)
-        if limit >= 0:
+        return PaginatedResult[T_model](items=items, limit=limit, offset=offset, total=total)
+
+    async def query_after(
+        self,
+        keys: Sequence[str],
+        filter: Optional[FilterOptions] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: int = -1,
+    ) -> List[T_model]:
+        """Mongo-based implementation of Collection.query_after.
+
+        The cursor becomes a range condition on the keys, so a page is one index range scan
+        (given an index on the keys) instead of a `skip()` over all the previous pages.
+        """
+        if not keys:
+            raise ValueError("keys must be non-empty")
+        if after is not None and len(after) > len(keys):
+            raise ValueError(f"Cursor {after!r} has more values than the keys {list(keys)!r}")
+        model_fields = getattr(self._item_type, "model_fields", {})
+        for key in keys:
+            if key not in model_fields:
+                raise ValueError(f"Failed to sort items by '{key}': field does not exist on {self._item_type.__name__}")
+        if limit == 0:
+            return []
+
+        combined = self._inject_partition_filter(filter)
+        mongo_filter = _build_mongo_filter(cast(FilterOptions, combined))
+        if after:
+            mongo_filter = {"$and": [mongo_filter, _build_keyset_filter(keys, after)]}
+
+        collection = await self.ensure_collection()
+        cursor = collection.find(mongo_filter, session=self._session).sort([(key, 1) for key in keys])
+        if limit > 0:
             cursor = cursor.limit(limit)
 
+        return await self._from_documents([raw async for raw in cursor])
+
+    async def get(
+        self,
+        filter: Optional[FilterOptions] = None,
+        sort: Optional[SortOptions] = None,
+    ) -> Optional[T_model]:
+        combined = self._inject_partition_filter(filter)
+        mongo_filter = _build_mongo_filter(cast(FilterOptions, combined))
+        sort_spec = self._resolve_sort(sort)
+
+        collection = await self.ensure_collection()
+        raw = await collection.find_one(mongo_filter, sort=sort_spec, session=self._session)
+        if raw is None:
+            return None
+        return (await self._from_documents([raw]))[0]
+
+    async def _from_documents(
+        self, raws: Sequence[Mapping[str, Any]], projection: Optional[Projection] = None
+    ) -> List[T_model]:
+        """Convert Mongo documents to Pydantic models, restoring their encoded payloads with one blob lookup.
+
+        Documents loaded with a projection get the projection defaults for the fields that were not loaded.
+        """
+        if self._payload_codec is not None:
+            digests: Set[str] = set()
+            for raw in raws:
+                digests.update(self._payload_codec.blob_digests(raw))
+            blobs: Dict[str, Mapping[str, Any]] = {}
+            if digests:
+                blob_collection = _with_read_concern(
+                    await self._client_pool.get_collection(
+                        self._database_name, self._payload_codec.blob_collection_name
+                    ),
+                    self._read_concern,
+                )
+                async for blob in blob_collection.find({"_id": {"$in": list(digests)}}, session=self._session):
+                    blobs[blob["_id"]] = blob
+            raws = [self._payload_codec.decode(raw, blobs) for raw in raws]
+
         items: List[T_model] = []
-        item_type_has_id = "_id" in self._item_type.model_fields
-        async for raw in cursor:
+        model_fields = list(self._item_type.model_fields)
+        item_type_has_id = "_id" in model_fields
+        for raw in raws:
             # Remove _id from the raw document if the item type does not have it.
             if not item_type_has_id:
-                raw.pop("_id", None)  # type: ignore
+                raw = {key: value for key, value in raw.items() if key != "_id"}
+            if projection is not None:
+                raw = project_document(raw, projection, model_fields, self._primary_keys)
             # Convert Mongo document to Pydantic model
-            items.append(self._item_type.model_validate(raw))  # type: ignore[arg-type]
+            items.append(self._item_type.model_validate(raw))
+        return items
 
-        return PaginatedResult[T_model](items=items, limit=limit, offset=offset, total=total)
+    def _to_document(self, item: T_model) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Dump an item once into its primary-key filter and its document."""
+        self._ensure_item_type(item)
+        doc = item.model_dump()
+        missing = [pk for pk in self._primary_keys if pk not in doc]
+        if missing:
+            raise ValueError(f"Missing primary key fields {missing} on item {item!r}")
+        pk_filter: Dict[str, Any] = {"partition_id": self._partition_id}
+        pk_filter.update({pk: doc[pk] for pk in self._primary_keys})
+        doc["partition_id"] = self._partition_id
+        return pk_filter, doc
 
-    async def get(
+    async def _to_documents(
+        self, items: Sequence[T_model]
+    ) -> Tuple[Sequence[Dict[str, Any]], Sequence[Dict[str, Any]]]:
+        """Dump the items into their primary-key filters and (encoded) documents.
+
+        The blobs offloaded by the payload codec are written first, so that a stored document never
+        references a missing blob.
+        """
+        pk_filters, docs = zip(*(self._to_document(item) for item in items))
+        if self._payload_codec is None:
+            return pk_filters, docs
+
+        encoded_docs: List[Dict[str, Any]] = []
+        blobs: Dict[str, Dict[str, Any]] = {}
+        for doc in docs:
+            encoded_doc, doc_blobs = self._payload_codec.encode(doc)
+            encoded_docs.append(encoded_doc)
+            blobs.update(doc_blobs)
+        if blobs:
+            blob_collection = await self._client_pool.get_collection(
+                self._database_name, self._payload_codec.blob_collection_name
+            )
+            # Content-addressed: an existing blob already holds the same value.
+            await blob_collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": digest},
+                        {"$setOnInsert": {key: value for key, value in blob.items() if key != "_id"}},
+                        upsert=True,
+                    )
+                    for digest, blob in blobs.items()
+                ],
+                ordered=False,
+                session=self._session,
+            )
+        return pk_filters, encoded_docs
+
+    async def _missing_primary_keys(
+        self, collection: AsyncCollection[Mapping[str, Any]], pk_filters: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """The primary-key filters matching no document, found with one round trip."""
+        projection = {pk: 1 for pk in self._primary_keys}
+        found: Set[Tuple[Any, ...]] = set()
+        async for raw in collection.find({"$or": list(pk_filters)}, projection=projection, session=self._session):
+            found.add(tuple(raw.get(pk) for pk in self._primary_keys))
+        return [pk_filter for pk_filter in pk_filters if tuple(pk_filter[pk] for pk in self._primary_keys) not in found]
+
+    def _write_error(self, exc: BulkWriteError, pk_filters: Sequence[Dict[str, Any]]) -> Exception:
+        """Map the first error of a bulk write back to the item that caused it."""
+        write_errors = exc.details.get("writeErrors") or []
+        if not write_errors:
+            return exc
+        error = write_errors[0]
+        pk_filter = pk_filters[error["index"]]
+        if error.get("code") == 11000:
+            return ValueError(f"Item with primary key(s) {pk_filter} already exists")
+        return ValueError(f"Failed to write item with primary key(s) {pk_filter}: {error.get('errmsg')}")
+
+    async def _bulk_write(
         self,
-        filter: Optional[FilterOptions] = None,
-        sort: Optional[SortOptions] = None,
-    ) -> Optional[T_model]:
-        result = await self.query(filter=filter, sort=sort, limit=1, offset=0)
-        return result.items[0] if result.items else None
+        collection: AsyncCollection[Mapping[str, Any]],
+        operations: Sequence[Union[InsertOne[Any], ReplaceOne[Any], DeleteOne]],
+        pk_filters: Sequence[Dict[str, Any]],
+    ) -> BulkWriteResult:
+        try:
+            return await collection.bulk_write(list(operations), ordered=self._ordered_writes, session=self._session)
+        except BulkWriteError as exc:
+            raise self._write_error(exc, pk_filters) from exc
 
     async def insert(self, items: Sequence[T_model]) -> None:
+        """Insert the items with one bulk write. Duplicates are detected by the unique primary-key index.
+
+        Raises:
+            ValueError: If an item with the same primary key already exists. Items before it
+                (or all the other items, with unordered writes) may have been inserted.
+        """
         if not items:
             return
 
         collection = await self.ensure_collection()
-        docs: List[Mapping[str, Any]] = []
-        for item in items:
-            self._ensure_item_type(item)
-            # Pre-check for existence to provide a clearer ValueError
-            pk_filter = self._pk_filter(item)
-            existing = await collection.find_one(pk_filter, session=self._session)
-            if existing is not None:
-                raise ValueError(f"Item with primary key(s) {pk_filter} already exists")
-
-            doc = item.model_dump()
-            doc["partition_id"] = self._partition_id
-            docs.append(doc)
-
-        if not docs:
-            return
-
+        pk_filters, docs = await self._to_documents(items)
         try:
-            await collection.insert_many(docs, session=self._session)
+            await self._bulk_write(collection, [InsertOne(doc) for doc in docs], pk_filters)
         except DuplicateKeyError as exc:
             # In case the DB enforces uniqueness via index, normalize to ValueError
             raise ValueError("Duplicate key error while inserting items") from exc
 
+    async def insert_new(self, items: Sequence[T_model]) -> List[T_model]:
+        """Insert the items whose primary key is not taken yet, with one unordered bulk write.
+
+        Unlike [`insert`][agentlightning.store.collection.mongo.MongoBasedCollection.insert], an existing item
+        is skipped rather than an error, so that retrying the same insert is idempotent.
+        No transaction is needed: the unique primary-key index guards against duplicates.
+
+        Returns:
+            The items that were inserted.
+        """
+        if not items:
+            return []
+
+        collection = await self.ensure_collection()
+        pk_filters, docs = await self._to_documents(items)
+        try:
+            await collection.bulk_write([InsertOne(doc) for doc in docs], ordered=False, session=self._session)
+        except BulkWriteError as exc:
+            write_errors = exc.details.get("writeErrors") or []
+            failures = [error for error in write_errors if error.get("code") != 11000]
+            if failures:
+                error = failures[0]
+                raise ValueError(
+                    f"Failed to write item with primary key(s) {pk_filters[error['index']]}: {error.get('errmsg')}"
+                ) from exc
+            if not write_errors:
+                raise
+            duplicates = {error["index"] for error in write_errors}
+            return [item for index, item in enumerate(items) if index not in duplicates]
+        return list(items)
+
     async def update(self, items: Sequence[T_model]) -> None:
+        """Replace the items with one bulk write.
+
+        Raises:
+            ValueError: If an item with the given primary keys does not exist.
+                The existing items are still updated.
+        """
         if not items:
             return
 
         collection = await self.ensure_collection()
-        for item in items:
-            self._ensure_item_type(item)
-            pk_filter = self._pk_filter(item)
-            doc = item.model_dump()
-            doc["partition_id"] = self._partition_id
-            result = await collection.replace_one(pk_filter, doc, session=self._session)
-            if result.matched_count == 0:
-                raise ValueError(f"Item with primary key(s) {pk_filter} does not exist")
+        pk_filters, docs = await self._to_documents(items)
+        result = await self._bulk_write(
+            collection, [ReplaceOne(pk_filter, doc) for pk_filter, doc in zip(pk_filters, docs)], pk_filters
+        )
+        if result.matched_count < len(items):
+            missing = await self._missing_primary_keys(collection, pk_filters)
+            raise ValueError(f"Item with primary key(s) {missing[0] if missing else pk_filters} does not exist")
 
     async def upsert(self, items: Sequence[T_model]) -> None:
+        """Insert or replace the items with one bulk write."""
         if not items:
             return
 
         collection = await self.ensure_collection()
-        for item in items:
-            self._ensure_item_type(item)
-            pk_filter = self._pk_filter(item)
-            doc = item.model_dump()
-            doc["partition_id"] = self._partition_id
-            await collection.replace_one(pk_filter, doc, upsert=True, session=self._session)
+        pk_filters, docs = await self._to_documents(items)
+        await self._bulk_write(
+            collection,
+            [ReplaceOne(pk_filter, doc, upsert=True) for pk_filter, doc in zip(pk_filters, docs)],
+            pk_filters,
+        )
 
     async def delete(self, items: Sequence[T_model]) -> None:
+        """Delete the items with one bulk write, after checking that they all exist with one query.
+
+        Raises:
+            ValueError: If an item with the given primary keys does not exist. Nothing is deleted then.
+        """
         if not items:
             return
 
         collection = await self.ensure_collection()
-        for item in items:
-            self._ensure_item_type(item)
-            pk_filter = self._pk_filter(item)
-            result = await collection.delete_one(pk_filter, session=self._session)
-            if result.deleted_count == 0:
-                raise ValueError(f"Item with primary key(s) {pk_filter} does not exist")
+        pk_filters = [self._to_document(item)[0] for item in items]
+        missing = await self._missing_primary_keys(collection, pk_filters)
+        if missing:
+            raise ValueError(f"Item with primary key(s) {missing[0]} does not exist")
+        result = await self._bulk_write(collection, [DeleteOne(pk_filter) for pk_filter in pk_filters], pk_filters)
+        if result.deleted_count < len(items):
+            raise ValueError(f"{len(items) - result.deleted_count} of the items to delete no longer exist")
 
 
 class MongoBasedQueue(Queue[T_generic], Generic[T_generic]):
     """Mongo-based implementation of Queue backed by a MongoDB collection.
 
-    Items are stored append-only; dequeue marks items as consumed instead of deleting them.
+    Dequeue marks items as consumed instead of deleting them, so that a dequeue inside an aborted
+    transaction leaves the queue untouched. The consumed items are deleted later by a TTL index
+    (see `consumed_ttl`) or by [`compact`][agentlightning.store.collection.mongo.MongoBasedQueue.compact].
+    The pending items are indexed by a partial index, which stays small however long the history grows.
     """
 
     def __init__(
@@ -544,6 +983,7 @@ class MongoBasedQueue(Queue[T_generic], Generic[T_generic]):
         collection_name: str,
         partition_id: str,
         item_type: Type[T_generic],
+        consumed_ttl: Optional[int] = DEFAULT_QUEUE_CONSUMED_TTL,
     ) -> None:
         """
         Args:
@@ -552,6 +992,9 @@ class MongoBasedQueue(Queue[T_generic], Generic[T_generic]):
             collection_name: The name of the collection backing the queue.
             partition_id: Partition identifier; allows multiple logical queues in one collection.
             item_type: The Python type of queue items (primitive or BaseModel subclass).
+            consumed_ttl: Seconds after which the server deletes a consumed item (with a TTL index, whose
+                expiry is fixed when the index is first created). Set to None to keep the consumed items
+                until [`compact`][agentlightning.store.collection.mongo.MongoBasedQueue.compact] is called.
         """
         if isinstance(client_pool, AsyncMongoClient):
             self._client_pool = MongoClientPool(client_pool)
@@ -562,9 +1005,10 @@ class MongoBasedQueue(Queue[T_generic], Generic[T_generic]):
         self._partition_id = partition_id
         self._item_type = item_type
         self._adapter: TypeAdapter[T_generic] = TypeAdapter(item_type)
-        self._collection_created = False
+        self._consumed_ttl = consumed_ttl
 
         self._session: Optional[AsyncClientSession] = None
+        self._read_concern: Optional[ReadConcern] = None
 
     def item_type(self) -> Type[T_generic]:
         return self._item_type
@@ -574,23 +1018,40 @@ class MongoBasedQueue(Queue[T_generic], Generic[T_generic]):
 
         If it already exists, it returns the existing collection.
         """
-        if not self._collection_created:
-            client = await self._client_pool.get_client()
-            self._collection_created = await _ensure_collection(
-                client[self._database_name], self._collection_name, primary_keys=["consumed", "_id"]
+        index_models = [
+            IndexModel(
+                [("partition_id", 1), ("_id", 1)],
+                name="idx_pending_partition_id__id",
+                partialFilterExpression={"consumed": False},
+            )
+        ]
+        if self._consumed_ttl is not None:
+            index_models.append(
+                IndexModel(
+                    [("consumed_at", 1)],
+                    name="ttl_consumed_at",
+                    expireAfterSeconds=self._consumed_ttl,
+                    partialFilterExpression={"consumed": True},
+                )
             )
-        return await self._client_pool.get_collection(self._database_name, self._collection_name)
+        collection = await self._client_pool.ensure_collection(
+            self._database_name, self._collection_name, primary_keys=["consumed", "_id"], index_models=index_models
+        )
+        return _with_read_concern(collection, self._read_concern)
 
-    def with_session(self, session: AsyncClientSession) -> MongoBasedQueue[T_generic]:
+    def with_session(
+        self, session: AsyncClientSession, read_concern: Optional[ReadConcern] = None
+    ) -> MongoBasedQueue[T_generic]:
         queue = MongoBasedQueue(
             client_pool=self._client_pool,
             database_name=self._database_name,
             collection_name=self._collection_name,
             partition_id=self._partition_id,
             item_type=self._item_type,
+            consumed_ttl=self._consumed_ttl,
         )
-        queue._collection_created = self._collection_created
         queue._session = session
+        queue._read_concern = read_concern
         return queue
 
     async def has(self, item: T_generic) -> bool:
@@ -620,7 +1081,7 @@ class MongoBasedQueue(Queue[T_generic], Generic[T_generic]):
                     "partition_id": self._partition_id,
                     "value": self._adapter.dump_python(item, mode="python"),
                     "consumed": False,
-                    "created_at": datetime.now(),
+                    "created_at": datetime.now(timezone.utc),
                 }
             )
 
@@ -628,33 +1089,70 @@ class MongoBasedQueue(Queue[T_generic], Generic[T_generic]):
         return list(items)
 
     async def dequeue(self, limit: int = 1) -> Sequence[T_generic]:
+        """Claim up to `limit` of the oldest pending items.
+
+        A single item is claimed with one `find_one_and_update`. A batch is claimed with three round trips
+        whatever its size: the ids of the oldest pending items are read, the ones still pending are marked
+        consumed with a fresh claim token in one `update_many`, and the claimed items are fetched by token.
+        Concurrent consumers never claim the same item, because the update only matches pending items.
+        """
         if limit <= 0:
             return []
 
         collection = await self.ensure_collection()
-        results: list[T_generic] = []
+        pending_filter = {"partition_id": self._partition_id, "consumed": False}
 
-        # Atomic claim loop using find_one_and_update
-        for _ in range(limit):
+        if limit == 1:
             doc = await collection.find_one_and_update(
-                {
-                    "partition_id": self._partition_id,
-                    "consumed": False,
-                },
-                {"$set": {"consumed": True}},
+                pending_filter,
+                {"$set": {"consumed": True, "consumed_at": datetime.now(timezone.utc)}},
                 sort=[("_id", 1)],  # FIFO using insertion order
-                return_document=True,
+                return_document=ReturnDocument.AFTER,
                 session=self._session,
             )
             if doc is None:  # type: ignore
-                # No more items to dequeue
-                break
+                return []
+            return [self._adapter.validate_python(doc["value"])]
 
-            raw_value = doc["value"]
-            item = self._adapter.validate_python(raw_value)
-            results.append(item)
+        candidate_ids = [
+            doc["_id"]
+            async for doc in collection.find(pending_filter, projection={"_id": 1}, session=self._session)
+            .sort("_id", 1)
+            .limit(limit)
+        ]
+        if not candidate_ids:
+            return []
 
-        return results
+        claim_token = uuid.uuid4().hex
+        result = await collection.update_many(
+            {**pending_filter, "_id": {"$in": candidate_ids}},
+            {"$set": {"consumed": True, "consumed_at": datetime.now(timezone.utc), "claim_token": claim_token}},
+            session=self._session,
+        )
+        if result.modified_count == 0:
+            return []
+
+        items: list[T_generic] = []
+        async for doc in collection.find(
+            {"partition_id": self._partition_id, "_id": {"$in": candidate_ids}, "claim_token": claim_token},
+            projection={"value": 1},
+            session=self._session,
+        ).sort("_id", 1):
+            items.append(self._adapter.validate_python(doc["value"]))
+        return items
+
+    async def compact(self, older_than: float = 0.0) -> int:
+        """Delete the consumed items of this partition, consumed at least `older_than` seconds ago.
+
+        Returns:
+            The number of deleted items.
+        """
+        collection = await self.ensure_collection()
+        compact_filter: Dict[str, Any] = {"partition_id": self._partition_id, "consumed": True}
+        if older_than > 0:
+            compact_filter["consumed_at"] = {"$lt": datetime.now(timezone.utc) - timedelta(seconds=older_than)}
+        result = await collection.delete_many(compact_filter, session=self._session)
+        return result.deleted_count
 
     async def peek(self, limit: int = 1) -> Sequence[T_generic]:
         if limit <= 0:
@@ -723,20 +1221,20 @@ class MongoBasedKeyValue(KeyValue[K, V], Generic[K, V]):
         self._value_type = value_type
         self._key_adapter: TypeAdapter[K] = TypeAdapter(key_type)
         self._value_adapter: TypeAdapter[V] = TypeAdapter(value_type)
-        self._collection_created = False
 
         self._session: Optional[AsyncClientSession] = None
+        self._read_concern: Optional[ReadConcern] = None
 
     async def ensure_collection(self, *, create_indexes: bool = True) -> AsyncCollection[Mapping[str, Any]]:
         """Ensure the backing collection exists (and optionally its indexes)."""
-        if not self._collection_created:
-            client = await self._client_pool.get_client()
-            self._collection_created = await _ensure_collection(
-                client[self._database_name], self._collection_name, primary_keys=["key"]
-            )
-        return await self._client_pool.get_collection(self._database_name, self._collection_name)
+        collection = await self._client_pool.ensure_collection(
+            self._database_name, self._collection_name, primary_keys=["key"]
+        )
+        return _with_read_concern(collection, self._read_concern)
 
-    def with_session(self, session: AsyncClientSession) -> MongoBasedKeyValue[K, V]:
+    def with_session(
+        self, session: AsyncClientSession, read_concern: Optional[ReadConcern] = None
+    ) -> MongoBasedKeyValue[K, V]:
         key_value = MongoBasedKeyValue(
             client_pool=self._client_pool,
             database_name=self._database_name,
@@ -745,8 +1243,8 @@ class MongoBasedKeyValue(KeyValue[K, V], Generic[K, V]):
             key_type=self._key_type,
             value_type=self._value_type,
         )
-        key_value._collection_created = self._collection_created
         key_value._session = session
+        key_value._read_concern = read_concern
 
         return key_value
 
@@ -800,6 +1298,38 @@ class MongoBasedKeyValue(KeyValue[K, V], Generic[K, V]):
             # Very unlikely with replace_one+upsert, but normalize anyway.
             raise ValueError("Duplicate key error while setting key-value item") from exc
 
+    async def set_max(self, key: K, value: V) -> None:
+        """Set the value of the key to `value` unless it is already greater, with one atomic upsert."""
+        collection = await self.ensure_collection()
+        encoded_key = self._key_adapter.dump_python(key, mode="python")
+        encoded_value = self._value_adapter.dump_python(value, mode="python")
+        await collection.update_one(
+            {
+                "partition_id": self._partition_id,
+                "key": encoded_key,
+            },
+            {"$max": {"value": encoded_value}},
+            upsert=True,
+            session=self._session,
+        )
+
+    async def increment(self, key: K, amount: V) -> V:
+        """Atomically add `amount` to the (numeric) value of the key, starting from zero, and return the new value."""
+        collection = await self.ensure_collection()
+        encoded_key = self._key_adapter.dump_python(key, mode="python")
+        encoded_amount = self._value_adapter.dump_python(amount, mode="python")
+        doc = await collection.find_one_and_update(
+            {
+                "partition_id": self._partition_id,
+                "key": encoded_key,
+            },
+            {"$inc": {"value": encoded_amount}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            session=self._session,
+        )
+        return self._value_adapter.validate_python(doc["value"])
+
     async def pop(self, key: K, default: V | None = None) -> V | None:
         collection = await self.ensure_collection()
         encoded_key = self._key_adapter.dump_python(key, mode="python")
@@ -826,10 +1356,51 @@ class MongoBasedKeyValue(KeyValue[K, V], Generic[K, V]):
         )
 
 
+MongoReadConcernLevel = Literal["local", "available", "majority", "snapshot"]
+
+
+class MongoQueryPlan(TypedDict):
+    """How MongoDB executes one of the canonical queries of the store, from `explain()`."""
+
+    collection: str
+    """Name of the queried collection."""
+    query: str
+    """Description of the query."""
+    stages: List[str]
+    """Stages of the winning plan, from the root."""
+    indexes: List[str]
+    """Indexes used by the winning plan."""
+    collection_scan: bool
+    """Whether the winning plan scans the whole collection."""
+    blocking_sort: bool
+    """Whether the winning plan sorts the matches in memory instead of reading them in index order."""
+
+
+def _walk_plan(plan: Any, stages: List[str], indexes: List[str]) -> None:
+    """Collect the stages and index names of a (possibly nested or sharded) query plan."""
+    if isinstance(plan, Mapping):
+        stage = plan.get("stage")  # type: ignore
+        if isinstance(stage, str):
+            stages.append(stage)
+        index_name = plan.get("indexName")  # type: ignore
+        if isinstance(index_name, str) and index_name not in indexes:
+            indexes.append(index_name)
+        for value in plan.values():  # type: ignore
+            _walk_plan(value, stages, indexes)
+    elif isinstance(plan, list):
+        for value in plan:  # type: ignore
+            _walk_plan(value, stages, indexes)
+
+
 class MongoLightningCollections(LightningCollections):
     """Mongo implementation of LightningCollections using MongoDB collections.
 
     Serves as the storage base for [`MongoLightningStore`][agentlightning.store.MongoLightningStore].
+
+    Args:
+        read_concern: Read concern of the [`read()`][agentlightning.store.collection.mongo.MongoLightningCollections.read]
+            blocks, which run without a transaction. `"snapshot"` reads every collection from one snapshot
+            (a replica set or sharded cluster is required); the other levels read each query independently.
     """
 
     def __init__(
@@ -844,7 +1415,13 @@ class MongoLightningCollections(LightningCollections):
         workers: Optional[MongoBasedCollection[Worker]] = None,
         rollout_queue: Optional[MongoBasedQueue[str]] = None,
         span_sequence_ids: Optional[MongoBasedKeyValue[str, int]] = None,
+        latest_attempt_ids: Optional[MongoBasedKeyValue[str, str]] = None,
+        read_concern: MongoReadConcernLevel = "local",
+        span_payload_codec: Optional[MongoPayloadCodec] = None,
     ):
+        if read_concern not in ("local", "available", "majority", "snapshot"):
+            raise ValueError(f"Unsupported read concern: {read_concern!r}")
+        self._read_concern: MongoReadConcernLevel = read_concern
         self._client_pool = client_pool
         self._database_name = database_name
         self._partition_id = partition_id
@@ -858,7 +1435,7 @@ class MongoLightningCollections(LightningCollections):
                 self._partition_id,
                 ["rollout_id"],
                 Rollout,
-                [["status"]],
+                [["partition_id", "status"]],
             )
         )
         self._attempts = (
@@ -871,7 +1448,7 @@ class MongoLightningCollections(LightningCollections):
                 self._partition_id,
                 ["rollout_id", "attempt_id"],
                 Attempt,
-                [["status"], ["sequence_id"]],
+                [["partition_id", "rollout_id", "-sequence_id"], ["partition_id", "status"]],
             )
         )
         self._spans = (
@@ -884,7 +1461,11 @@ class MongoLightningCollections(LightningCollections):
                 self._partition_id,
                 ["rollout_id", "attempt_id", "span_id"],
                 Span,
-                [["sequence_id"]],
+                [
+                    ["partition_id", "rollout_id", "attempt_id", "sequence_id", "span_id"],
+                    ["partition_id", "rollout_id", "sequence_id", "span_id"],
+                ],
+                payload_codec=span_payload_codec,
             )
         )
         self._resources = (
@@ -897,14 +1478,20 @@ class MongoLightningCollections(LightningCollections):
                 self._partition_id,
                 ["resources_id"],
                 ResourcesUpdate,
-                ["update_time"],
+                [["partition_id", "update_time"]],
             )
         )
         self._workers = (
             workers
             if workers is not None
             else MongoBasedCollection(
-                self._client_pool, self._database_name, "workers", self._partition_id, ["worker_id"], Worker, ["status"]
+                self._client_pool,
+                self._database_name,
+                "workers",
+                self._partition_id,
+                ["worker_id"],
+                Worker,
+                [["partition_id", "status"]],
             )
         )
         self._rollout_queue = (
@@ -919,19 +1506,28 @@ class MongoLightningCollections(LightningCollections):
                 self._client_pool, self._database_name, "span_sequence_ids", self._partition_id, str, int
             )
         )
+        self._latest_attempt_ids = (
+            latest_attempt_ids
+            if latest_attempt_ids is not None
+            else MongoBasedKeyValue(
+                self._client_pool, self._database_name, "latest_attempt_ids", self._partition_id, str, str
+            )
+        )
 
-    def with_session(self, session: AsyncClientSession) -> Self:
+    def with_session(self, session: AsyncClientSession, read_concern: Optional[ReadConcern] = None) -> Self:
         return self.__class__(
             client_pool=self._client_pool,
             database_name=self._database_name,
             partition_id=self._partition_id,
-            rollouts=self._rollouts.with_session(session),
-            attempts=self._attempts.with_session(session),
-            spans=self._spans.with_session(session),
-            resources=self._resources.with_session(session),
-            workers=self._workers.with_session(session),
-            rollout_queue=self._rollout_queue.with_session(session),
-            span_sequence_ids=self._span_sequence_ids.with_session(session),
+            rollouts=self._rollouts.with_session(session, read_concern),
+            attempts=self._attempts.with_session(session, read_concern),
+            spans=self._spans.with_session(session, read_concern),
+            resources=self._resources.with_session(session, read_concern),
+            workers=self._workers.with_session(session, read_concern),
+            rollout_queue=self._rollout_queue.with_session(session, read_concern),
+            span_sequence_ids=self._span_sequence_ids.with_session(session, read_concern),
+            latest_attempt_ids=self._latest_attempt_ids.with_session(session, read_concern),
+            read_concern=self._read_concern,
         )
 
     @property
@@ -962,6 +1558,10 @@ class MongoLightningCollections(LightningCollections):
     def span_sequence_ids(self) -> MongoBasedKeyValue[str, int]:
         return self._span_sequence_ids
 
+    @property
+    def latest_attempt_ids(self) -> MongoBasedKeyValue[str, str]:
+        return self._latest_attempt_ids
+
     async def _ensure_collections(self) -> None:
         """Ensure all collections exist."""
         await self._rollouts.ensure_collection()
@@ -971,6 +1571,106 @@ class MongoLightningCollections(LightningCollections):
         await self._workers.ensure_collection()
         await self._rollout_queue.ensure_collection()
         await self._span_sequence_ids.ensure_collection()
+        await self._latest_attempt_ids.ensure_collection()
+
+    async def explain_queries(self) -> List[MongoQueryPlan]:
+        """Run `explain()` on the canonical queries of the store, to check that they are served by indexes.
+
+        The queries mirror the lookups, filters and sorts issued by
+        [`CollectionBasedLightningStore`][agentlightning.store.CollectionBasedLightningStore];
+        the plans do not depend on whether the looked-up documents exist.
+        """
+        await self._ensure_collections()
+        rollout_id, attempt_id = "explain-rollout", "explain-attempt"
+        collection_queries: List[
+            Tuple[MongoBasedCollection[Any], str, Optional[FilterOptions], Optional[List[Tuple[str, int]]]]
+        ] = [
+            (self._rollouts, "rollout by id", {"rollout_id": {"exact": rollout_id}}, None),
+            (self._rollouts, "rollouts by status", {"status": {"within": ["preparing", "running"]}}, None),
+            (
+                self._attempts,
+                "attempt by id",
+                {"rollout_id": {"exact": rollout_id}, "attempt_id": {"exact": attempt_id}},
+                None,
+            ),
+            (self._attempts, "attempts of a rollout", {"rollout_id": {"exact": rollout_id}}, [("sequence_id", 1)]),
+            (
+                self._attempts,
+                "latest attempt of a rollout",
+                {"rollout_id": {"exact": rollout_id}},
+                [("sequence_id", -1)],
+            ),
+            (
+                self._spans,
+                "spans of an attempt",
+                {"rollout_id": {"exact": rollout_id}, "attempt_id": {"exact": attempt_id}},
+                [("sequence_id", 1)],
+            ),
+            (
+                self._spans,
+                "duplicate spans check",
+                {
+                    "rollout_id": {"exact": rollout_id},
+                    "attempt_id": {"exact": attempt_id},
+                    "span_id": {"within": ["span-1", "span-2"]},
+                },
+                None,
+            ),
+            (
+                self._spans,
+                "span stream of a rollout",
+                {"rollout_id": {"exact": rollout_id}},
+                [("sequence_id", 1), ("span_id", 1)],
+            ),
+            (self._resources, "latest resources", None, [("update_time", -1)]),
+            (self._workers, "workers by status", {"status": {"within": ["busy"]}}, None),
+        ]
+        raw_queries: List[Tuple[str, str, Dict[str, Any], Optional[List[Tuple[str, int]]]]] = [
+            (
+                self._rollout_queue._collection_name,  # pyright: ignore[reportPrivateUsage]
+                "queue head",
+                {"partition_id": self._partition_id, "consumed": False},
+                [("_id", 1)],
+            ),
+            (
+                self._latest_attempt_ids._collection_name,  # pyright: ignore[reportPrivateUsage]
+                "latest attempt pointer",
+                {"partition_id": self._partition_id, "key": rollout_id},
+                None,
+            ),
+        ]
+        for collection, description, filter, sort_spec in collection_queries:
+            combined = collection._inject_partition_filter(filter)  # pyright: ignore[reportPrivateUsage]
+            raw_queries.append(
+                (
+                    collection._collection_name,  # pyright: ignore[reportPrivateUsage]
+                    description,
+                    _build_mongo_filter(cast(FilterOptions, combined)),
+                    sort_spec,
+                )
+            )
+
+        plans: List[MongoQueryPlan] = []
+        for collection_name, description, mongo_filter, sort_spec in raw_queries:
+            collection = await self._client_pool.get_collection(self._database_name, collection_name)
+            cursor = collection.find(mongo_filter)
+            if sort_spec is not None:
+                cursor = cursor.sort(sort_spec)
+            explanation = await cursor.explain()
+            stages: List[str] = []
+            indexes: List[str] = []
+            _walk_plan(explanation.get("queryPlanner", {}).get("winningPlan", {}), stages, indexes)
+            plans.append(
+                MongoQueryPlan(
+                    collection=collection_name,
+                    query=description,
+                    stages=stages,
+                    indexes=indexes,
+                    collection_scan="COLLSCAN" in stages,
+                    blocking_sort="SORT" in stages,
+                )
+            )
+        return plans
 
     @asynccontextmanager
     async def atomic(self, *args: Any, **kwargs: Any):
@@ -1024,3 +1724,28 @@ class MongoLightningCollections(LightningCollections):
                 )
             except (ConnectionFailure, OperationFailure) as exc:
                 raise RuntimeError("Transaction failed with connection or operation error") from exc
+
+    @asynccontextmanager
+    async def read(self, *args: Any, **kwargs: Any):
+        """Open a session without a transaction for read-only operations.
+
+        The reads neither hold a transaction open nor wait for the write concern, so they do not
+        contend with the writers. The consistency across queries depends on the configured read concern.
+        """
+        await self._ensure_collections()
+        client = await self._client_pool.get_client()
+        if self._read_concern == "snapshot":
+            # Snapshot sessions pin the read concern of all their reads.
+            async with client.start_session(snapshot=True) as session:
+                yield self.with_session(session)
+        else:
+            async with client.start_session(causal_consistency=True) as session:
+                yield self.with_session(session, ReadConcern(self._read_concern))
+
+    async def execute_read(self, callback: Callable[[Self], Awaitable[T_generic]]) -> T_generic:
+        """Execute the given read-only callback within a read session."""
+        try:
+            async with self.read() as collections:
+                return await callback(collections)
+        except ConnectionFailure as exc:
+            raise RuntimeError("Read failed with connection error") from exc
@@ -0,0 +1,166 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Storage codec keeping the oversized field values of MongoDB documents out of line."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional, Set, Tuple, TypedDict
+
+__all__ = ["MongoPayloadCodec", "MongoPayloadRule", "DEFAULT_PAYLOAD_MIN_BYTES"]
+
+DEFAULT_PAYLOAD_MIN_BYTES = 4096
+"""Values smaller than this (JSON-encoded) are stored inline as they are."""
+
+_MARKER = "__agl_payload__"
+"""Key identifying an encoded value in a stored document."""
+
+
+class MongoPayloadRule(TypedDict, total=False):
+    """How the values under a field prefix are stored once they reach `min_bytes`."""
+
+    action: Literal["compress", "offload"]
+    """`"compress"` keeps the compressed value inline; `"offload"` moves it to the blob collection. Defaults to `"compress"`."""
+    min_bytes: int
+    """Size of the JSON-encoded value from which the rule applies. Defaults to `DEFAULT_PAYLOAD_MIN_BYTES`."""
+    compression: Literal["zlib", "zstd"]
+    """Compression of the value (inline or in the blob collection). `"zstd"` needs `zstandard`. Defaults to `"zlib"`."""
+
+
+def _compressors(compression: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if compression == "zlib":
+        return zlib.compress, zlib.decompress
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard is not installed. Please either install it or use zlib compression.")
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Unsupported compression: {compression!r}")
+
+
+class MongoPayloadCodec:
+    """Encodes the large values of documents before they are written to MongoDB, and decodes them after reading.
+
+    Rules are keyed by a field-path prefix: the path of a value is its field names joined by dots,
+    so the span attribute `gen_ai.prompt.0.content` has the path `attributes.gen_ai.prompt.0.content`
+    and matches the prefixes `attributes`, `attributes.gen_ai.prompt`, etc. The longest matching prefix wins.
+    Rules apply to each value that is not a sub-document, so the other attributes stay readable
+    (and projectable) when one of them is encoded.
+
+    An encoded value is replaced in the document by a small marker sub-document, holding either the
+    compressed value or the SHA-256 digest of the value in the blob collection. Blobs are content-addressed,
+    so identical values (e.g., a system prompt repeated in every span) are stored once across all
+    partitions; they are never deleted by the store.
+
+    Prefixes must not cover the fields that the store filters or sorts on.
+
+    Args:
+        rules: The rules, keyed by field-path prefix.
+        blob_collection_name: The name of the collection of the offloaded values.
+    """
+
+    def __init__(self, rules: Mapping[str, MongoPayloadRule], blob_collection_name: str = "span_blobs") -> None:
+        self._rules: List[Tuple[str, Literal["compress", "offload"], int, str]] = []
+        self._compressors: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+            "zlib": _compressors("zlib")
+        }
+        for prefix, rule in rules.items():
+            action = rule.get("action", "compress")
+            if action not in ("compress", "offload"):
+                raise ValueError(f"Unsupported payload action for {prefix!r}: {action!r}")
+            compression = rule.get("compression", "zlib")
+            if compression not in self._compressors:
+                self._compressors[compression] = _compressors(compression)
+            self._rules.append((prefix, action, rule.get("min_bytes", DEFAULT_PAYLOAD_MIN_BYTES), compression))
+        # Longest prefix first, so that the most specific rule wins.
+        self._rules.sort(key=lambda rule: len(rule[0]), reverse=True)
+        self.blob_collection_name = blob_collection_name
+
+    @property
+    def offloads(self) -> bool:
+        """Whether some rule moves values to the blob collection."""
+        return any(action == "offload" for _, action, _, _ in self._rules)
+
+    def _match(self, path: str) -> Optional[Tuple[str, Literal["compress", "offload"], int, str]]:
+        for rule in self._rules:
+            prefix = rule[0]
+            if path == prefix or path.startswith(prefix + "."):
+                return rule
+        return None
+
+    def encode(self, doc: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Encode the matching values of a document.
+
+        Returns:
+            The encoded document (the input is not modified), and the blob documents to store, keyed by digest.
+        """
+        blobs: Dict[str, Dict[str, Any]] = {}
+        return self._encode_mapping(doc, "", blobs), blobs
+
+    def _encode_mapping(
+        self, mapping: Mapping[str, Any], parent: str, blobs: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        encoded: Dict[str, Any] = {}
+        for key, value in mapping.items():
+            path = f"{parent}.{key}" if parent else key
+            if isinstance(value, dict):
+                encoded[key] = self._encode_mapping(value, path, blobs)  # type: ignore
+                continue
+            rule = self._match(path)
+            if rule is not None and value is not None:
+                _, action, min_bytes, compression = rule
+                try:
+                    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+                except (TypeError, ValueError):
+                    # Not JSON-serializable: stored as it is.
+                    raw = b""
+                if raw and len(raw) >= min_bytes:
+                    compressed = self._compressors[compression][0](raw)
+                    if action == "compress":
+                        encoded[key] = {_MARKER: compression, "data": compressed}
+                    else:
+                        digest = hashlib.sha256(raw).hexdigest()
+                        blobs[digest] = {"_id": digest, "codec": compression, "data": compressed, "size": len(raw)}
+                        encoded[key] = {_MARKER: "blob", "digest": digest, "size": len(raw)}
+                    continue
+            encoded[key] = value
+        return encoded
+
+    def blob_digests(self, doc: Mapping[str, Any]) -> Set[str]:
+        """The digests of the blobs referenced by an encoded document."""
+        digests: Set[str] = set()
+        for value in doc.values():
+            if isinstance(value, dict):
+                if value.get(_MARKER) == "blob":  # type: ignore
+                    digests.add(value["digest"])  # type: ignore
+                else:
+                    digests.update(self.blob_digests(value))  # type: ignore
+        return digests
+
+    def decode(self, doc: Mapping[str, Any], blobs: Mapping[str, Mapping[str, Any]]) -> Dict[str, Any]:
+        """Decode an encoded document, given the blob documents it references (keyed by digest)."""
+        decoded: Dict[str, Any] = {}
+        for key, value in doc.items():
+            if isinstance(value, dict):
+                marker = value.get(_MARKER)  # type: ignore
+                if marker == "blob":
+                    blob = blobs.get(value["digest"])  # type: ignore
+                    if blob is None:
+                        raise ValueError(f"Payload blob {value['digest']} of field {key!r} is missing")
+                    decoded[key] = self._decompress(blob["codec"], blob["data"])
+                elif marker is not None:
+                    decoded[key] = self._decompress(marker, value["data"])  # type: ignore
+                else:
+                    decoded[key] = self.decode(value, blobs)  # type: ignore
+            else:
+                decoded[key] = value
+        return decoded
+
+    def _decompress(self, compression: str, data: bytes) -> Any:
+        if compression not in self._compressors:
+            # Written under a rule that has since been removed.
+            self._compressors[compression] = _compressors(compression)
+        return json.loads(self._compressors[compression][1](data))
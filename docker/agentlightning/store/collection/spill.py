@@ -0,0 +1,180 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Append-only on-disk segments for spans evicted from memory."""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import weakref
+import zlib
+from typing import Any, Dict, List, Sequence, Set, Tuple, TypedDict
+
+from pydantic import TypeAdapter
+
+from agentlightning.types import Span
+
+__all__ = ["SpanSpill", "SpanSpillStats"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024**2
+
+_RECORD_HEADER = struct.Struct(">I")
+_SPAN_LIST_ADAPTER: TypeAdapter[List[Span]] = TypeAdapter(List[Span])
+
+
+class SpanSpillStats(TypedDict):
+    """Counters of a [`SpanSpill`][agentlightning.store.collection.spill.SpanSpill]."""
+
+    rollouts: int
+    """Number of rollouts with spilled spans."""
+    spans: int
+    """Number of spans written to disk."""
+    segments: int
+    """Number of segment files created."""
+    bytes_on_disk: int
+    """Total size of the records written, after compression."""
+
+
+class SpanSpill:
+    """Spill tier for evicted spans, made of append-only segment files on local disk.
+
+    Every eviction appends one record per rollout to the current segment: a 4-byte big-endian payload
+    length followed by the JSON-encoded span list, optionally zlib-compressed. Segments are rotated once
+    they exceed `segment_max_bytes`. An in-memory index maps each rollout to the extents of its records,
+    so reading a rollout back touches only its own records.
+
+    The files live in a private directory created under `directory` (the system temporary directory
+    by default). They are scratch data of the owning process and are removed when the spill is closed
+    or garbage-collected. A pickled copy (e.g., in a subprocess) can read the records spilled so far for
+    as long as the owner is alive, and writes its own records into a directory of its own.
+
+    Args:
+        directory: Parent directory of the spill files.
+        compress: Whether to zlib-compress the records.
+        segment_max_bytes: Size after which a new segment file is started.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        *,
+        compress: bool = False,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+    ) -> None:
+        if segment_max_bytes <= 0:
+            raise ValueError("segment_max_bytes must be positive")
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._parent_directory = directory
+        self._root = tempfile.mkdtemp(prefix="agl-span-spill-", dir=directory)
+        self._compress = compress
+        self._segment_max_bytes = segment_max_bytes
+        self._lock = threading.Lock()
+        # rollout_id -> [(segment path, offset of the record header, payload length)]
+        self._index: Dict[str, List[Tuple[str, int, int]]] = {}
+        self._num_segments = 0
+        self._segment_path = ""
+        self._segment_size = 0
+        self._num_spans = 0
+        self._bytes_on_disk = 0
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self._root, ignore_errors=True)
+
+    @property
+    def directory(self) -> str:
+        """The private directory holding the segment files."""
+        return self._root
+
+    def __contains__(self, rollout_id: object) -> bool:
+        return rollout_id in self._index
+
+    def rollout_ids(self) -> Set[str]:
+        """IDs of the rollouts with spilled spans."""
+        with self._lock:
+            return set(self._index)
+
+    def stats(self) -> SpanSpillStats:
+        """Counters of the spill so far."""
+        with self._lock:
+            return SpanSpillStats(
+                rollouts=len(self._index),
+                spans=self._num_spans,
+                segments=self._num_segments,
+                bytes_on_disk=self._bytes_on_disk,
+            )
+
+    def append(self, rollout_id: str, spans: Sequence[Span]) -> int:
+        """Append the spans of a rollout to the current segment.
+
+        Returns:
+            The number of bytes written.
+        """
+        if not spans:
+            return 0
+        payload = b"[" + b",".join(span.model_dump_json().encode("utf-8") for span in spans) + b"]"
+        if self._compress:
+            payload = zlib.compress(payload)
+        record = _RECORD_HEADER.pack(len(payload)) + payload
+
+        with self._lock:
+            if not self._segment_path or self._segment_size + len(record) > self._segment_max_bytes:
+                self._segment_path = os.path.join(self._root, f"segment-{self._num_segments:06d}.spans")
+                self._num_segments += 1
+                self._segment_size = 0
+            offset = self._segment_size
+            with open(self._segment_path, "ab") as f:
+                f.write(record)
+            self._segment_size += len(record)
+            self._index.setdefault(rollout_id, []).append((self._segment_path, offset, len(payload)))
+            self._num_spans += len(spans)
+            self._bytes_on_disk += len(record)
+        return len(record)
+
+    def read(self, rollout_id: str) -> List[Span]:
+        """Read back all the spilled spans of a rollout, in the order they were spilled."""
+        with self._lock:
+            extents = list(self._index.get(rollout_id, ()))
+        spans: List[Span] = []
+        for segment_path, offset, length in extents:
+            with open(segment_path, "rb") as f:
+                f.seek(offset + _RECORD_HEADER.size)
+                payload = f.read(length)
+            if len(payload) != length:
+                raise RuntimeError(f"Spill segment {segment_path} is truncated for rollout {rollout_id}")
+            if self._compress:
+                payload = zlib.decompress(payload)
+            spans.extend(_SPAN_LIST_ADAPTER.validate_json(payload))
+        return spans
+
+    def close(self) -> None:
+        """Delete the spill files. Spilled spans are lost afterwards."""
+        with self._lock:
+            self._index.clear()
+        self._finalizer()
+
+    # The segment files belong to the process that wrote them: a copy shares the index of the records
+    # written so far, but appends to (and cleans up) a directory of its own.
+    def __getstate__(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": self._parent_directory,
+                "compress": self._compress,
+                "segment_max_bytes": self._segment_max_bytes,
+                "index": {rollout_id: list(extents) for rollout_id, extents in self._index.items()},
+                "num_spans": self._num_spans,
+            }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        SpanSpill.__init__(
+            self,
+            state["directory"],
+            compress=state["compress"],
+            segment_max_bytes=state["segment_max_bytes"],
+        )
+        self._index = state["index"]
+        self._num_spans = state["num_spans"]
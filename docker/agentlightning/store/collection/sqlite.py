@@ -0,0 +1,717 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel, TypeAdapter
+
+from agentlightning.types import (
+    Attempt,
+    FilterOptions,
+    PaginatedResult,
+    ResourcesUpdate,
+    Rollout,
+    SortOptions,
+    Span,
+    Worker,
+)
+
+from .base import (
+    Collection,
+    KeyValue,
+    LightningCollections,
+    Projection,
+    Queue,
+    normalize_filter_options,
+    project_document,
+    resolve_sort_options,
+)
+from .memory import _LoopAwareAsyncLock  # pyright: ignore[reportPrivateUsage]
+
+T_model = TypeVar("T_model", bound=BaseModel)
+
+T_generic = TypeVar("T_generic")
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a table or field name for use in SQL. Only plain identifiers are accepted."""
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQLite identifier: {name!r}")
+    return f'"{name}"'
+
+
+def _encode_param(value: Any) -> Any:
+    """Convert a filter value into a parameter comparable with the stored column or JSON value."""
+    if value is None or isinstance(value, (str, int, float)):
+        # bool is an int subclass, which is also how json_extract() returns JSON booleans.
+        return value
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class SqliteDatabase:
+    """A lazily opened SQLite connection shared by the collections of a store.
+
+    The database runs in WAL mode so that readers never block the writer, with `synchronous=NORMAL`:
+    committed transactions survive an application crash, and only the last ones may be lost on power failure.
+    Statements are prepared once and cached by the connection.
+
+    When pickled (e.g., into a subprocess), only the configuration is kept; the copy reopens the database.
+
+    Args:
+        path: Path to the database file. Use `":memory:"` for a private, non-persistent database.
+        busy_timeout: Seconds to wait for a lock held by another connection before failing.
+        synchronous: The SQLite `synchronous` pragma.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        busy_timeout: float = 30.0,
+        synchronous: Literal["OFF", "NORMAL", "FULL"] = "NORMAL",
+    ) -> None:
+        if synchronous not in ("OFF", "NORMAL", "FULL"):
+            raise ValueError(f"Unsupported synchronous mode: {synchronous!r}")
+        self._path = path
+        self._busy_timeout = busy_timeout
+        self._synchronous = synchronous
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._created_tables: Set[str] = set()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self._path, "busy_timeout": self._busy_timeout, "synchronous": self._synchronous}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        SqliteDatabase.__init__(
+            self, state["path"], busy_timeout=state["busy_timeout"], synchronous=state["synchronous"]
+        )
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the connection, opening and configuring it on first use."""
+        if self._connection is not None:
+            return self._connection
+        with self._lock:
+            if self._connection is None:
+                # Autocommit mode: transactions are started explicitly with BEGIN/SAVEPOINT.
+                connection = sqlite3.connect(
+                    self._path,
+                    timeout=self._busy_timeout,
+                    isolation_level=None,
+                    check_same_thread=False,
+                    cached_statements=256,
+                )
+                journal_mode = connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                if journal_mode != "wal" and self._path != ":memory:":
+                    logger.warning("SQLite database %s does not support WAL mode, using %s", self._path, journal_mode)
+                connection.execute(f"PRAGMA synchronous={self._synchronous}")
+                connection.execute("PRAGMA temp_store=MEMORY")
+                self._connection = connection
+        return self._connection
+
+    def ensure_table(self, table_name: str, statements: Sequence[str]) -> sqlite3.Connection:
+        """Run the idempotent DDL statements of a table once per connection and return the connection."""
+        connection = self.connection()
+        if table_name not in self._created_tables:
+            with self.savepoint() as conn:
+                for statement in statements:
+                    conn.execute(statement)
+            self._created_tables.add(table_name)
+        return connection
+
+    @contextmanager
+    def savepoint(self) -> Iterator[sqlite3.Connection]:
+        """Run several statements atomically.
+
+        Nests into the surrounding transaction if there is one, otherwise commits on exit.
+        """
+        connection = self.connection()
+        connection.execute("SAVEPOINT agl_write")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK TO agl_write")
+            connection.execute("RELEASE agl_write")
+            raise
+        connection.execute("RELEASE agl_write")
+
+    @contextmanager
+    def read_snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Run several reads against one snapshot of the database.
+
+        Nests into the surrounding transaction if there is one. In WAL mode, the snapshot is taken
+        by the first read and concurrent writers are not blocked.
+        """
+        connection = self.connection()
+        connection.execute("SAVEPOINT agl_read")
+        try:
+            yield connection
+        finally:
+            connection.execute("RELEASE agl_read")
+
+    def close(self) -> None:
+        """Close the connection. The database is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._created_tables.clear()
+
+
+class SqliteBasedCollection(Collection[T_model]):
+    """SQLite-based implementation of Collection.
+
+    Every item is one row holding its JSON document. Primary keys are stored in their own columns under a
+    unique constraint; filters and sorts on other fields go through `json_extract()`, and the fields listed
+    in `extra_indexes` get an expression index. Rows keep their insertion order (`seq`), which breaks ties
+    when sorting and is the order of unsorted queries.
+
+    Null values sort first in ascending order and last in descending order, except for `*_time` fields,
+    where they sort last in ascending order and first in descending order (like the in-memory implementation).
+
+    Args:
+        database: The database holding the table.
+        table_name: The name of the table.
+        primary_keys: The primary keys of the collection.
+        item_type: The type of the items in the collection.
+        extra_indexes: The extra (possibly compound) indexes to create on the table.
+    """
+
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        table_name: str,
+        primary_keys: Sequence[str],
+        item_type: Type[T_model],
+        extra_indexes: Sequence[Sequence[str]] = (),
+    ):
+        if not primary_keys:
+            raise ValueError("primary_keys must be non-empty")
+        if not issubclass(item_type, BaseModel):  # type: ignore
+            raise ValueError(f"item_type must be a subclass of BaseModel, got {item_type.__name__}")
+        self._database = database
+        self._table_name = table_name
+        self._table = _quote_identifier(table_name)
+        self._primary_keys = list(primary_keys)
+        self._item_type = item_type
+        self._extra_indexes = [list(index) for index in extra_indexes]
+
+        pk_columns = ", ".join(_quote_identifier(pk) for pk in self._primary_keys)
+        pk_match = " AND ".join(f"{_quote_identifier(pk)} = ?" for pk in self._primary_keys)
+        pk_placeholders = ", ".join("?" for _ in self._primary_keys)
+        self._insert_sql = f"INSERT INTO {self._table} ({pk_columns}, doc) VALUES ({pk_placeholders}, ?)"
+        self._upsert_sql = self._insert_sql + f" ON CONFLICT ({pk_columns}) DO UPDATE SET doc = excluded.doc"
+        self._update_sql = f"UPDATE {self._table} SET doc = ? WHERE {pk_match}"
+        self._delete_sql = f"DELETE FROM {self._table} WHERE {pk_match}"
+
+    def _schema(self) -> List[str]:
+        pk_definitions = ", ".join(f"{_quote_identifier(pk)} NOT NULL" for pk in self._primary_keys)
+        pk_columns = ", ".join(_quote_identifier(pk) for pk in self._primary_keys)
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS {self._table} "
+            f"(seq INTEGER PRIMARY KEY AUTOINCREMENT, {pk_definitions}, doc TEXT NOT NULL, UNIQUE ({pk_columns}))"
+        ]
+        for index in self._extra_indexes:
+            index_name = _quote_identifier(f"idx_{self._table_name}_{'_'.join(index)}")
+            expressions = ", ".join(self._field_expression(field_name) for field_name in index)
+            statements.append(f"CREATE INDEX IF NOT EXISTS {index_name} ON {self._table} ({expressions})")
+        return statements
+
+    def ensure_table(self) -> sqlite3.Connection:
+        """Ensure the backing table and its indexes exist, and return the connection.
+
+        This method is idempotent and safe to call multiple times.
+        """
+        return self._database.ensure_table(self._table_name, self._schema())
+
+    def primary_keys(self) -> Sequence[str]:
+        """Return the primary key field names for this collection."""
+        return self._primary_keys
+
+    def item_type(self) -> Type[T_model]:
+        return self._item_type
+
+    async def size(self) -> int:
+        connection = self.ensure_table()
+        return connection.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def _field_expression(self, field_name: str) -> str:
+        """SQL expression of a field. Must be spelled identically in queries and indexes to use the indexes."""
+        quoted = _quote_identifier(field_name)
+        if field_name in self._primary_keys:
+            return quoted
+        return f"json_extract(doc, '$.{field_name}')"
+
+    def _field_conditions(self, field_name: str, ops: Mapping[str, Any], params: List[Any]) -> List[str]:
+        """Convert a FilterField (ops) into SQL conditions, appending their parameters."""
+        expression = self._field_expression(field_name)
+        conditions: List[str] = []
+        for op_name, raw_value in ops.items():
+            if op_name == "exact":
+                if raw_value is None:
+                    continue
+                conditions.append(f"{expression} = ?")
+                params.append(_encode_param(raw_value))
+            elif op_name == "within":
+                if raw_value is None:
+                    continue
+                try:
+                    values = list(raw_value)
+                except TypeError as exc:
+                    raise ValueError(
+                        f"Invalid iterable for within filter for field '{field_name}': {raw_value!r}"
+                    ) from exc
+                if not values:
+                    conditions.append("0")
+                    continue
+                conditions.append(f"{expression} IN ({', '.join('?' for _ in values)})")
+                params.extend(_encode_param(value) for value in values)
+            elif op_name == "contains":
+                if raw_value is None:
+                    continue
+                if field_name in self._primary_keys:
+                    conditions.append(f"instr({expression}, ?) > 0")
+                    params.append(str(raw_value))
+                    continue
+                # Substring of a string field, or element of a list field.
+                path = f"'$.{field_name}'"
+                conditions.append(
+                    f"(CASE json_type(doc, {path}) WHEN 'array' "
+                    f"THEN EXISTS (SELECT 1 FROM json_each(doc, {path}) WHERE json_each.value = ?) "
+                    f"ELSE instr({expression}, ?) > 0 END)"
+                )
+                params.extend([_encode_param(raw_value), str(raw_value)])
+            else:
+                raise ValueError(f"Unsupported filter operator '{op_name}' for field '{field_name}'")
+        return conditions
+
+    def _build_where(self, filter: Optional[FilterOptions]) -> Tuple[str, List[Any]]:
+        """Translate FilterOptions into a SQL WHERE clause and its parameters."""
+        normalized, must_filters, aggregate = normalize_filter_options(filter)
+        params: List[Any] = []
+        regular_conditions: List[str] = []
+        must_conditions: List[str] = []
+        if normalized:
+            for field_name, ops in normalized.items():
+                regular_conditions.extend(self._field_conditions(field_name, ops, params))
+        if must_filters:
+            for field_name, ops in must_filters.items():
+                must_conditions.extend(self._field_conditions(field_name, ops, params))
+
+        if aggregate == "and" or not regular_conditions:
+            conditions = regular_conditions + must_conditions
+        else:
+            # (OR of regular) AND (all must)
+            conditions = ["(" + " OR ".join(regular_conditions) + ")"] + must_conditions
+        if not conditions:
+            return "", params
+        return " WHERE " + " AND ".join(conditions), params
+
+    def _build_order_by(self, sort: Optional[SortOptions]) -> str:
+        sort_name, sort_order = resolve_sort_options(sort)
+        if sort_name is None:
+            return " ORDER BY seq"
+        if sort_name not in self._item_type.model_fields:
+            raise ValueError(
+                f"Failed to sort items by '{sort_name}': field does not exist on {self._item_type.__name__}"
+            )
+        expression = self._field_expression(sort_name)
+        direction = "ASC" if sort_order == "asc" else "DESC"
+        # Missing timestamps are treated as infinity; other null values as the smallest value.
+        nulls_last = sort_name.endswith("_time") == (sort_order == "asc")
+        return f" ORDER BY {expression} {direction} NULLS {'LAST' if nulls_last else 'FIRST'}, seq"
+
+    def _load(self, doc: str) -> T_model:
+        return self._item_type.model_validate_json(doc)
+
+    def _load_projected(self, doc: str, projection: Projection) -> T_model:
+        model_fields = list(self._item_type.model_fields)
+        document = project_document(json.loads(doc), projection, model_fields, self._primary_keys)
+        return self._item_type.model_validate(document)
+
+    async def query(
+        self,
+        filter: Optional[FilterOptions] = None,
+        sort: Optional[SortOptions] = None,
+        limit: int = -1,
+        offset: int = 0,
+        projection: Optional[Projection] = None,
+    ) -> PaginatedResult[T_model]:
+        """SQLite-based implementation of Collection.query.
+
+        With a projection, only the projected part of each document is validated.
+        """
+        self.ensure_table()
+        where, params = self._build_where(filter)
+        order_by = self._build_order_by(sort)
+        # The total and the page come from the same snapshot, so that they agree under concurrent writes.
+        with self._database.read_snapshot() as connection:
+            total = connection.execute(f"SELECT COUNT(*) FROM {self._table}{where}", params).fetchone()[0]
+            if limit == 0:
+                return PaginatedResult[T_model](items=[], limit=0, offset=offset, total=total)
+
+            rows = connection.execute(
+                f"SELECT doc FROM {self._table}{where}{order_by} LIMIT ? OFFSET ?",
+                [*params, limit if limit >= 0 else -1, max(offset, 0)],
+            ).fetchall()
+        if projection is None:
+            items = [self._load(doc) for (doc,) in rows]
+        else:
+            items = [self._load_projected(doc, projection) for (doc,) in rows]
+        return PaginatedResult[T_model](items=items, limit=limit, offset=offset, total=total)
+
+    async def query_after(
+        self,
+        keys: Sequence[str],
+        filter: Optional[FilterOptions] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: int = -1,
+    ) -> List[T_model]:
+        """SQLite-based implementation of Collection.query_after, with the cursor as a row-value comparison."""
+        if not keys:
+            raise ValueError("keys must be non-empty")
+        if after is not None and len(after) > len(keys):
+            raise ValueError(f"Cursor {after!r} has more values than the keys {list(keys)!r}")
+        for key in keys:
+            if key not in self._item_type.model_fields:
+                raise ValueError(f"Failed to sort items by '{key}': field does not exist on {self._item_type.__name__}")
+        if limit == 0:
+            return []
+
+        connection = self.ensure_table()
+        where, params = self._build_where(filter)
+        if after:
+            expressions = ", ".join(self._field_expression(key) for key in keys[: len(after)])
+            placeholders = ", ".join("?" for _ in after)
+            where += (" AND " if where else " WHERE ") + f"({expressions}) > ({placeholders})"
+            params.extend(_encode_param(value) for value in after)
+        order_by = " ORDER BY " + ", ".join(f"{self._field_expression(key)} ASC" for key in keys) + ", seq"
+        rows = connection.execute(
+            f"SELECT doc FROM {self._table}{where}{order_by} LIMIT ?", [*params, limit if limit >= 0 else -1]
+        ).fetchall()
+        return [self._load(doc) for (doc,) in rows]
+
+    async def get(
+        self,
+        filter: Optional[FilterOptions] = None,
+        sort: Optional[SortOptions] = None,
+    ) -> Optional[T_model]:
+        connection = self.ensure_table()
+        where, params = self._build_where(filter)
+        order_by = self._build_order_by(sort)
+        row = connection.execute(f"SELECT doc FROM {self._table}{where}{order_by} LIMIT 1", params).fetchone()
+        return self._load(row[0]) if row is not None else None
+
+    def _row(self, item: T_model) -> Tuple[Any, ...]:
+        if not isinstance(item, self._item_type):
+            raise TypeError(f"Expected item of type {self._item_type.__name__}, got {type(item).__name__}")
+        return (*(getattr(item, pk) for pk in self._primary_keys), item.model_dump_json())
+
+    def _pk_values(self, item: T_model) -> Tuple[Any, ...]:
+        if not isinstance(item, self._item_type):
+            raise TypeError(f"Expected item of type {self._item_type.__name__}, got {type(item).__name__}")
+        return tuple(getattr(item, pk) for pk in self._primary_keys)
+
+    async def insert(self, items: Sequence[T_model]) -> None:
+        if not items:
+            return
+        self.ensure_table()
+        rows = [self._row(item) for item in items]
+        try:
+            with self._database.savepoint() as connection:
+                connection.executemany(self._insert_sql, rows)
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(f"Item already exists in {self._table_name}: {exc}") from exc
+
+    async def update(self, items: Sequence[T_model]) -> None:
+        if not items:
+            return
+        self.ensure_table()
+        rows = [(row[-1], *row[:-1]) for row in (self._row(item) for item in items)]
+        with self._database.savepoint() as connection:
+            for item, row in zip(items, rows):
+                if connection.execute(self._update_sql, row).rowcount == 0:
+                    raise ValueError(f"Item with primary key(s) {self._pk_values(item)} does not exist")
+
+    async def upsert(self, items: Sequence[T_model]) -> None:
+        if not items:
+            return
+        self.ensure_table()
+        rows = [self._row(item) for item in items]
+        with self._database.savepoint() as connection:
+            connection.executemany(self._upsert_sql, rows)
+
+    async def delete(self, items: Sequence[T_model]) -> None:
+        if not items:
+            return
+        self.ensure_table()
+        keys = [self._pk_values(item) for item in items]
+        with self._database.savepoint() as connection:
+            for key in keys:
+                if connection.execute(self._delete_sql, key).rowcount == 0:
+                    raise ValueError(f"Item with primary key(s) {key} does not exist")
+
+
+class SqliteBasedQueue(Queue[T_generic], Generic[T_generic]):
+    """SQLite-based implementation of Queue. Items are rows ordered by an autoincrement sequence.
+
+    Args:
+        database: The database holding the table.
+        table_name: The name of the table backing the queue.
+        item_type: The Python type of queue items (primitive or BaseModel subclass).
+    """
+
+    def __init__(self, database: SqliteDatabase, table_name: str, item_type: Type[T_generic]) -> None:
+        self._database = database
+        self._table_name = table_name
+        self._table = _quote_identifier(table_name)
+        self._item_type = item_type
+        self._adapter: TypeAdapter[T_generic] = TypeAdapter(item_type)
+
+    def item_type(self) -> Type[T_generic]:
+        return self._item_type
+
+    def ensure_table(self) -> sqlite3.Connection:
+        """Ensure the backing table exists, and return the connection."""
+        index_name = _quote_identifier(f"idx_{self._table_name}_value")
+        return self._database.ensure_table(
+            self._table_name,
+            [
+                f"CREATE TABLE IF NOT EXISTS {self._table} (seq INTEGER PRIMARY KEY AUTOINCREMENT, value TEXT NOT NULL)",
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {self._table} (value)",
+            ],
+        )
+
+    def _encode(self, item: T_generic) -> str:
+        return self._adapter.dump_json(item).decode("utf-8")
+
+    async def has(self, item: T_generic) -> bool:
+        connection = self.ensure_table()
+        row = connection.execute(f"SELECT 1 FROM {self._table} WHERE value = ? LIMIT 1", (self._encode(item),))
+        return row.fetchone() is not None
+
+    async def enqueue(self, items: Sequence[T_generic]) -> Sequence[T_generic]:
+        if not items:
+            return []
+        self.ensure_table()
+        for item in items:
+            if not isinstance(item, self._item_type):
+                raise TypeError(f"Expected item of type {self._item_type.__name__}, got {type(item).__name__}")
+        with self._database.savepoint() as connection:
+            connection.executemany(
+                f"INSERT INTO {self._table} (value) VALUES (?)", [(self._encode(item),) for item in items]
+            )
+        return list(items)
+
+    async def dequeue(self, limit: int = 1) -> Sequence[T_generic]:
+        if limit <= 0:
+            return []
+        self.ensure_table()
+        with self._database.savepoint() as connection:
+            rows = connection.execute(f"SELECT seq, value FROM {self._table} ORDER BY seq LIMIT ?", (limit,)).fetchall()
+            if rows:
+                connection.execute(f"DELETE FROM {self._table} WHERE seq <= ?", (rows[-1][0],))
+        return [self._adapter.validate_json(value) for _, value in rows]
+
+    async def peek(self, limit: int = 1) -> Sequence[T_generic]:
+        if limit <= 0:
+            return []
+        connection = self.ensure_table()
+        rows = connection.execute(f"SELECT value FROM {self._table} ORDER BY seq LIMIT ?", (limit,)).fetchall()
+        return [self._adapter.validate_json(value) for (value,) in rows]
+
+    async def size(self) -> int:
+        connection = self.ensure_table()
+        return connection.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+
+class SqliteBasedKeyValue(KeyValue[K, V], Generic[K, V]):
+    """SQLite-based implementation of KeyValue.
+
+    Args:
+        database: The database holding the table.
+        table_name: The name of the table backing the key-value store.
+        key_type: The Python type of keys (primitive or BaseModel).
+        value_type: The Python type of values (primitive or BaseModel).
+    """
+
+    def __init__(self, database: SqliteDatabase, table_name: str, key_type: Type[K], value_type: Type[V]) -> None:
+        self._database = database
+        self._table_name = table_name
+        self._table = _quote_identifier(table_name)
+        self._key_adapter: TypeAdapter[K] = TypeAdapter(key_type)
+        self._value_adapter: TypeAdapter[V] = TypeAdapter(value_type)
+
+    def ensure_table(self) -> sqlite3.Connection:
+        """Ensure the backing table exists, and return the connection."""
+        return self._database.ensure_table(
+            self._table_name,
+            [f"CREATE TABLE IF NOT EXISTS {self._table} (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"],
+        )
+
+    def _encode_key(self, key: K) -> str:
+        return self._key_adapter.dump_json(key).decode("utf-8")
+
+    async def has(self, key: K) -> bool:
+        connection = self.ensure_table()
+        row = connection.execute(f"SELECT 1 FROM {self._table} WHERE key = ?", (self._encode_key(key),))
+        return row.fetchone() is not None
+
+    async def get(self, key: K, default: V | None = None) -> V | None:
+        connection = self.ensure_table()
+        row = connection.execute(f"SELECT value FROM {self._table} WHERE key = ?", (self._encode_key(key),)).fetchone()
+        if row is None:
+            return default
+        return self._value_adapter.validate_json(row[0])
+
+    async def set(self, key: K, value: V) -> None:
+        connection = self.ensure_table()
+        connection.execute(
+            f"INSERT INTO {self._table} (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (self._encode_key(key), self._value_adapter.dump_json(value).decode("utf-8")),
+        )
+
+    async def pop(self, key: K, default: V | None = None) -> V | None:
+        self.ensure_table()
+        encoded_key = self._encode_key(key)
+        with self._database.savepoint() as connection:
+            row = connection.execute(f"SELECT value FROM {self._table} WHERE key = ?", (encoded_key,)).fetchone()
+            if row is None:
+                return default
+            connection.execute(f"DELETE FROM {self._table} WHERE key = ?", (encoded_key,))
+        return self._value_adapter.validate_json(row[0])
+
+    async def size(self) -> int:
+        connection = self.ensure_table()
+        return connection.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+
+class SqliteLightningCollections(LightningCollections):
+    """SQLite implementation of LightningCollections, with one table per collection in a single database.
+
+    Serves as the storage base for [`SqliteLightningStore`][agentlightning.store.sqlite.SqliteLightningStore].
+    Each [`atomic()`][agentlightning.store.collection.sqlite.SqliteLightningCollections.atomic] block is one
+    write transaction, so a store call is committed (or rolled back) as a whole.
+
+    Args:
+        database: The database holding the tables.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self._database = database
+        self._lock = _LoopAwareAsyncLock()
+        # Same keys as the MongoDB collections.
+        self._rollouts = SqliteBasedCollection(database, "rollouts", ["rollout_id"], Rollout, [["status"]])
+        self._attempts = SqliteBasedCollection(
+            database, "attempts", ["rollout_id", "attempt_id"], Attempt, [["status"], ["sequence_id"]]
+        )
+        self._spans = SqliteBasedCollection(
+            database, "spans", ["rollout_id", "attempt_id", "span_id"], Span, [["sequence_id"]]
+        )
+        self._resources = SqliteBasedCollection(
+            database, "resources", ["resources_id"], ResourcesUpdate, [["update_time"]]
+        )
+        self._workers = SqliteBasedCollection(database, "workers", ["worker_id"], Worker, [["status"]])
+        self._rollout_queue = SqliteBasedQueue(database, "rollout_queue", str)
+        self._span_sequence_ids = SqliteBasedKeyValue(database, "span_sequence_ids", str, int)
+        self._latest_attempt_ids = SqliteBasedKeyValue(database, "latest_attempt_ids", str, str)
+
+    @property
+    def database(self) -> SqliteDatabase:
+        return self._database
+
+    @property
+    def rollouts(self) -> SqliteBasedCollection[Rollout]:
+        return self._rollouts
+
+    @property
+    def attempts(self) -> SqliteBasedCollection[Attempt]:
+        return self._attempts
+
+    @property
+    def spans(self) -> SqliteBasedCollection[Span]:
+        return self._spans
+
+    @property
+    def resources(self) -> SqliteBasedCollection[ResourcesUpdate]:
+        return self._resources
+
+    @property
+    def workers(self) -> SqliteBasedCollection[Worker]:
+        return self._workers
+
+    @property
+    def rollout_queue(self) -> SqliteBasedQueue[str]:
+        return self._rollout_queue
+
+    @property
+    def span_sequence_ids(self) -> SqliteBasedKeyValue[str, int]:
+        return self._span_sequence_ids
+
+    @property
+    def latest_attempt_ids(self) -> SqliteBasedKeyValue[str, str]:
+        return self._latest_attempt_ids
+
+    def _ensure_tables(self) -> None:
+        """Ensure all tables exist, so that the DDL stays out of the write transactions."""
+        self._rollouts.ensure_table()
+        self._attempts.ensure_table()
+        self._spans.ensure_table()
+        self._resources.ensure_table()
+        self._workers.ensure_table()
+        self._rollout_queue.ensure_table()
+        self._span_sequence_ids.ensure_table()
+        self._latest_attempt_ids.ensure_table()
+
+    @asynccontextmanager
+    async def atomic(self, *args: Any, **kwargs: Any):
+        """Run the block in one write transaction, rolled back if the block raises."""
+        async with self._lock:
+            self._ensure_tables()
+            connection = self._database.connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._database.close()
@@ -9,9 +9,12 @@ import logging
 import time
 import uuid
 import warnings
+from contextvars import ContextVar
 from types import CoroutineType
 from typing import (
     Any,
+    AsyncIterator,
+    Awaitable,
     Callable,
     Dict,
     Generic,
@@ -20,6 +23,9 @@ from typing import (
     Optional,
     ParamSpec,
     Sequence,
+    Set,
+    Tuple,
+    TypedDict,
     TypeVar,
     Union,
     cast,
@@ -33,8 +39,10 @@ from agentlightning.types import (
     Attempt,
     AttemptedRollout,
     AttemptStatus,
+    EnqueueRolloutRequest,
     FilterField,
     NamedResources,
+    OtelResource,
     PaginatedResult,
     ResourcesUpdate,
     Rollout,
@@ -43,12 +51,14 @@ from agentlightning.types import (
     SortOptions,
     Span,
     TaskInput,
+    TraceStatus,
     Worker,
     WorkerStatus,
 )
 
-from .base import UNSET, LightningStore, LightningStoreCapabilities, Unset, is_finished, is_queuing
-from .collection import FilterOptions, LightningCollections
+from .base import MAX_SPAN_BATCH_SIZE, UNSET, LightningStore, LightningStoreCapabilities, Unset, is_finished, is_queuing
+from .collection import FilterOptions, LightningCollections, Projection
+from .notifier import LoopAwareNotifier
 from .utils import healthcheck, propagate_status
 
 T_callable = TypeVar("T_callable", bound=Callable[..., Any])
@@ -63,6 +73,53 @@ SelfT = TypeVar("SelfT", bound="CollectionBasedLightningStore[Any]")
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_WATCHDOG_INTERVAL = 1.0
+"""Default seconds between two healthcheck sweeps of the background watchdog."""
+
+_ROLLOUT_QUEUE_KEY = "rollout_queue"
+"""Notifier key signaled when rollouts are added to the rollout queue."""
+
+_pending_notifications: ContextVar[Optional[List[Callable[[], None]]]] = ContextVar(
+    "agentlightning_store_pending_notifications", default=None
+)
+"""Notifications deferred until the current `collections.execute` call has committed."""
+
+_SPAN_KEY_FIELDS = ("rollout_id", "attempt_id", "sequence_id", "trace_id", "span_id")
+"""Span fields that `query_spans` always loads, whatever the projection."""
+
+
+def _span_projection(
+    fields: Optional[Sequence[str]], attributes_prefix: Optional[Sequence[str]]
+) -> Optional[Projection]:
+    """Translate the projection arguments of `query_spans` into a collection projection."""
+    if fields is None and attributes_prefix is None:
+        return None
+    if isinstance(attributes_prefix, str):
+        attributes_prefix = [attributes_prefix]
+    projection: Projection = {
+        "defaults": {
+            "parent_id": None,
+            "name": "",
+            "status": TraceStatus(status_code="UNSET"),
+            "attributes": {},
+            "events": [],
+            "links": [],
+            "start_time": None,
+            "end_time": None,
+            "context": None,
+            "parent": None,
+            "resource": OtelResource(attributes={}, schema_url=""),
+        }
+    }
+    if fields is not None:
+        loaded = [*_SPAN_KEY_FIELDS, *fields]
+        if attributes_prefix is not None and "attributes" not in loaded:
+            loaded.append("attributes")
+        projection["fields"] = loaded
+    if attributes_prefix is not None:
+        projection["key_prefixes"] = {"attributes": list(attributes_prefix)}
+    return projection
+
 
 def _with_collections_execute(
     func: Callable[Concatenate[SelfT, T_collections, P], CoroutineType[Any, Any, R]],
@@ -71,27 +128,74 @@ def _with_collections_execute(
     Used to enable atomic locks and automatic retries.
 
     The wrapped function should accept an extra locked collection as its first argument.
+    Notifications raised by the function are delivered only after the execution has committed.
     """
 
     @functools.wraps(func)
     async def wrapper(self: SelfT, *args: P.args, **kwargs: P.kwargs) -> R:
+        pending: List[Callable[[], None]] = []
+
         async def callback(collections: T_collections) -> R:
+            # The callback might be retried. Only the notifications of the last run count.
+            pending.clear()
             return await func(self, collections, *args, **kwargs)
 
-        return await self.collections.execute(callback)
+        token = _pending_notifications.set(pending)
+        try:
+            result = await self.collections.execute(callback)
+        finally:
+            _pending_notifications.reset(token)
+        for notify in pending:
+            notify()
+        return result
 
     return wrapper
 
 
+def _with_collections_read(
+    func: Callable[Concatenate[SelfT, T_collections, P], CoroutineType[Any, Any, R]],
+) -> Callable[Concatenate[SelfT, P], CoroutineType[Any, Any, R]]:
+    """Hands over the function execution to the collections.execute_read method.
+    Used by the query methods, so that reading does not block the writers.
+
+    The wrapped function should accept an extra read-only collection as its first argument, and must not write.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self: SelfT, *args: P.args, **kwargs: P.kwargs) -> R:
+        async def callback(collections: T_collections) -> R:
+            return await func(self, collections, *args, **kwargs)
+
+        return await self.collections.execute_read(callback)
+
+    return wrapper
+
+
+def _notify_after_commit(notifier: LoopAwareNotifier, key: str, limit: Optional[int] = None) -> None:
+    """Notify the key once the enclosing `collections.execute` commits, or immediately if there is none."""
+    pending = _pending_notifications.get()
+    if pending is None:
+        notifier.notify(key, limit)
+    else:
+        pending.append(functools.partial(notifier.notify, key, limit))
+
+
 def _healthcheck_wrapper(func: T_callable) -> T_callable:
     """
-    Decorator to run the watchdog healthcheck **before** executing the decorated method.
-    Only runs if the store has a watchdog configured.
+    Decorator to make sure the store's health is checked when executing the decorated method.
+
+    When the store has a background watchdog configured, the decorator only makes sure the watchdog
+    is alive and the method itself runs without any healthcheck overhead.
+    Otherwise, the healthcheck runs **before** executing the decorated method.
     Prevents recursive healthcheck execution using a flag on the store instance.
     """
 
     @functools.wraps(func)
     async def wrapper(self: CollectionBasedLightningStore[T_collections], *args: Any, **kwargs: Any) -> Any:
+        if self._watchdog_interval is not None:  # pyright: ignore[reportPrivateUsage]
+            self._ensure_watchdog()  # pyright: ignore[reportPrivateUsage]
+            return await func(self, *args, **kwargs)
+
         # Check if healthcheck is already running to prevent recursion
         if getattr(self, "_healthcheck_running", False):
             # Skip healthcheck if already running
@@ -130,6 +234,19 @@ def _generate_attempt_id() -> str:
     return "at-" + short_id
 
 
+class WatchdogStats(TypedDict):
+    """Timing statistics of the background healthcheck watchdog."""
+
+    sweeps: int
+    """Number of completed healthcheck sweeps."""
+    last_sweep_seconds: float
+    """Wall-clock duration of the most recent sweep."""
+    max_sweep_seconds: float
+    """Longest sweep observed so far."""
+    total_sweep_seconds: float
+    """Accumulated duration of all sweeps."""
+
+
 class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
     """It's the standard implementation of LightningStore that uses collections to store data.
 
@@ -140,14 +257,141 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
     The methods in this class should generally not call each other,
     especially those that are locked.
 
+    Timeouts and unresponsive attempts are detected by a background watchdog that sweeps all running
+    rollouts every `watchdog_interval` seconds. The watchdog is started lazily by the first store call
+    on an event loop, or explicitly via [`start_watchdog()`][agentlightning.store.collection_based.CollectionBasedLightningStore.start_watchdog]
+    (e.g., by [`LightningStoreServer`][agentlightning.LightningStoreServer] on startup).
+
     Args:
         collections: The collections to use for storage.
+        watchdog_interval: Seconds between two healthcheck sweeps of the background watchdog.
+            Set to `None` to disable the watchdog and run the healthcheck before every store call instead.
+    """
+
+    _wait_recheck_interval: Optional[float] = None
+    """Upper bound of seconds a rollout or queue waiter sleeps before re-reading the collections.
+
+    `None` means waiters rely solely on notifications, which is sufficient when every rollout update
+    goes through this store instance. Stores shared across processes should set a finite value.
     """
 
-    def __init__(self, collections: T_collections):
+    def __init__(
+        self,
+        collections: T_collections,
+        *,
+        watchdog_interval: Optional[float] = DEFAULT_WATCHDOG_INTERVAL,
+    ):
+        if watchdog_interval is not None and watchdog_interval <= 0:
+            raise ValueError("watchdog_interval must be positive or None")
+
         # rollouts and spans' storage
         self.collections = collections
 
+        # Background healthcheck watchdog
+        self._watchdog_interval = watchdog_interval
+        self._watchdog_task: Optional[asyncio.Task[None]] = None
+        # Set by facades that serialize the store calls with a thread lock. The watchdog then only marks
+        # sweeps as due, and the facade runs them within its own serialization (see `_run_due_watchdog_sweep`).
+        self._watchdog_deferred = False
+        self._watchdog_sweep_due = False
+        self._watchdog_stats = WatchdogStats(
+            sweeps=0, last_sweep_seconds=0.0, max_sweep_seconds=0.0, total_sweep_seconds=0.0
+        )
+
+        # Wakes up wait_for_rollouts callers when rollouts finish
+        self._rollout_notifier = LoopAwareNotifier()
+        # Wakes up blocking dequeue_rollout callers when rollouts are queued
+        self._queue_notifier = LoopAwareNotifier()
+
+    @property
+    def watchdog_interval(self) -> Optional[float]:
+        """Seconds between two healthcheck sweeps. `None` if the watchdog is disabled."""
+        return self._watchdog_interval
+
+    def watchdog_stats(self) -> WatchdogStats:
+        """Return a copy of the timing statistics of the healthcheck sweeps."""
+        return WatchdogStats(**self._watchdog_stats)
+
+    async def start_watchdog(self) -> None:
+        """Start the background watchdog on the current event loop.
+
+        It's a no-op if the watchdog is disabled or already running.
+        """
+        if self._watchdog_interval is None:
+            return
+        self._ensure_watchdog()
+
+    async def stop_watchdog(self) -> None:
+        """Stop the background watchdog if it's running."""
+        task = self._watchdog_task
+        self._watchdog_task = None
+        if task is None or task.done():
+            return
+        task_loop = task.get_loop()
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        if task_loop is current_loop:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        elif not task_loop.is_closed():
+            task_loop.call_soon_threadsafe(task.cancel)
+
+    def _ensure_watchdog(self) -> None:
+        """Make sure the watchdog task is alive. Must be called within a running event loop."""
+        task = self._watchdog_task
+        if task is not None and not task.done():
+            task_loop = task.get_loop()
+            if not task_loop.is_closed() and task_loop.is_running():
+                return
+        assert self._watchdog_interval is not None
+        self._watchdog_task = asyncio.get_running_loop().create_task(self._watchdog_loop(self._watchdog_interval))
+
+    async def _watchdog_loop(self, interval: float) -> None:
+        """Sweep the running rollouts periodically until this task is replaced or cancelled."""
+        current_task = asyncio.current_task()
+        while self._watchdog_task is current_task:
+            if self._watchdog_deferred:
+                # A thread lock must not be held by a suspended coroutine: the facade sweeps on its next call.
+                self._watchdog_sweep_due = True
+            else:
+                await self._watchdog_sweep()
+            await asyncio.sleep(interval)
+
+    async def _run_due_watchdog_sweep(self) -> None:
+        """Run the sweep marked as due by a deferred watchdog. Called by facades while they hold their lock."""
+        if not self._watchdog_sweep_due:
+            return
+        self._watchdog_sweep_due = False
+        await self._watchdog_sweep()
+
+    async def _watchdog_sweep(self) -> None:
+        """Run one healthcheck sweep and record its duration."""
+        start_time = time.perf_counter()
+        try:
+            await self._healthcheck()
+        except Exception:
+            logger.exception("Watchdog healthcheck sweep failed")
+        elapsed = time.perf_counter() - start_time
+
+        stats = self._watchdog_stats
+        stats["sweeps"] += 1
+        stats["last_sweep_seconds"] = elapsed
+        stats["max_sweep_seconds"] = max(stats["max_sweep_seconds"], elapsed)
+        stats["total_sweep_seconds"] += elapsed
+        if self._watchdog_interval is not None and elapsed > self._watchdog_interval:
+            logger.warning(
+                "Watchdog healthcheck sweep took %.3f seconds, longer than the interval of %.3f seconds",
+                elapsed,
+                self._watchdog_interval,
+            )
+        else:
+            logger.debug("Watchdog healthcheck sweep took %.3f seconds", elapsed)
+
     async def _get_latest_resources_id(self, collections: T_collections) -> Optional[str]:
         """Get the latest resources ID from the collections. Returns `None` if no resources are found."""
         latest_resources = await collections.resources.get(sort={"name": "update_time", "order": "desc"})
@@ -166,6 +410,11 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
             await collections.workers.insert([worker])
         return worker
 
+    async def _enqueue_rollout_ids_unlocked(self, collections: T_collections, rollout_ids: Sequence[str]) -> None:
+        """Append rollouts to the rollout queue and wake up as many blocked dequeuers once committed."""
+        await collections.rollout_queue.enqueue(rollout_ids)
+        _notify_after_commit(self._queue_notifier, _ROLLOUT_QUEUE_KEY, limit=len(rollout_ids))
+
     async def _sync_worker_with_attempt(self, collections: T_collections, attempt: Attempt) -> None:
         worker_id = attempt.worker_id
         if not worker_id:
@@ -250,7 +499,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
             status="preparing",
         )
 
-        await collections.attempts.insert([attempt])
+        await collections.insert_attempts([attempt])
         await collections.rollouts.insert([rollout])
 
         # Notify the subclass that the rollout status has changed.
@@ -294,7 +543,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         )
 
         await collections.rollouts.insert([rollout])
-        await collections.rollout_queue.enqueue([rollout.rollout_id])  # add it to the end of the queue
+        await self._enqueue_rollout_ids_unlocked(collections, [rollout.rollout_id])  # add it to the end of the queue
 
         # Notify the subclass that the rollout status has changed.
         await self.on_rollout_update(rollout)
@@ -304,69 +553,216 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
 
     @_healthcheck_wrapper
     @_with_collections_execute
+    async def enqueue_rollouts(
+        self,
+        collections: T_collections,
+        items: Sequence[EnqueueRolloutRequest],
+        *,
+        mode: Literal["train", "val", "test"] | None = None,
+        resources_id: str | None = None,
+        config: RolloutConfig | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> Sequence[Rollout]:
+        """Adds a batch of tasks to the queue with a single insert and a single queue append.
+
+        See [`LightningStore.enqueue_rollouts()`][agentlightning.LightningStore.enqueue_rollouts] for semantics.
+        """
+        if not items:
+            return []
+
+        current_time = time.time()
+        # Resolved at most once for the whole batch.
+        default_resources_id = resources_id
+        if default_resources_id is None and any(item.resources_id is None for item in items):
+            default_resources_id = await self._get_latest_resources_id(collections)
+
+        rollouts: List[Rollout] = []
+        for item in items:
+            item_config = item.config if item.config is not None else config
+            rollout_metadata = dict(metadata) if metadata is not None else {}
+            if item.metadata is not None:
+                rollout_metadata.update(item.metadata)
+            rollouts.append(
+                Rollout(
+                    rollout_id=_generate_rollout_id(),
+                    input=item.input,
+                    mode=item.mode if item.mode is not None else mode,
+                    resources_id=item.resources_id if item.resources_id is not None else default_resources_id,
+                    start_time=current_time,
+                    status="queuing",
+                    config=item_config.model_copy(deep=True) if item_config is not None else RolloutConfig(),
+                    metadata=rollout_metadata,
+                )
+            )
+
+        await collections.rollouts.insert(rollouts)
+        await self._enqueue_rollout_ids_unlocked(collections, [rollout.rollout_id for rollout in rollouts])
+
+        for rollout in rollouts:
+            await self.on_rollout_update(rollout)
+
+        return rollouts
+
+    @_healthcheck_wrapper
     async def dequeue_rollout(
-        self, collections: T_collections, worker_id: Optional[str] = None
+        self, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
     ) -> Optional[AttemptedRollout]:
-        """Retrieves the next task from the queue without blocking.
-        Returns `None` if the queue is empty.
+        """Retrieves the next task from the queue.
+        Returns `None` if the queue is empty (after waiting up to `wait_timeout` seconds if given).
 
         Will set the rollout status to preparing and create a new attempt.
 
         See [`LightningStore.dequeue_rollout()`][agentlightning.LightningStore.dequeue_rollout] for semantics.
         """
+        if wait_timeout is None or wait_timeout <= 0:
+            return await self._dequeue_rollout(worker_id)
+        return await self.poll_rollout_queue(functools.partial(self._dequeue_rollout, worker_id), wait_timeout)
+
+    @_healthcheck_wrapper
+    async def dequeue_rollouts(
+        self, limit: int, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Sequence[AttemptedRollout]:
+        """Claims up to `limit` rollouts from the queue in one locked execution.
+
+        See [`LightningStore.dequeue_rollouts()`][agentlightning.LightningStore.dequeue_rollouts] for semantics.
+        """
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        if wait_timeout is None or wait_timeout <= 0:
+            return await self._dequeue_rollouts(limit, worker_id)
+
+        async def _claim() -> Optional[Sequence[AttemptedRollout]]:
+            return (await self._dequeue_rollouts(limit, worker_id)) or None
+
+        return (await self.poll_rollout_queue(_claim, wait_timeout)) or []
+
+    async def poll_rollout_queue(self, claim: Callable[[], Awaitable[Optional[R]]], wait_timeout: float) -> Optional[R]:
+        """Run `claim` whenever rollouts are queued, until it returns a value or `wait_timeout` elapses.
+
+        The caller is woken up by the rollout queue itself instead of polling it.
+        Facades that serialize store calls with their own lock should hold the lock within `claim` only,
+        so that the wait does not block other callers.
+
+        Args:
+            claim: A non-blocking attempt to take work from the queue. Returns `None` if there is nothing to take.
+            wait_timeout: Maximum seconds to wait.
+
+        Returns:
+            The first non-`None` result of `claim`, or `None` if the timeout is reached.
+        """
+        deadline = time.time() + wait_timeout
+        # Subscribe before the first claim so that no enqueue between the claim and the wait is missed.
+        waiter = self._queue_notifier.subscribe([_ROLLOUT_QUEUE_KEY])
+        try:
+            while True:
+                try:
+                    result = await claim()
+                except BaseException:
+                    # This waiter might have absorbed a wake-up meant for a queued rollout. Pass it on.
+                    self._queue_notifier.notify(_ROLLOUT_QUEUE_KEY, limit=1)
+                    raise
+                if result is not None:
+                    return result
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                if self._wait_recheck_interval is not None:
+                    remaining = min(remaining, self._wait_recheck_interval)
+                await waiter.wait(remaining)
+        finally:
+            # A wake-up that arrived after the last wait belongs to another queued rollout.
+            waiter.close(pass_on_pending=True)
+
+    @_with_collections_execute
+    async def _dequeue_rollout(
+        self, collections: T_collections, worker_id: Optional[str] = None
+    ) -> Optional[AttemptedRollout]:
+        """Non-blocking dequeue. Returns `None` if the queue is empty."""
+        claimed = await self._dequeue_rollouts_unlocked(collections, 1, worker_id)
+        return claimed[0] if claimed else None
+
+    @_with_collections_execute
+    async def _dequeue_rollouts(
+        self, collections: T_collections, limit: int, worker_id: Optional[str] = None
+    ) -> List[AttemptedRollout]:
+        """Non-blocking batch dequeue. Returns an empty list if the queue is empty."""
+        return await self._dequeue_rollouts_unlocked(collections, limit, worker_id)
+
+    async def _dequeue_rollouts_unlocked(
+        self, collections: T_collections, limit: int, worker_id: Optional[str]
+    ) -> List[AttemptedRollout]:
+        """Claim up to `limit` queued rollouts, creating a new attempt for each of them.
+
+        The rollouts and their existing attempts are read in one query per queue batch,
+        and the new attempts and rollout statuses are written in one call each.
+        """
         if worker_id is not None:
             worker = await self._get_or_create_worker(collections, worker_id)
             worker.last_dequeue_time = time.time()
             worker.status = "idle"
             await collections.workers.update([worker])
 
-        # Keep looking until we find a rollout that's still in queuing status
+        claimed: List[AttemptedRollout] = []
+        # Keep looking until we have found enough rollouts that are still in queuing status
         # or the queue is empty
-        while (await collections.rollout_queue.size()) > 0:
-            dequeued = await collections.rollout_queue.dequeue(1)
-            if not dequeued:
+        while len(claimed) < limit:
+            rollout_ids = await collections.rollout_queue.dequeue(limit - len(claimed))
+            if not rollout_ids:
                 break
-            rollout_id = dequeued[0]
 
-            rollout = await collections.rollouts.get({"rollout_id": {"exact": rollout_id}})
-            if not rollout:
-                logger.warning(f"Rollout {rollout_id} not found, skipping dequeuing")
+            rollouts = await collections.rollouts.query(filter={"rollout_id": {"within": list(rollout_ids)}})
+            rollouts_by_id = {rollout.rollout_id: rollout for rollout in rollouts.items}
+
+            to_claim: List[Rollout] = []
+            for rollout_id in rollout_ids:
+                rollout = rollouts_by_id.pop(rollout_id, None)
+                if not rollout:
+                    logger.warning(f"Rollout {rollout_id} not found, skipping dequeuing")
+                    continue
+                # Check if rollout is still in a queuing state
+                # (it might have been updated to a different status while in queue)
+                if not is_queuing(rollout):
+                    # If not in queuing state, skip this rollout and continue
+                    # (it was updated externally and should not be processed)
+                    logger.warning(
+                        f"Rollout {rollout.rollout_id} is not in queuing state: {rollout.status}, skipping dequeuing"
+                    )
+                    continue
+                to_claim.append(rollout)
+
+            if not to_claim:
                 continue
 
-            # Check if rollout is still in a queuing state
-            # (it might have been updated to a different status while in queue)
-            if is_queuing(rollout):
-                # Create a new attempt (could be first attempt or retry)
-                attempt_id = _generate_attempt_id()
-                current_time = time.time()
-
-                # Get existing attempts to determine sequence number
-                existing_attempts = await self._query_attempts_for_rollout_unlocked(collections, rollout.rollout_id)
-                sequence_id = len(existing_attempts) + 1
-
-                attempt = Attempt(
+            # Get existing attempts to determine sequence numbers
+            existing_attempts = await collections.attempts.query(
+                filter={"rollout_id": {"within": [rollout.rollout_id for rollout in to_claim]}}
+            )
+            num_attempts: Dict[str, int] = {}
+            for existing_attempt in existing_attempts.items:
+                num_attempts[existing_attempt.rollout_id] = num_attempts.get(existing_attempt.rollout_id, 0) + 1
+
+            # Create a new attempt for each rollout (could be first attempt or retry)
+            current_time = time.time()
+            attempts = [
+                Attempt(
                     rollout_id=rollout.rollout_id,
-                    attempt_id=attempt_id,
-                    sequence_id=sequence_id,
+                    attempt_id=_generate_attempt_id(),
+                    sequence_id=num_attempts.get(rollout.rollout_id, 0) + 1,
                     start_time=current_time,
                     status="preparing",
                 )
+                for rollout in to_claim
+            ]
+            await collections.insert_attempts(attempts)
+
+            # Sync attempt status to rollouts. The validated copies are the ones written back.
+            to_claim = [Rollout.model_validate({**rollout.model_dump(), "status": "preparing"}) for rollout in to_claim]
+            await collections.rollouts.update(to_claim)
+            for rollout, attempt in zip(to_claim, attempts):
+                await self.on_rollout_update(rollout)
+                claimed.append(AttemptedRollout(**rollout.model_dump(), attempt=attempt))
 
-                await collections.attempts.insert([attempt])
-
-                # Sync attempt status to rollout
-                rollout = await self._update_rollout_unlocked(collections, rollout.rollout_id, status="preparing")
-
-                return AttemptedRollout(**rollout.model_dump(), attempt=attempt)
-
-            # If not in queuing state, skip this rollout and continue
-            # (it was updated externally and should not be processed)
-            logger.warning(
-                f"Rollout {rollout.rollout_id} is not in queuing state: {rollout.status}, skipping dequeuing"
-            )
-
-        # No valid rollouts found
-        return None
+        return claimed
 
     @_healthcheck_wrapper
     @_with_collections_execute
@@ -400,7 +796,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         )
 
         # Add attempt to storage
-        await collections.attempts.insert([attempt])
+        await collections.insert_attempts([attempt])
 
         # Sync attempt status to rollout
         rollout = await self._update_rollout_unlocked(collections, rollout_id, status="preparing")
@@ -409,7 +805,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         return AttemptedRollout(**rollout.model_dump(), attempt=attempt)
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def query_rollouts(
         self,
         collections: T_collections,
@@ -483,7 +879,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         return list(result.items)
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def get_rollout_by_id(
         self, collections: T_collections, rollout_id: str
     ) -> Optional[Union[Rollout, AttemptedRollout]]:
@@ -513,13 +909,10 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
 
     async def _get_latest_attempt_unlocked(self, collections: T_collections, rollout_id: str) -> Optional[Attempt]:
         """The unlocked version of `get_latest_attempt`."""
-        return await collections.attempts.get(
-            filter={"rollout_id": {"exact": rollout_id}},
-            sort={"name": "sequence_id", "order": "desc"},
-        )
+        return await collections.get_latest_attempt(rollout_id)
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def query_attempts(
         self,
         collections: T_collections,
@@ -539,7 +932,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         )
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def get_latest_attempt(self, collections: T_collections, rollout_id: str) -> Optional[Attempt]:
         """Retrieves the latest attempt for a given rollout ID.
 
@@ -548,7 +941,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         return await self._get_latest_attempt_unlocked(collections, rollout_id)
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def query_resources(
         self,
         collections: T_collections,
@@ -630,7 +1023,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         return update
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def get_resources_by_id(self, collections: T_collections, resources_id: str) -> Optional[ResourcesUpdate]:
         """Retrieves a specific version of named resources by its ID.
 
@@ -639,7 +1032,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         return await collections.resources.get({"resources_id": {"exact": resources_id}})
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def get_latest_resources(self, collections: T_collections) -> Optional[ResourcesUpdate]:
         """Retrieves the latest version of named resources.
 
@@ -652,13 +1045,20 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
 
     async def _issue_span_sequence_id_unlocked(self, collections: T_collections, rollout_id: str) -> int:
         """Issue a new span sequence ID for a given rollout."""
-        sequence_id = await collections.span_sequence_ids.get(rollout_id)
-        if sequence_id is None:
-            sequence_id = 1
-        else:
-            sequence_id += 1
-        await collections.span_sequence_ids.set(rollout_id, sequence_id)
-        return sequence_id
+        sequence_ids = await self._issue_span_sequence_ids_unlocked(collections, rollout_id, 1)
+        return sequence_ids[0]
+
+    async def _issue_span_sequence_ids_unlocked(
+        self, collections: T_collections, rollout_id: str, count: int
+    ) -> List[int]:
+        """Issue `count` consecutive span sequence IDs for a given rollout with one counter update."""
+        last_sequence_id = await collections.span_sequence_ids.get(rollout_id)
+        if last_sequence_id is None:
+            last_sequence_id = 0
+        if count <= 0:
+            return []
+        await collections.span_sequence_ids.set(rollout_id, last_sequence_id + count)
+        return list(range(last_sequence_id + 1, last_sequence_id + count + 1))
 
     async def _sync_span_sequence_id_unlocked(
         self, collections: T_collections, rollout_id: str, sequence_id: int
@@ -679,6 +1079,16 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         """
         return await self._issue_span_sequence_id_unlocked(collections, rollout_id)
 
+    @_with_collections_execute
+    async def get_next_span_sequence_ids(
+        self, collections: T_collections, rollout_id: str, attempt_id: str, count: int
+    ) -> List[int]:
+        """Reserve `count` consecutive span sequence IDs with one counter update.
+
+        See [`LightningStore.get_next_span_sequence_ids()`][agentlightning.LightningStore.get_next_span_sequence_ids] for semantics.
+        """
+        return await self._issue_span_sequence_ids_unlocked(collections, rollout_id, count)
+
     @_with_collections_execute
     async def add_span(self, collections: T_collections, span: Span) -> Span:
         """Persist a pre-converted span.
@@ -716,53 +1126,150 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         await self._add_span_unlocked(collections, span)
         return span
 
+    @_with_collections_execute
+    async def add_spans(self, collections: T_collections, spans: Sequence[Span]) -> Sequence[Span]:
+        """Persist a batch of pre-converted spans under one lock or transaction.
+
+        See [`LightningStore.add_spans()`][agentlightning.LightningStore.add_spans] for semantics.
+        """
+        # Sync each rollout's counter once with the largest incoming sequence ID.
+        max_sequence_ids: Dict[str, int] = {}
+        for span in spans:
+            max_sequence_ids[span.rollout_id] = max(max_sequence_ids.get(span.rollout_id, 0), span.sequence_id)
+        for rollout_id, sequence_id in max_sequence_ids.items():
+            await self._sync_span_sequence_id_unlocked(collections, rollout_id, sequence_id)
+
+        await self._add_spans_unlocked(collections, spans)
+        return list(spans)
+
+    @_with_collections_execute
+    async def add_otel_spans(
+        self,
+        collections: T_collections,
+        rollout_id: str,
+        attempt_id: str,
+        readable_spans: Sequence[ReadableSpan],
+        sequence_id: int | None = None,
+    ) -> Sequence[Span]:
+        """Add a batch of opentelemetry spans to the store.
+
+        See [`LightningStore.add_otel_spans()`][agentlightning.LightningStore.add_otel_spans] for semantics.
+        """
+        if sequence_id is None:
+            sequence_ids = await self._issue_span_sequence_ids_unlocked(collections, rollout_id, len(readable_spans))
+        else:
+            await self._sync_span_sequence_id_unlocked(collections, rollout_id, sequence_id)
+            sequence_ids = [sequence_id] * len(readable_spans)
+
+        spans = [
+            Span.from_opentelemetry(
+                readable_span, rollout_id=rollout_id, attempt_id=attempt_id, sequence_id=span_sequence_id
+            )
+            for readable_span, span_sequence_id in zip(readable_spans, sequence_ids)
+        ]
+        await self._add_spans_unlocked(collections, spans)
+        return spans
+
     async def _add_span_unlocked(self, collections: T_collections, span: Span) -> Span:
-        rollout = await collections.rollouts.get({"rollout_id": {"exact": span.rollout_id}})
-        if not rollout:
-            raise ValueError(f"Rollout {span.rollout_id} not found")
-        current_attempt = await collections.attempts.get(
-            filter={"rollout_id": {"exact": span.rollout_id}, "attempt_id": {"exact": span.attempt_id}},
-        )
-        latest_attempt = await collections.attempts.get(
-            filter={"rollout_id": {"exact": span.rollout_id}},
-            sort={"name": "sequence_id", "order": "desc"},
-        )
-        if not current_attempt:
-            raise ValueError(f"Attempt {span.attempt_id} not found for rollout {span.rollout_id}")
-        if not latest_attempt:
-            raise ValueError(f"No attempts found for rollout {span.rollout_id}")
+        await self._add_spans_unlocked(collections, [span])
+        return span
 
-        try:
-            await collections.spans.insert([span])
-        except ValueError as e:
-            if "already exists" in str(e):
+    async def _add_spans_unlocked(self, collections: T_collections, spans: Sequence[Span]) -> List[Span]:
+        """Validate, insert, and heartbeat a batch of spans.
+
+        Every rollout and attempt is looked up once per batch, and every touched attempt/rollout
+        is written back at most once.
+
+        Returns:
+            The spans that were actually inserted (duplicates are skipped).
+        """
+        if not spans:
+            return []
+
+        # Resolve and validate all the referenced rollouts and attempts before writing anything.
+        rollouts: Dict[str, Rollout] = {}
+        latest_attempts: Dict[str, Attempt] = {}
+        current_attempts: Dict[Tuple[str, str], Attempt] = {}
+        for span in spans:
+            if span.rollout_id not in rollouts:
+                rollout = await collections.rollouts.get({"rollout_id": {"exact": span.rollout_id}})
+                if not rollout:
+                    raise ValueError(f"Rollout {span.rollout_id} not found")
+                rollouts[span.rollout_id] = rollout
+            if span.rollout_id not in latest_attempts:
+                latest_attempt = await self._get_latest_attempt_unlocked(collections, span.rollout_id)
+                if not latest_attempt:
+                    raise ValueError(f"No attempts found for rollout {span.rollout_id}")
+                latest_attempts[span.rollout_id] = latest_attempt
+            attempt_key = (span.rollout_id, span.attempt_id)
+            if attempt_key not in current_attempts:
+                if span.attempt_id == latest_attempts[span.rollout_id].attempt_id:
+                    # Spans almost always belong to the latest attempt; skip the second lookup.
+                    current_attempt = latest_attempts[span.rollout_id]
+                else:
+                    current_attempt = await collections.attempts.get(
+                        filter={"rollout_id": {"exact": span.rollout_id}, "attempt_id": {"exact": span.attempt_id}},
+                    )
+                if not current_attempt:
+                    raise ValueError(f"Attempt {span.attempt_id} not found for rollout {span.rollout_id}")
+                current_attempts[attempt_key] = current_attempt
+
+        # Filter out the duplicates, both against the store and within the batch itself.
+        span_ids_by_attempt: Dict[Tuple[str, str], List[str]] = {}
+        for span in spans:
+            span_ids_by_attempt.setdefault((span.rollout_id, span.attempt_id), []).append(span.span_id)
+        seen: Set[Tuple[str, str, str]] = set()
+        for (rollout_id, attempt_id), span_ids in span_ids_by_attempt.items():
+            existing = await collections.spans.query(
+                filter={
+                    "rollout_id": {"exact": rollout_id},
+                    "attempt_id": {"exact": attempt_id},
+                    "span_id": {"within": span_ids},
+                }
+            )
+            seen.update((rollout_id, attempt_id, span.span_id) for span in existing.items)
+
+        new_spans: List[Span] = []
+        for span in spans:
+            span_key = (span.rollout_id, span.attempt_id, span.span_id)
+            if span_key in seen:
                 # This is a duplicate span, we warn it
                 logger.error(
                     f"Duplicated span added for rollout={span.rollout_id}, attempt={span.attempt_id}, span={span.span_id}. Skipping."
                 )
-                return span
-            raise
-
-        # Update attempt heartbeat and ensure persistence
-        current_attempt.last_heartbeat_time = time.time()
-        if current_attempt.status in ["preparing", "unresponsive"]:
-            current_attempt.status = "running"
-        await collections.attempts.update([current_attempt])
+                continue
+            seen.add(span_key)
+            new_spans.append(span)
+
+        if not new_spans:
+            return []
+        await collections.spans.insert(new_spans)
+
+        # Update attempt heartbeats and ensure persistence, once per touched attempt.
+        touched_attempt_keys = list(dict.fromkeys((span.rollout_id, span.attempt_id) for span in new_spans))
+        heartbeat_time = time.time()
+        updated_attempts: List[Attempt] = []
+        for attempt_key in touched_attempt_keys:
+            current_attempt = current_attempts[attempt_key]
+            current_attempt.last_heartbeat_time = heartbeat_time
+            if current_attempt.status in ["preparing", "unresponsive"]:
+                current_attempt.status = "running"
+            updated_attempts.append(current_attempt)
+        await collections.attempts.update(updated_attempts)
 
         # If the status has already timed out or failed, do not change it (but heartbeat is still recorded)
 
         # Update rollout status if it's the latest attempt
-        if current_attempt.attempt_id == latest_attempt.attempt_id:
-            if rollout.status == "preparing":
-                rollout.status = "running"
-                await collections.rollouts.update([rollout])
-                await self.on_rollout_update(rollout)
-            elif rollout.status in ["queuing", "requeuing"]:
+        for rollout_id, attempt_id in touched_attempt_keys:
+            rollout = rollouts[rollout_id]
+            if attempt_id != latest_attempts[rollout_id].attempt_id:
+                continue
+            if rollout.status in ["preparing", "queuing", "requeuing"]:
                 rollout.status = "running"
                 await collections.rollouts.update([rollout])
                 await self.on_rollout_update(rollout)
 
-        return span
+        return new_spans
 
     @_healthcheck_wrapper
     async def wait_for_rollouts(self, *, rollout_ids: List[str], timeout: Optional[float] = None) -> List[Rollout]:
@@ -771,60 +1278,75 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
 
         This method does not change the state of the store.
 
+        Waiters subscribe to the rollout notifier fed by
+        [`on_rollout_update()`][agentlightning.store.collection_based.CollectionBasedLightningStore.on_rollout_update],
+        so they wake up as soon as a rollout finishes instead of polling the collections.
+
         See [`LightningStore.wait_for_rollouts()`][agentlightning.LightningStore.wait_for_rollouts] for semantics.
         """
-        # Wait for all rollouts concurrently
-        rollouts = await asyncio.gather(
-            *[self.wait_for_rollout(rid, timeout) for rid in rollout_ids], return_exceptions=True
-        )
+        if not rollout_ids:
+            return []
 
-        for rollout_id, rollout in zip(rollout_ids, rollouts):
-            if isinstance(rollout, Exception):
-                logger.error(f"Error waiting for rollout {rollout_id}: {rollout}")
+        deadline = time.time() + timeout if timeout is not None else None
+        finished: Dict[str, Rollout] = {}
 
-        # Filter out the exceptions
-        return [rollout for rollout in rollouts if isinstance(rollout, Rollout)]
+        # Subscribe before the first read so that no completion between the read and the wait is missed.
+        waiter = self._rollout_notifier.subscribe(rollout_ids)
+        try:
+            to_check: Set[str] = set(rollout_ids)
+            while True:
+                if to_check:
+                    # Not locked on purpose.
+                    rollouts = await self.collections.rollouts.query(
+                        filter={"rollout_id": {"within": list(to_check)}},
+                    )
+                    found = {rollout.rollout_id: rollout for rollout in rollouts.items}
+                    settled: List[str] = []
+                    for rollout_id in to_check:
+                        rollout = found.get(rollout_id)
+                        if rollout is None:
+                            # Rollout does not exist, stop waiting for it
+                            settled.append(rollout_id)
+                        elif is_finished(rollout):
+                            finished[rollout_id] = rollout
+                            settled.append(rollout_id)
+                    waiter.discard(settled)
+                    if not waiter.keys:
+                        break
+
+                if deadline is None:
+                    # Wake up periodically to pick up completions the notifier cannot see.
+                    wait_time = self._wait_recheck_interval
+                else:
+                    wait_time = deadline - time.time()
+                    if wait_time <= 0:
+                        break
+                    if self._wait_recheck_interval is not None:
+                        wait_time = min(wait_time, self._wait_recheck_interval)
+
+                notified = await waiter.wait(wait_time)
+                if notified:
+                    to_check = notified & waiter.keys
+                elif self._wait_recheck_interval is not None:
+                    to_check = set(waiter.keys)
+                else:
+                    # Deadline reached
+                    break
+        finally:
+            waiter.close()
+
+        return [finished[rollout_id] for rollout_id in rollout_ids if rollout_id in finished]
 
     async def wait_for_rollout(self, rollout_id: str, timeout: Optional[float] = None) -> Optional[Rollout]:
         """Wait for a specific rollout to complete with a timeout.
 
-        Subclass may use advanced mechanisms like events to accelerate this.
-
         Returns the completed rollout, or None if timeout is reached.
         """
-        # First check if already completed
-        # Not locked on purpose.
-        rollout = await self.collections.rollouts.get({"rollout_id": {"exact": rollout_id}})
-        if rollout is None:
-            # Rollout does not exist, return immediately
-            return None
-
-        if is_finished(rollout):
-            # Rollout is already finished, return immediately
-            return rollout
-
-        # No timeout, return immediately
-        if timeout is not None and timeout <= 0:
-            return None
-
-        start_time = time.time()
-        deadline = start_time + timeout if timeout is not None else None
-
-        # If not completed, wait for completion
-        while deadline is None or time.time() < deadline:
-            # Poll every 10 seconds by default
-            rest_time = max(0.01, min(deadline - time.time(), 10.0)) if deadline is not None else 10.0
-            await asyncio.sleep(rest_time)
-            # Not locked on purpose.
-            rollout = await self.collections.rollouts.get({"rollout_id": {"exact": rollout_id}})
-            # check if rollout is finished
-            if rollout and is_finished(rollout):
-                return rollout
-
-        return None
+        rollouts = await self.wait_for_rollouts(rollout_ids=[rollout_id], timeout=timeout)
+        return rollouts[0] if rollouts else None
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def query_spans(
         self,
         collections: T_collections,
@@ -844,11 +1366,16 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         offset: int = 0,
         sort_by: Optional[str] = "sequence_id",
         sort_order: Literal["asc", "desc"] = "asc",
+        fields: Optional[Sequence[str]] = None,
+        attributes_prefix: Optional[Sequence[str]] = None,
     ) -> PaginatedResult[Span]:
         """
         Query and retrieve spans associated with a specific rollout ID.
         Returns an empty list if no spans are found.
 
+        The projection (`fields` and `attributes_prefix`) is passed to the span collection,
+        which loads only that part of the spans when the backend supports it.
+
         See [`LightningStore.query_spans()`][agentlightning.LightningStore.query_spans] for semantics.
         """
 
@@ -856,10 +1383,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         if attempt_id is None:
             resolved_attempt_id = None
         elif attempt_id == "latest":
-            latest_attempt = await collections.attempts.get(
-                filter={"rollout_id": {"exact": rollout_id}},
-                sort={"name": "sequence_id", "order": "desc"},
-            )
+            latest_attempt = await self._get_latest_attempt_unlocked(collections, rollout_id)
             if not latest_attempt:
                 logger.debug(f"No attempts found for rollout {rollout_id} when querying latest spans")
                 return PaginatedResult(items=[], limit=limit, offset=offset, total=0)
@@ -894,6 +1418,62 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
             sort={"name": sort_by, "order": sort_order} if sort_by else None,
             limit=limit,
             offset=offset,
+            projection=_span_projection(fields, attributes_prefix),
+        )
+
+    async def iter_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str | Literal["latest"] | None = None,
+        *,
+        after_sequence_id: Optional[int] = None,
+        after_span_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Span]:
+        """Stream the spans of a rollout with keyset pagination on `(sequence_id, span_id)`.
+
+        Every batch is a separate read, so the iteration does not keep the collections busy in between.
+
+        See [`LightningStore.iter_spans()`][agentlightning.LightningStore.iter_spans] for semantics.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        batch_size = min(batch_size, MAX_SPAN_BATCH_SIZE)
+        if after_span_id is not None and after_sequence_id is None:
+            raise ValueError("after_span_id requires after_sequence_id")
+        if attempt_id == "latest":
+            latest_attempt = await self.get_latest_attempt(rollout_id)
+            if latest_attempt is None:
+                return
+            attempt_id = latest_attempt.attempt_id
+
+        cursor: Optional[List[Any]] = None
+        if after_sequence_id is not None:
+            cursor = [after_sequence_id] if after_span_id is None else [after_sequence_id, after_span_id]
+        while True:
+            batch = await self._query_spans_after(rollout_id, attempt_id, cursor, batch_size)
+            for span in batch:
+                yield span
+            if len(batch) < batch_size:
+                return
+            cursor = [batch[-1].sequence_id, batch[-1].span_id]
+
+    @_healthcheck_wrapper
+    @_with_collections_read
+    async def _query_spans_after(
+        self,
+        collections: T_collections,
+        rollout_id: str,
+        attempt_id: Optional[str],
+        after: Optional[List[Any]],
+        limit: int,
+    ) -> Sequence[Span]:
+        """One batch of [`iter_spans()`][agentlightning.store.CollectionBasedLightningStore.iter_spans]."""
+        filter_options: Dict[str, FilterField] = {"rollout_id": {"exact": rollout_id}}
+        if attempt_id is not None:
+            filter_options["attempt_id"] = {"exact": attempt_id}
+        return await collections.spans.query_after(
+            ["sequence_id", "span_id"], filter=filter_options, after=after, limit=limit
         )
 
     @_healthcheck_wrapper
@@ -988,7 +1568,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         # If requeuing, add back to queue.
         # Check whether the rollout is already in queue.
         elif is_queuing(rollout) and not await collections.rollout_queue.has(rollout.rollout_id):
-            await collections.rollout_queue.enqueue([rollout.rollout_id])
+            await self._enqueue_rollout_ids_unlocked(collections, [rollout.rollout_id])
 
         # We also don't need to remove non-queuing rollouts from the queue, for similar reasons.
 
@@ -1015,10 +1595,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         if not rollout:
             raise ValueError(f"Rollout {rollout_id} not found")
 
-        latest_attempt = await collections.attempts.get(
-            {"rollout_id": {"exact": rollout_id}},
-            sort={"name": "sequence_id", "order": "desc"},
-        )
+        latest_attempt = await self._get_latest_attempt_unlocked(collections, rollout_id)
         if not latest_attempt:
             raise ValueError(f"No attempts found for rollout {rollout_id}")
 
@@ -1072,7 +1649,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         return attempt
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def query_workers(
         self,
         collections: T_collections,
@@ -1101,7 +1678,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         )
 
     @_healthcheck_wrapper
-    @_with_collections_execute
+    @_with_collections_read
     async def get_worker_by_id(self, collections: T_collections, worker_id: str) -> Optional[Worker]:
         return await collections.workers.get({"worker_id": {"exact": worker_id}})
 
@@ -1126,9 +1703,14 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
     async def on_rollout_update(self, rollout: Rollout) -> None:
         """Callback for subclasses to implement specific logic when a rollout changes.
 
+        The default implementation wakes up the waiters of
+        [`wait_for_rollouts()`][agentlightning.store.collection_based.CollectionBasedLightningStore.wait_for_rollouts]
+        when the rollout finishes. Subclasses overriding this method should call `super()`.
+
         Subclass should not lock this method with `collections.atomic()` because the caller will already hold the lock.
         """
-        pass
+        if is_finished(rollout):
+            _notify_after_commit(self._rollout_notifier, rollout.rollout_id)
 
     async def get_running_rollouts(self, collections: T_collections) -> List[AttemptedRollout]:
         """Get all running rollouts.
@@ -1141,10 +1723,7 @@ class CollectionBasedLightningStore(LightningStore, Generic[T_collections]):
         rollouts = await collections.rollouts.query(filter={"status": {"within": ["preparing", "running"]}})
 
         for rollout in rollouts.items:
-            latest_attempt = await collections.attempts.get(
-                filter={"rollout_id": {"exact": rollout.rollout_id}},
-                sort={"name": "sequence_id", "order": "desc"},
-            )
+            latest_attempt = await self._get_latest_attempt_unlocked(collections, rollout.rollout_id)
             if not latest_attempt:
                 # The rollout is running but has no attempts, this should not happen
                 logger.error(f"Rollout {rollout.rollout_id} is running but has no attempts")
@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-import asyncio
+import functools
 import logging
 import sys
-import threading
 from collections.abc import Iterable
 from collections.abc import Mapping as MappingABC
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
     Counter,
     Dict,
@@ -17,7 +17,9 @@ from typing import (
     Literal,
     Mapping,
     Optional,
+    Sequence,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -25,11 +27,21 @@ from typing import (
 
 from pydantic import BaseModel
 
-from agentlightning.types import AttemptedRollout, PaginatedResult, Rollout, Span
+from agentlightning.types import (
+    AttemptedRollout,
+    Event,
+    Link,
+    OtelResource,
+    PaginatedResult,
+    Rollout,
+    Span,
+    SpanContext,
+    TraceStatus,
+)
 
-from .base import UNSET, LightningStoreCapabilities, Unset, is_finished, is_running
-from .collection import InMemoryLightningCollections
-from .collection_based import CollectionBasedLightningStore
+from .base import UNSET, LightningStoreCapabilities, Unset, is_running
+from .collection import CollectionJournal, InMemoryLightningCollections, SpanSpill
+from .collection_based import DEFAULT_WATCHDOG_INTERVAL, CollectionBasedLightningStore
 
 T_callable = TypeVar("T_callable", bound=Callable[..., Any])
 
@@ -51,6 +63,87 @@ def estimate_model_size(obj: Any) -> int:
     return sys.getsizeof(cast(object, obj))
 
 
+_STR_BYTES = sys.getsizeof("")
+_SCALAR_BYTES = sys.getsizeof(0.0)
+_SEQUENCE_BYTES = sys.getsizeof([])
+_POINTER_BYTES = 8
+# Amortized cost of one extra entry in a dict: the key/value pointers, the hash and the spare slots.
+_DICT_ENTRY_BYTES = 3 * _POINTER_BYTES * 3 // 2
+
+
+def _estimate_attribute_value_size(value: Any) -> int:
+    if isinstance(value, str):
+        return _STR_BYTES + len(value)
+    if isinstance(value, (list, tuple)):
+        items = cast(Sequence[Any], value)
+        size = _SEQUENCE_BYTES + _POINTER_BYTES * len(items)
+        for item in items:
+            size += _STR_BYTES + len(item) if isinstance(item, str) else _SCALAR_BYTES
+        return size
+    return _SCALAR_BYTES
+
+
+def _estimate_attributes_size(attributes: Optional[Mapping[str, Any]]) -> int:
+    if not attributes:
+        return 0
+    size = 0
+    for key, value in attributes.items():
+        size += _DICT_ENTRY_BYTES + _STR_BYTES + len(key) + _estimate_attribute_value_size(value)
+    return size
+
+
+@functools.lru_cache(maxsize=None)
+def _empty_span_sizes() -> Tuple[int, int, int]:
+    """Sizes of a span, an event and a link with empty strings and no attributes, measured once."""
+    context = SpanContext(trace_id="", span_id="", is_remote=False, trace_state={})
+    span = Span(
+        rollout_id="",
+        attempt_id="",
+        sequence_id=0,
+        trace_id="",
+        span_id="",
+        parent_id=None,
+        name="",
+        status=TraceStatus(status_code="UNSET"),
+        attributes={},
+        events=[],
+        links=[],
+        start_time=0.0,
+        end_time=0.0,
+        context=context,
+        parent=None,
+        resource=OtelResource(attributes={}, schema_url=""),
+    )
+    event = Event(name="", attributes={}, timestamp=0.0)
+    link = Link(context=context, attributes={})
+    return estimate_model_size(span), estimate_model_size(event), estimate_model_size(link)
+
+
+def estimate_span_size(span: Span) -> int:
+    """Fast size estimate of a span in bytes, without walking the Pydantic model tree.
+
+    The fixed structure of the span is measured once with
+    [`estimate_model_size`][agentlightning.store.memory.estimate_model_size]; only the variable parts
+    (identifiers, attribute keys and values, events and links) are added up per span. The result
+    tracks `estimate_model_size` closely for OpenTelemetry-shaped spans; fields outside the
+    Span schema (`extra="allow"`) are not counted.
+    """
+    span_bytes, event_bytes, link_bytes = _empty_span_sizes()
+    size = span_bytes + len(span.rollout_id) + len(span.attempt_id) + len(span.name)
+    size += 2 * (len(span.trace_id) + len(span.span_id))  # once on the span, once on its context
+    if span.parent_id is not None:
+        size += _STR_BYTES + len(span.parent_id)
+    if span.status.description:
+        size += len(span.status.description)
+    size += _estimate_attributes_size(span.attributes)
+    size += _estimate_attributes_size(span.resource.attributes)
+    for event in span.events:
+        size += _POINTER_BYTES + event_bytes + len(event.name) + _estimate_attributes_size(event.attributes)
+    for link in span.links:
+        size += _POINTER_BYTES + link_bytes + _estimate_attributes_size(link.attributes)
+    return size
+
+
 def _detect_total_memory_bytes() -> int:
     """Best-effort detection of the total available system memory in bytes."""
 
@@ -75,7 +168,23 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
         safe_memory_threshold: The threshold for safe memory usage in bytes.
             By default, it's 80% of the eviction threshold.
         span_size_estimator: A function to estimate the size of a span in bytes.
-            By default, it's a simple size estimator that uses sys.getsizeof.
+            By default, it's [`estimate_span_size`][agentlightning.store.memory.estimate_span_size],
+            which only measures the variable parts of the span. Pass
+            [`estimate_model_size`][agentlightning.store.memory.estimate_model_size] for a full (slower) walk.
+        watchdog_interval: Seconds between two healthcheck sweeps of the background watchdog.
+            Set to `None` to run the healthcheck before every store call instead.
+        span_spill_dir: Directory to spill evicted spans to. When set, evicted spans are written to
+            append-only segment files under it and read back transparently by `query_spans`,
+            instead of being dropped. The files are removed when the store is garbage-collected.
+        span_spill_compression: Whether to zlib-compress the spilled spans.
+        journal_dir: Directory of a write-ahead journal of the store. When set, every mutation is appended
+            to the journal in the background and the collections are periodically snapshotted, so that a store
+            created on the same directory after a restart recovers the rollouts, attempts, spans, resources,
+            workers and queue. Spans evicted from memory (spilled or not) are not recovered: `query_spans`
+            raises for their rollouts after the restart.
+        journal_snapshot_interval: Minimum seconds between two snapshots of the journal.
+            Set to `None` to never snapshot (the journal then grows without bound).
+        journal_fsync: Whether to fsync the journal after every batched write.
     """
 
     def __init__(
@@ -84,8 +193,23 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
         eviction_memory_threshold: float | int | None = None,
         safe_memory_threshold: float | int | None = None,
         span_size_estimator: Callable[[Span], int] | None = None,
+        watchdog_interval: float | None = DEFAULT_WATCHDOG_INTERVAL,
+        span_spill_dir: str | None = None,
+        span_spill_compression: bool = False,
+        journal_dir: str | None = None,
+        journal_snapshot_interval: float | None = 300.0,
+        journal_fsync: bool = False,
     ):
-        super().__init__(collections=InMemoryLightningCollections())
+        span_spill = SpanSpill(span_spill_dir, compress=span_spill_compression) if span_spill_dir is not None else None
+        journal = (
+            CollectionJournal(journal_dir, snapshot_interval=journal_snapshot_interval, fsync=journal_fsync)
+            if journal_dir is not None
+            else None
+        )
+        super().__init__(
+            collections=InMemoryLightningCollections(span_spill=span_spill, journal=journal),
+            watchdog_interval=watchdog_interval,
+        )
 
         self._start_time_by_rollout: Dict[str, float] = {}
         self._span_bytes_by_rollout: Dict[str, int] = Counter()
@@ -119,15 +243,15 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
             raise ValueError("safe_memory_threshold must be smaller than eviction_memory_threshold")
         self._custom_span_size_estimator = span_size_estimator
 
-        # Completion tracking for wait_for_rollouts (cross-loop safe)
-        self._completion_events: Dict[str, threading.Event] = {}
-
         # Running rollouts cache, including preparing and running rollouts
         self._running_rollout_ids: Set[str] = set()
 
         # Caches the latest resources ID.
         self._latest_resources_id: Union[str, None, Unset] = UNSET
 
+        if journal is not None:
+            self._rebuild_caches_from_collections()
+
     @property
     def capabilities(self) -> LightningStoreCapabilities:
         """Return the capabilities of the store."""
@@ -138,42 +262,22 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
             otlp_traces=False,
         )
 
-    async def wait_for_rollout(self, rollout_id: str, timeout: Optional[float] = None) -> Optional[Rollout]:
-        """Wait for a specific rollout to complete with a timeout."""
-        async with self.collections.atomic() as collections:
-            rollout = await collections.rollouts.get({"rollout_id": {"exact": rollout_id}})
-            if rollout and is_finished(rollout):
-                return rollout
-
-        if timeout is not None and timeout <= 0:
-            return None
-
-        # If not completed and we have an event, wait for completion
-        if rollout_id in self._completion_events:
-            evt = self._completion_events[rollout_id]
-
-            # Wait for the event with proper timeout handling
-            # evt.wait() returns True if event was set, False if timeout occurred
-            if timeout is None:
-                # Wait indefinitely by polling with finite timeouts
-                # This allows threads to exit cleanly on shutdown
-                while True:
-                    result = await asyncio.to_thread(evt.wait, 10.0)  # Poll every 10 seconds
-                    if result:  # Event was set
-                        break
-                    # Loop and check again (continues indefinitely since timeout=None)
-            else:
-                # Wait with the specified timeout
-                result = await asyncio.to_thread(evt.wait, timeout)
-
-            # If event was set (not timeout), check if rollout is finished
-            if result:
-                async with self.collections.atomic() as collections:
-                    rollout = await collections.rollouts.get({"rollout_id": {"exact": rollout_id}})
-                    if rollout and is_finished(rollout):
-                        return rollout
+    def _rebuild_caches_from_collections(self) -> None:
+        """Recompute the caches derived from the collections, after they are restored from the journal."""
+        collections = self.collections
+        for rollout in collections.rollouts._iter_items():
+            if is_running(rollout):
+                self._running_rollout_ids.add(rollout.rollout_id)
+            self._start_time_by_rollout[rollout.rollout_id] = rollout.start_time
+        self._account_span_sizes(list(collections.spans._iter_items()))
+        # Spans dropped before the restart are not restored: keep refusing to serve them partially.
+        self._evicted_rollout_span_sets.update(collections.spans.dropped_rollout_ids)
 
-        return None
+    async def close(self) -> None:
+        """Stop the watchdog, then write the pending journal records and stop the journal writer."""
+        await self.stop_watchdog()
+        if self.collections.journal is not None:
+            self.collections.journal.close()
 
     async def on_rollout_update(self, rollout: Rollout) -> None:
         """Update the running rollout ids set when the rollout updates."""
@@ -182,13 +286,7 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
         else:
             self._running_rollout_ids.discard(rollout.rollout_id)
 
-        if is_finished(rollout):
-            self._completion_events.setdefault(rollout.rollout_id, threading.Event())
-            self._completion_events[rollout.rollout_id].set()
-        else:
-            self._completion_events.setdefault(rollout.rollout_id, threading.Event())
-        # Rollout status can never transition from finished to running (unlike attempt)
-        # so we don't need to clear the completion event even in case of retrying.
+        await super().on_rollout_update(rollout)
 
         if rollout.rollout_id not in self._start_time_by_rollout:
             self._start_time_by_rollout[rollout.rollout_id] = rollout.start_time
@@ -198,10 +296,7 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
         rollouts = await collections.rollouts.query(filter={"rollout_id": {"within": list(self._running_rollout_ids)}})
         running_rollouts: List[AttemptedRollout] = []
         for rollout in rollouts.items:
-            latest_attempt = await collections.attempts.get(
-                filter={"rollout_id": {"exact": rollout.rollout_id}},
-                sort={"name": "sequence_id", "order": "desc"},
-            )
+            latest_attempt = await collections.get_latest_attempt(rollout.rollout_id)
             if not latest_attempt:
                 # The rollout is running but has no attempts, this should not happen
                 logger.error(f"Rollout {rollout.rollout_id} is running but has no attempts")
@@ -219,14 +314,25 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
             raise RuntimeError(f"Spans for rollout {rollout_id} have been evicted")
         return await super().query_spans(rollout_id, attempt_id, **kwargs)
 
-    async def _add_span_unlocked(self, collections: InMemoryLightningCollections, span: Span) -> Span:
+    async def iter_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str | Literal["latest"] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Span]:
+        if rollout_id in self._evicted_rollout_span_sets:
+            raise RuntimeError(f"Spans for rollout {rollout_id} have been evicted")
+        async for span in super().iter_spans(rollout_id, attempt_id, **kwargs):
+            yield span
+
+    async def _add_spans_unlocked(self, collections: InMemoryLightningCollections, spans: Sequence[Span]) -> List[Span]:
         """In-memory store needs to maintain the span data in memory, and evict spans when memory is low."""
 
-        await super()._add_span_unlocked(collections, span)
-        self._account_span_size(span)
+        inserted_spans = await super()._add_spans_unlocked(collections, spans)
+        self._account_span_sizes(inserted_spans)
         await self._maybe_evict_spans(collections)
 
-        return span
+        return inserted_spans
 
     async def _get_latest_resources_id(self, collections: InMemoryLightningCollections) -> Optional[str]:
         if isinstance(self._latest_resources_id, Unset):
@@ -267,15 +373,16 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
 
         return resolved
 
-    def _account_span_size(self, span: Span) -> int:
-        if self._custom_span_size_estimator is not None:
-            size = max(int(self._custom_span_size_estimator(span)), 0)
-        else:
-            size = estimate_model_size(span)
-
-        self._span_bytes_by_rollout[span.rollout_id] += size
-        self._total_span_bytes += size
-        return size
+    def _account_span_sizes(self, spans: Sequence[Span]) -> int:
+        """Add the spans to the per-rollout and total byte counters, which eviction maintains in reverse."""
+        estimator = self._custom_span_size_estimator or estimate_span_size
+        batch_bytes = 0
+        for span in spans:
+            size = max(int(estimator(span)), 0)
+            self._span_bytes_by_rollout[span.rollout_id] += size
+            batch_bytes += size
+        self._total_span_bytes += batch_bytes
+        return batch_bytes
 
     async def _maybe_evict_spans(self, collections: InMemoryLightningCollections) -> None:
         if self._total_span_bytes <= self._eviction_threshold_bytes:
@@ -285,8 +392,11 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
             f"Total span bytes: {self._total_span_bytes}, eviction threshold: {self._eviction_threshold_bytes}, "
             f"safe threshold: {self._safe_threshold_bytes}. Evicting spans..."
         )
+        # Only rollouts that still hold spans in memory can free anything.
         candidates: List[tuple[float, str]] = [
-            (start_time, rollout_id) for rollout_id, start_time in self._start_time_by_rollout.items()
+            (self._start_time_by_rollout.get(rollout_id, 0.0), rollout_id)
+            for rollout_id, size in self._span_bytes_by_rollout.items()
+            if size > 0
         ]
         candidates.sort()
 
@@ -305,4 +415,5 @@ class InMemoryLightningStore(CollectionBasedLightningStore[InMemoryLightningColl
         if removed_bytes > 0:
             # There is something removed for real
             self._total_span_bytes = max(self._total_span_bytes - removed_bytes, 0)
-            self._evicted_rollout_span_sets.add(rollout_id)
+            if collections.spans.spill is None:
+                self._evicted_rollout_span_sets.add(rollout_id)
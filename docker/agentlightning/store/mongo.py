@@ -2,26 +2,54 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
+import threading
+import time
 import uuid
 from typing import (
     Any,
+    Awaitable,
     Callable,
+    Dict,
+    List,
+    Literal,
     Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
     TypeVar,
 )
 
-from pymongo import AsyncMongoClient
+from opentelemetry.sdk.trace import ReadableSpan
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.asynchronous.change_stream import AsyncChangeStream
+from pymongo.errors import OperationFailure, PyMongoError
+
+from agentlightning.types import Attempt, Rollout, Span
 
 from .base import LightningStoreCapabilities
-from .collection.mongo import MongoClientPool, MongoLightningCollections
-from .collection_based import CollectionBasedLightningStore
+from .collection.mongo import MongoClientPool, MongoLightningCollections, MongoReadConcernLevel
+from .collection.mongo_codec import MongoPayloadCodec
+from .collection_based import (  # pyright: ignore[reportPrivateUsage]
+    _ROLLOUT_QUEUE_KEY,
+    DEFAULT_WATCHDOG_INTERVAL,
+    CollectionBasedLightningStore,
+)
+from .notifier import LoopAwareNotifier
 
 T_callable = TypeVar("T_callable", bound=Callable[..., Any])
+R = TypeVar("R")
 
 logger = logging.getLogger(__name__)
 
+MongoSpanWriteMode = Literal["transaction", "fast"]
+
+_RESUME_FAILURE_CODES = (260, 280, 286)
+"""InvalidResumeToken, ChangeStreamFatalError and ChangeStreamHistoryLost: the stream cannot resume from its token."""
+
 
 def _generate_partition_id() -> str:
     return "pt-" + hashlib.sha1(uuid.uuid4().bytes).hexdigest()[:12]
@@ -32,11 +60,31 @@ class MongoLightningStore(CollectionBasedLightningStore[MongoLightningCollection
     MongoDB implementation of LightningStore using MongoDB collections.
     Data is persistent and can be shared between multiple processes.
 
+    Rollouts finished and queued by other processes are observed via a change stream bus
+    (see [`MongoChangeStreamBus`][agentlightning.store.mongo.MongoChangeStreamBus]), started by the first
+    [`wait_for_rollouts()`][agentlightning.LightningStore.wait_for_rollouts] or blocking dequeue.
+    Deployments without change streams (e.g., a standalone server) fall back to periodic re-checks.
+
     Args:
         client: The MongoDB client. Could be a string URI or an instance of AsyncMongoClient.
         database: The MongoDB database. Could be a string name or an instance of AsyncDatabase.
             You must provide at least one of client or database.
         partition_id: The partition id. Useful when sharing the database among multiple Agent-lightning trainers.
+        watchdog_interval: Seconds between two healthcheck sweeps of the background watchdog.
+            Set to `None` to run the healthcheck before every store call instead.
+        read_concern: Read concern of the query methods, which run outside of a transaction.
+            Use `"majority"` to only read data that cannot be rolled back, or `"snapshot"` to read
+            everything a query method needs from one snapshot.
+        span_write_mode: How spans are written. `"transaction"` writes each call in one multi-document
+            transaction. `"fast"` skips the transaction: the spans are inserted idempotently (the unique
+            index skips duplicates), and the attempt heartbeat/status and the rollout status are each
+            changed with a single atomic `find_one_and_update`, only for the attempts that got new spans.
+            A failure in between may leave the spans stored without the heartbeat, which the next new span
+            of the attempt records. The other state changes (dequeue, update_attempt, requeue, ...) always
+            use transactions.
+        span_payload_codec: Stores the large span attribute values (e.g., prompts and completions)
+            compressed or in a blob collection. See
+            [`MongoPayloadCodec`][agentlightning.store.collection.mongo_codec.MongoPayloadCodec].
     """
 
     def __init__(
@@ -45,7 +93,14 @@ class MongoLightningStore(CollectionBasedLightningStore[MongoLightningCollection
         client: AsyncMongoClient[Mapping[str, Any]] | str,
         database_name: str | None = None,
         partition_id: str | None = None,
+        watchdog_interval: float | None = DEFAULT_WATCHDOG_INTERVAL,
+        read_concern: MongoReadConcernLevel = "local",
+        span_write_mode: MongoSpanWriteMode = "transaction",
+        span_payload_codec: Optional[MongoPayloadCodec] = None,
     ) -> None:
+        if span_write_mode not in ("transaction", "fast"):
+            raise ValueError(f"Unsupported span write mode: {span_write_mode!r}")
+        self._span_write_mode: MongoSpanWriteMode = span_write_mode
         self._auto_created_client = False
         if isinstance(client, str):
             self._client = AsyncMongoClient[Mapping[str, Any]](client)
@@ -60,9 +115,29 @@ class MongoLightningStore(CollectionBasedLightningStore[MongoLightningCollection
             partition_id = _generate_partition_id()
             logger.info("No partition id provided, generated a new one: %s", partition_id)
 
+        self._partition_id = partition_id
         self._client_pool = MongoClientPool(self._client)
 
-        super().__init__(collections=MongoLightningCollections(self._client_pool, database_name, partition_id))
+        super().__init__(
+            collections=MongoLightningCollections(
+                self._client_pool,
+                database_name,
+                partition_id,
+                read_concern=read_concern,
+                span_payload_codec=span_payload_codec,
+            ),
+            watchdog_interval=watchdog_interval,
+        )
+        self._change_bus = MongoChangeStreamBus(
+            self.collections,
+            partition_id,
+            rollout_notifier=self._rollout_notifier,
+            queue_notifier=self._queue_notifier,
+            queue_key=_ROLLOUT_QUEUE_KEY,
+        )
+
+    # Safety net for updates missed by the change stream (or when change streams are unavailable).
+    _wait_recheck_interval = 10.0
 
     @property
     def capabilities(self) -> LightningStoreCapabilities:
@@ -75,8 +150,389 @@ class MongoLightningStore(CollectionBasedLightningStore[MongoLightningCollection
         )
 
     async def close(self) -> None:
-        """Close the store by closing the client pool."""
+        """Close the store by stopping the watchdog and the change stream bus, and closing the client pool."""
+        await self.stop_watchdog()
+        await self._change_bus.close()
         await self._client_pool.close()
         # If I created the client, I should close it too.
         if self._auto_created_client:
             await self._client.close()
+
+    async def get_next_span_sequence_id(self, rollout_id: str, attempt_id: str) -> int:
+        """Issue the next span sequence ID, with one atomic increment in the `"fast"` span write mode."""
+        if self._span_write_mode == "transaction":
+            return await super().get_next_span_sequence_id(rollout_id, attempt_id)
+        return await self.collections.span_sequence_ids.increment(rollout_id, 1)
+
+    async def get_next_span_sequence_ids(self, rollout_id: str, attempt_id: str, count: int) -> List[int]:
+        """Reserve a block of span sequence IDs, with one atomic increment in the `"fast"` span write mode."""
+        if self._span_write_mode == "transaction":
+            return await super().get_next_span_sequence_ids(rollout_id, attempt_id, count)
+        if count <= 0:
+            return []
+        last_sequence_id = await self.collections.span_sequence_ids.increment(rollout_id, count)
+        return list(range(last_sequence_id - count + 1, last_sequence_id + 1))
+
+    async def add_span(self, span: Span) -> Span:
+        """Persist a pre-converted span, honoring the span write mode."""
+        if self._span_write_mode == "transaction":
+            return await super().add_span(span)
+        await self._add_spans_fast([span])
+        return span
+
+    async def add_spans(self, spans: Sequence[Span]) -> Sequence[Span]:
+        """Persist a batch of pre-converted spans, honoring the span write mode."""
+        if self._span_write_mode == "transaction":
+            return await super().add_spans(spans)
+        await self._add_spans_fast(spans)
+        return list(spans)
+
+    async def add_otel_span(
+        self, rollout_id: str, attempt_id: str, readable_span: ReadableSpan, sequence_id: int | None = None
+    ) -> Span:
+        """Add an opentelemetry span to the store, honoring the span write mode."""
+        if self._span_write_mode == "transaction":
+            return await super().add_otel_span(rollout_id, attempt_id, readable_span, sequence_id)
+        if sequence_id is None:
+            sequence_id = await self.collections.span_sequence_ids.increment(rollout_id, 1)
+        span = Span.from_opentelemetry(
+            readable_span, rollout_id=rollout_id, attempt_id=attempt_id, sequence_id=sequence_id
+        )
+        await self._add_spans_fast([span])
+        return span
+
+    async def add_otel_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str,
+        readable_spans: Sequence[ReadableSpan],
+        sequence_id: int | None = None,
+    ) -> Sequence[Span]:
+        """Add a batch of opentelemetry spans to the store, honoring the span write mode."""
+        if self._span_write_mode == "transaction":
+            return await super().add_otel_spans(rollout_id, attempt_id, readable_spans, sequence_id)
+        if not readable_spans:
+            return []
+        if sequence_id is None:
+            # Reserve the whole range with one atomic increment.
+            last_sequence_id = await self.collections.span_sequence_ids.increment(rollout_id, len(readable_spans))
+            sequence_ids = list(range(last_sequence_id - len(readable_spans) + 1, last_sequence_id + 1))
+        else:
+            sequence_ids = [sequence_id] * len(readable_spans)
+        spans = [
+            Span.from_opentelemetry(
+                readable_span, rollout_id=rollout_id, attempt_id=attempt_id, sequence_id=span_sequence_id
+            )
+            for readable_span, span_sequence_id in zip(readable_spans, sequence_ids)
+        ]
+        await self._add_spans_fast(spans)
+        return spans
+
+    async def _add_spans_fast(self, spans: Sequence[Span]) -> List[Span]:
+        """Write spans without a multi-document transaction. See `span_write_mode`.
+
+        Returns:
+            The spans that were actually inserted (duplicates are skipped).
+        """
+        if not spans:
+            return []
+
+        # Validate that every referenced attempt exists before writing anything.
+        touched_attempt_keys = list(dict.fromkeys((span.rollout_id, span.attempt_id) for span in spans))
+        existing_attempt_keys = await self._existing_attempt_keys(touched_attempt_keys)
+        for rollout_id, attempt_id in touched_attempt_keys:
+            if (rollout_id, attempt_id) not in existing_attempt_keys:
+                if await self.collections.rollouts.get({"rollout_id": {"exact": rollout_id}}) is None:
+                    raise ValueError(f"Rollout {rollout_id} not found")
+                raise ValueError(f"Attempt {attempt_id} not found for rollout {rollout_id}")
+
+        max_sequence_ids: Dict[str, int] = {}
+        for span in spans:
+            max_sequence_ids[span.rollout_id] = max(max_sequence_ids.get(span.rollout_id, 0), span.sequence_id)
+        await asyncio.gather(
+            *(
+                self.collections.span_sequence_ids.set_max(rollout_id, sequence_id)
+                for rollout_id, sequence_id in max_sequence_ids.items()
+            )
+        )
+
+        new_spans = await self.collections.spans.insert_new(spans)
+        if len(new_spans) < len(spans):
+            inserted = {id(span) for span in new_spans}
+            for span in spans:
+                if id(span) not in inserted:
+                    logger.error(
+                        f"Duplicated span added for rollout={span.rollout_id}, attempt={span.attempt_id}, span={span.span_id}. Skipping."
+                    )
+
+        # Like the transactional path, only the attempts that produced new spans are heartbeated and started,
+        # so that resending a stored batch does not revive an unresponsive attempt.
+        heartbeat_time = time.time()
+        new_attempt_keys = list(dict.fromkeys((span.rollout_id, span.attempt_id) for span in new_spans))
+        for rollout_id, attempt_id in new_attempt_keys:
+            await self._heartbeat_attempt(rollout_id, attempt_id, heartbeat_time)
+
+        # Start the rollouts whose latest attempt produced the spans.
+        for rollout_id, attempt_id in new_attempt_keys:
+            if await self.collections.latest_attempt_ids.get(rollout_id) != attempt_id:
+                continue
+            rollout = await self._start_rollout_on_span(rollout_id)
+            if rollout is not None:
+                await self.on_rollout_update(rollout)
+
+        return new_spans
+
+    async def _existing_attempt_keys(self, attempt_keys: Sequence[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """The `(rollout_id, attempt_id)` pairs among `attempt_keys` whose attempt exists, with one query."""
+        collection = await self.collections.attempts.ensure_collection()
+        cursor = collection.find(
+            {
+                "partition_id": self._partition_id,
+                "$or": [
+                    {"rollout_id": rollout_id, "attempt_id": attempt_id} for rollout_id, attempt_id in attempt_keys
+                ],
+            },
+            projection={"_id": 0, "rollout_id": 1, "attempt_id": 1},
+        )
+        return {(raw["rollout_id"], raw["attempt_id"]) async for raw in cursor}
+
+    async def _heartbeat_attempt(self, rollout_id: str, attempt_id: str, heartbeat_time: float) -> Optional[Attempt]:
+        """Record the heartbeat of an attempt and mark it running if it was preparing or unresponsive."""
+        collection = await self.collections.attempts.ensure_collection()
+        raw = await collection.find_one_and_update(
+            {"partition_id": self._partition_id, "rollout_id": rollout_id, "attempt_id": attempt_id},
+            [
+                {
+                    "$set": {
+                        "last_heartbeat_time": heartbeat_time,
+                        "status": {
+                            "$cond": [{"$in": ["$status", ["preparing", "unresponsive"]]}, "running", "$status"]
+                        },
+                    }
+                }
+            ],
+            return_document=ReturnDocument.AFTER,
+        )
+        if raw is None:
+            return None
+        raw.pop("_id", None)  # type: ignore
+        return Attempt.model_validate(raw)
+
+    async def _start_rollout_on_span(self, rollout_id: str) -> Optional[Rollout]:
+        """Mark the rollout running if it was waiting for its attempt to start. Returns it if it changed."""
+        collection = await self.collections.rollouts.ensure_collection()
+        raw = await collection.find_one_and_update(
+            {
+                "partition_id": self._partition_id,
+                "rollout_id": rollout_id,
+                "status": {"$in": ["preparing", "queuing", "requeuing"]},
+            },
+            {"$set": {"status": "running"}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if raw is None:
+            return None
+        raw.pop("_id", None)  # type: ignore
+        return Rollout.model_validate(raw)
+
+    async def wait_for_rollouts(self, *, rollout_ids: List[str], timeout: Optional[float] = None) -> List[Rollout]:
+        """Wait for rollouts, woken up by the change stream bus when other processes finish them."""
+        if rollout_ids and (timeout is None or timeout > 0):
+            # Start the bus before the first read, so that every completion after the read is observed.
+            await self._change_bus.ensure_started()
+        return await super().wait_for_rollouts(rollout_ids=rollout_ids, timeout=timeout)
+
+    async def poll_rollout_queue(self, claim: Callable[[], Awaitable[Optional[R]]], wait_timeout: float) -> Optional[R]:
+        """Wait for queued rollouts, woken up by the change stream bus when other processes enqueue them."""
+        await self._change_bus.ensure_started()
+        return await super().poll_rollout_queue(claim, wait_timeout)
+
+
+class MongoChangeStreamBus:
+    """Forwards the changes of a partition made by any process to the in-process notifiers of a store.
+
+    One change stream on the database watches the `rollouts` and `rollout_queue` collections of the partition.
+    Finished rollouts notify their waiters and queued rollouts wake up the blocked dequeues, so that waiters
+    in every process (e.g., every worker of `agl store --n-workers`) wake up promptly instead of on their
+    periodic re-check.
+
+    The bus runs in the background once started. After an error, the stream is reopened from the last
+    resume token with exponential backoff, which is reset once the reopened stream delivers a batch.
+    If the server can no longer resume from the token (e.g., the oplog has rolled over), the stream
+    restarts from the current time and all waiters are woken up to re-read the collections. Deployments without change streams (e.g., a standalone server)
+    disable the bus, leaving waiters on their periodic re-check.
+
+    Args:
+        collections: The collections of the store.
+        partition_id: The partition to watch.
+        rollout_notifier: Notified with the rollout ID when a rollout finishes.
+        queue_notifier: Notified with `queue_key` once per queued rollout.
+        queue_key: The key of the rollout queue on `queue_notifier`.
+        retry_interval: Seconds before the first attempt to reopen a failed stream.
+        max_retry_interval: Upper bound of the backoff between two attempts.
+    """
+
+    def __init__(
+        self,
+        collections: MongoLightningCollections,
+        partition_id: str,
+        rollout_notifier: LoopAwareNotifier,
+        queue_notifier: LoopAwareNotifier,
+        queue_key: str,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+    ) -> None:
+        self._collections = collections
+        self._partition_id = partition_id
+        self._rollout_notifier = rollout_notifier
+        self._queue_notifier = queue_notifier
+        self._queue_key = queue_key
+        self._retry_interval = retry_interval
+        self._max_retry_interval = max_retry_interval
+
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._ready: Optional[asyncio.Future[bool]] = None
+        self._resume_token: Optional[Mapping[str, Any]] = None
+        self._unsupported = False
+
+    async def ensure_started(self) -> bool:
+        """Start the bus on the running event loop unless it is already running.
+
+        Waits until the stream is open when starting it, so that the changes after this call are observed.
+
+        Returns:
+            Whether change streams are available.
+        """
+        if self._unsupported:
+            return False
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._task
+            if task is None or task.done() or task.get_loop().is_closed():
+                self._ready = loop.create_future()
+                self._task = task = loop.create_task(self._run(self._ready))
+            ready = self._ready
+        if ready is not None and task.get_loop() is loop:
+            return await asyncio.shield(ready)
+        # The bus runs on another event loop; it is usable once that loop has opened the stream.
+        return not self._unsupported
+
+    async def close(self) -> None:
+        """Stop the bus."""
+        with self._lock:
+            task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task_loop = task.get_loop()
+        if task_loop is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        elif not task_loop.is_closed():
+            task_loop.call_soon_threadsafe(task.cancel)
+
+    async def _open(self) -> AsyncChangeStream[Mapping[str, Any]]:
+        rollouts = await self._collections.rollouts.ensure_collection()
+        rollout_queue = await self._collections.rollout_queue.ensure_collection()
+        pipeline = [
+            {
+                "$match": {
+                    "fullDocument.partition_id": self._partition_id,
+                    "$or": [
+                        {
+                            "ns.coll": rollouts.name,
+                            "operationType": {"$in": ["insert", "replace", "update"]},
+                            "fullDocument.status": {"$in": ["succeeded", "failed", "cancelled"]},
+                        },
+                        {
+                            "ns.coll": rollout_queue.name,
+                            "operationType": "insert",
+                            "fullDocument.consumed": False,
+                        },
+                    ],
+                }
+            },
+            {"$project": {"ns.coll": 1, "fullDocument.rollout_id": 1}},
+        ]
+        return await rollouts.database.watch(
+            pipeline,
+            full_document="updateLookup",
+            resume_after=self._resume_token,
+            max_await_time_ms=1000,
+        )
+
+    def _dispatch(self, change: Mapping[str, Any]) -> None:
+        collection_name = change.get("ns", {}).get("coll")
+        if collection_name == self._collections.rollout_queue._collection_name:  # pyright: ignore[reportPrivateUsage]
+            self._queue_notifier.notify(self._queue_key, limit=1)
+            return
+        full_document = change.get("fullDocument")
+        if full_document is not None and "rollout_id" in full_document:
+            self._rollout_notifier.notify(full_document["rollout_id"])
+
+    async def _run(self, ready: asyncio.Future[bool]) -> None:
+        retry_interval = self._retry_interval
+        history_lost = False
+        while True:
+            try:
+                stream = await self._open()
+            except OperationFailure as exc:
+                if not ready.done():
+                    # Never opened: change streams are not available on this deployment.
+                    logger.info("Change streams unavailable, waiters fall back to periodic re-checks: %s", exc)
+                    self._unsupported = True
+                    ready.set_result(False)
+                    return
+                if exc.code in _RESUME_FAILURE_CODES and self._resume_token is not None:
+                    logger.warning("Cannot resume the change stream, restarting it from now: %s", exc)
+                    self._resume_token = None
+                    history_lost = True
+                    continue
+                logger.warning("Failed to reopen the change stream, retrying in %.1f seconds: %s", retry_interval, exc)
+                await asyncio.sleep(retry_interval)
+                retry_interval = min(retry_interval * 2, self._max_retry_interval)
+                continue
+            except PyMongoError as exc:
+                if not ready.done():
+                    # Do not hold up the waiters; they re-check periodically until the stream is open.
+                    ready.set_result(False)
+                logger.warning("Failed to open the change stream, retrying in %.1f seconds: %s", retry_interval, exc)
+                await asyncio.sleep(retry_interval)
+                retry_interval = min(retry_interval * 2, self._max_retry_interval)
+                continue
+
+            if not ready.done():
+                ready.set_result(True)
+            if history_lost:
+                # Changes between the last resume token and now are lost.
+                history_lost = False
+                self._rollout_notifier.notify_all()
+                self._queue_notifier.notify_all()
+
+            delivered = False
+            try:
+                async with stream:
+                    while stream.alive:
+                        change = await stream.try_next()
+                        delivered = True
+                        # The token also advances on empty batches, which keeps it resumable while idle.
+                        self._resume_token = stream.resume_token
+                        if change is not None:
+                            self._dispatch(change)
+            except OperationFailure as exc:
+                if exc.code in _RESUME_FAILURE_CODES:
+                    logger.warning("Change stream history lost, restarting it from now: %s", exc)
+                    self._resume_token = None
+                    history_lost = True
+                else:
+                    logger.warning("Change stream failed: %s", exc)
+            except PyMongoError as exc:
+                logger.warning("Change stream failed: %s", exc)
+
+            # Only a stream that delivered a batch resets the backoff: a stream failing right after
+            # being opened must not be reopened in a tight loop.
+            if delivered:
+                retry_interval = self._retry_interval
+            logger.info("Resuming the change stream in %.1f seconds", retry_interval)
+            await asyncio.sleep(retry_interval)
+            retry_interval = min(retry_interval * 2, self._max_retry_interval)
@@ -0,0 +1,156 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Cross-loop, cross-thread notifications for store waiters."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+__all__ = ["LoopAwareNotifier", "NotificationWaiter"]
+
+
+class NotificationWaiter:
+    """A subscription to a set of keys on a [`LoopAwareNotifier`][agentlightning.store.notifier.LoopAwareNotifier].
+
+    The waiter is bound to the event loop it was created on. Notifications are buffered until
+    [`wait()`][agentlightning.store.notifier.NotificationWaiter.wait] drains them, so a notification that
+    arrives between two waits is never lost.
+    """
+
+    def __init__(self, notifier: LoopAwareNotifier, keys: Iterable[str]) -> None:
+        self._notifier = notifier
+        self._loop = asyncio.get_running_loop()
+        self.keys: Set[str] = set(keys)
+        self._notified: Set[str] = set()
+        self._wakeup: Optional[asyncio.Future[None]] = None
+
+    def _on_notify(self, key: str) -> None:
+        """Record a notification. Called by the notifier while it holds its lock."""
+        self._notified.add(key)
+        wakeup = self._wakeup
+        if wakeup is None:
+            return
+        self._wakeup = None
+        if self._loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            _resolve(wakeup)
+        else:
+            self._loop.call_soon_threadsafe(_resolve, wakeup)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Stop listening to the given keys."""
+        self._notifier._discard(self, keys)  # pyright: ignore[reportPrivateUsage]
+
+    async def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Wait until at least one key is notified.
+
+        Returns:
+            The keys notified since the last call. Empty if the timeout is reached first.
+        """
+        with self._notifier._lock:  # pyright: ignore[reportPrivateUsage]
+            if self._notified:
+                notified, self._notified = self._notified, set()
+                return notified
+            wakeup = self._loop.create_future()
+            self._wakeup = wakeup
+        try:
+            await asyncio.wait_for(asyncio.shield(wakeup), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._notifier._lock:  # pyright: ignore[reportPrivateUsage]
+            self._wakeup = None
+            notified, self._notified = self._notified, set()
+            return notified
+
+    def close(self, pass_on_pending: bool = False) -> None:
+        """Unsubscribe from all keys.
+
+        Args:
+            pass_on_pending: Hand each notification that was not drained by
+                [`wait()`][agentlightning.store.notifier.NotificationWaiter.wait] over to the next waiter
+                of its key. Needed for keys notified with a `limit` (e.g., one wake-up per queued item),
+                where a dropped notification would leave the other waiters asleep.
+        """
+        self._notifier._discard(self, list(self.keys))  # pyright: ignore[reportPrivateUsage]
+        if not pass_on_pending:
+            return
+        with self._notifier._lock:  # pyright: ignore[reportPrivateUsage]
+            pending, self._notified = self._notified, set()
+        for key in pending:
+            self._notifier.notify(key, limit=1)
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LoopAwareNotifier:
+    """Wakes up asyncio waiters on any event loop or thread when keys are notified.
+
+    Notifying costs O(1) per subscribed waiter and never spawns threads: waiters living on the notifying
+    event loop are resolved directly, while waiters on other loops are woken via `call_soon_threadsafe`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Insertion-ordered, so that limited notifications wake up the oldest waiters first.
+        self._waiters: Dict[str, Dict[NotificationWaiter, None]] = {}
+
+    def subscribe(self, keys: Iterable[str]) -> NotificationWaiter:
+        """Subscribe to the given keys. Must be called within a running event loop.
+
+        Subscribe **before** checking the state guarded by the keys, so that no update is missed.
+        """
+        waiter = NotificationWaiter(self, keys)
+        with self._lock:
+            for key in waiter.keys:
+                self._waiters.setdefault(key, {})[waiter] = None
+        return waiter
+
+    def notify(self, key: str, limit: Optional[int] = None) -> None:
+        """Wake up the waiters subscribed to the key.
+
+        Args:
+            key: The key to notify.
+            limit: Wake up at most this many waiters, oldest subscription first. Waiters that already
+                have a pending notification for the key are skipped and do not count. `None` wakes up all.
+        """
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if not waiters:
+                return
+            woken = 0
+            for waiter in waiters:
+                if limit is not None and woken >= limit:
+                    break
+                if key in waiter._notified:  # pyright: ignore[reportPrivateUsage]
+                    continue
+                waiter._on_notify(key)  # pyright: ignore[reportPrivateUsage]
+                woken += 1
+
+    def notify_all(self) -> None:
+        """Wake up every waiter on every key, e.g., after updates may have been missed."""
+        with self._lock:
+            for key, waiters in self._waiters.items():
+                for waiter in waiters:
+                    if key not in waiter._notified:  # pyright: ignore[reportPrivateUsage]
+                        waiter._on_notify(key)  # pyright: ignore[reportPrivateUsage]
+
+    def _discard(self, waiter: NotificationWaiter, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                waiter.keys.discard(key)
+                waiters = self._waiters.get(key)
+                if waiters is None:
+                    continue
+                waiters.pop(waiter, None)
+                if not waiters:
+                    del self._waiters[key]
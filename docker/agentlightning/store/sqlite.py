@@ -1,3 +1,59 @@
 # Copyright (c) Microsoft. All rights reserved.
 
-# TODO: Implement this
+from __future__ import annotations
+
+import logging
+from typing import Literal
+
+from .base import LightningStoreCapabilities
+from .collection.sqlite import SqliteDatabase, SqliteLightningCollections
+from .collection_based import DEFAULT_WATCHDOG_INTERVAL, CollectionBasedLightningStore
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteLightningStore(CollectionBasedLightningStore[SqliteLightningCollections]):
+    """
+    SQLite implementation of LightningStore, persisting everything in a single database file.
+    Durable without a separate database service, which makes it suited to single-node deployments.
+
+    The database runs in WAL mode and every store call is one write transaction.
+    Like [`InMemoryLightningStore`][agentlightning.InMemoryLightningStore], the store is meant to be
+    owned by a single process (e.g., behind a [`LightningStoreServer`][agentlightning.LightningStoreServer]);
+    waiters and notifications are in-process.
+
+    Args:
+        path: Path to the database file. It is created if it does not exist, and reopened with its data otherwise.
+            Use `":memory:"` for a non-persistent database.
+        synchronous: The SQLite `synchronous` pragma. `"NORMAL"` survives application crashes;
+            `"FULL"` also survives power failures at the cost of one fsync per transaction.
+        busy_timeout: Seconds to wait for a lock held by another connection before failing.
+        watchdog_interval: Seconds between two healthcheck sweeps of the background watchdog.
+            Set to `None` to run the healthcheck before every store call instead.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        synchronous: Literal["OFF", "NORMAL", "FULL"] = "NORMAL",
+        busy_timeout: float = 30.0,
+        watchdog_interval: float | None = DEFAULT_WATCHDOG_INTERVAL,
+    ) -> None:
+        self._database = SqliteDatabase(path, busy_timeout=busy_timeout, synchronous=synchronous)
+        super().__init__(collections=SqliteLightningCollections(self._database), watchdog_interval=watchdog_interval)
+
+    @property
+    def capabilities(self) -> LightningStoreCapabilities:
+        """Return the capabilities of the store."""
+        return LightningStoreCapabilities(
+            thread_safe=False,
+            async_safe=True,
+            zero_copy=False,
+            otlp_traces=False,
+        )
+
+    async def close(self) -> None:
+        """Close the store by stopping the watchdog and closing the database connection."""
+        await self.stop_watchdog()
+        self.collections.close()
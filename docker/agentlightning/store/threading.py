@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import threading
-from typing import Any, Dict, List, Literal, Optional, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence
 
 from opentelemetry.sdk.trace import ReadableSpan
 
@@ -11,6 +12,7 @@ from agentlightning.types import (
     Attempt,
     AttemptedRollout,
     AttemptStatus,
+    EnqueueRolloutRequest,
     NamedResources,
     ResourcesUpdate,
     Rollout,
@@ -23,6 +25,7 @@ from agentlightning.types import (
 )
 
 from .base import UNSET, LightningStore, LightningStoreCapabilities, Unset
+from .collection_based import CollectionBasedLightningStore
 
 
 class LightningStoreThreaded(LightningStore):
@@ -36,6 +39,18 @@ class LightningStoreThreaded(LightningStore):
         super().__init__()  # watchdog relies on the underlying store
         self.store = store
         self._lock = threading.Lock()
+        if isinstance(store, CollectionBasedLightningStore):
+            # Background healthcheck sweeps must not interleave with the calls serialized by this facade,
+            # so they run inside `_locked()` instead of in the watchdog task.
+            store._watchdog_deferred = True  # pyright: ignore[reportPrivateUsage]
+
+    @asynccontextmanager
+    async def _locked(self) -> AsyncIterator[None]:
+        """Hold the facade lock, running the healthcheck sweep first if the watchdog marked one as due."""
+        with self._lock:
+            if isinstance(self.store, CollectionBasedLightningStore):
+                await self.store._run_due_watchdog_sweep()  # pyright: ignore[reportPrivateUsage]
+            yield
 
     @property
     def capabilities(self) -> LightningStoreCapabilities:
@@ -55,7 +70,7 @@ class LightningStoreThreaded(LightningStore):
         config: RolloutConfig | None = None,
         metadata: Dict[str, Any] | None = None,
     ) -> AttemptedRollout:
-        with self._lock:
+        async with self._locked():
             return await self.store.start_rollout(input, mode, resources_id, config, metadata)
 
     async def enqueue_rollout(
@@ -66,15 +81,46 @@ class LightningStoreThreaded(LightningStore):
         config: RolloutConfig | None = None,
         metadata: Dict[str, Any] | None = None,
     ) -> Rollout:
-        with self._lock:
+        async with self._locked():
             return await self.store.enqueue_rollout(input, mode, resources_id, config, metadata)
 
-    async def dequeue_rollout(self, worker_id: Optional[str] = None) -> Optional[AttemptedRollout]:
-        with self._lock:
-            return await self.store.dequeue_rollout(worker_id=worker_id)
+    async def enqueue_rollouts(
+        self,
+        items: Sequence[EnqueueRolloutRequest],
+        *,
+        mode: Literal["train", "val", "test"] | None = None,
+        resources_id: str | None = None,
+        config: RolloutConfig | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> Sequence[Rollout]:
+        async with self._locked():
+            return await self.store.enqueue_rollouts(
+                items, mode=mode, resources_id=resources_id, config=config, metadata=metadata
+            )
+
+    async def dequeue_rollout(
+        self, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Optional[AttemptedRollout]:
+        if wait_timeout is not None and wait_timeout > 0 and isinstance(self.store, CollectionBasedLightningStore):
+            # Only hold the lock while claiming, not while waiting for the queue.
+            return await self.store.poll_rollout_queue(lambda: self.dequeue_rollout(worker_id=worker_id), wait_timeout)
+        async with self._locked():
+            return await self.store.dequeue_rollout(worker_id=worker_id, wait_timeout=wait_timeout)
+
+    async def dequeue_rollouts(
+        self, limit: int, worker_id: Optional[str] = None, wait_timeout: Optional[float] = None
+    ) -> Sequence[AttemptedRollout]:
+        if wait_timeout is not None and wait_timeout > 0 and isinstance(self.store, CollectionBasedLightningStore):
+            # Only hold the lock while claiming, not while waiting for the queue.
+            async def _claim() -> Optional[Sequence[AttemptedRollout]]:
+                return (await self.dequeue_rollouts(limit, worker_id=worker_id)) or None
+
+            return (await self.store.poll_rollout_queue(_claim, wait_timeout)) or []
+        async with self._locked():
+            return await self.store.dequeue_rollouts(limit, worker_id=worker_id, wait_timeout=wait_timeout)
 
     async def start_attempt(self, rollout_id: str) -> AttemptedRollout:
-        with self._lock:
+        async with self._locked():
             return await self.store.start_attempt(rollout_id)
 
     async def query_rollouts(
@@ -91,7 +137,7 @@ class LightningStoreThreaded(LightningStore):
         status: Optional[Sequence[RolloutStatus]] = None,
         rollout_ids: Optional[Sequence[str]] = None,
     ) -> Sequence[Rollout]:
-        with self._lock:
+        async with self._locked():
             return await self.store.query_rollouts(
                 status_in=status_in,
                 rollout_id_in=rollout_id_in,
@@ -114,7 +160,7 @@ class LightningStoreThreaded(LightningStore):
         limit: int = -1,
         offset: int = 0,
     ) -> Sequence[Attempt]:
-        with self._lock:
+        async with self._locked():
             return await self.store.query_attempts(
                 rollout_id,
                 sort_by=sort_by,
@@ -124,11 +170,11 @@ class LightningStoreThreaded(LightningStore):
             )
 
     async def get_rollout_by_id(self, rollout_id: str) -> Optional[Rollout]:
-        with self._lock:
+        async with self._locked():
             return await self.store.get_rollout_by_id(rollout_id)
 
     async def get_latest_attempt(self, rollout_id: str) -> Optional[Attempt]:
-        with self._lock:
+        async with self._locked():
             return await self.store.get_latest_attempt(rollout_id)
 
     async def query_resources(
@@ -141,7 +187,7 @@ class LightningStoreThreaded(LightningStore):
         limit: int = -1,
         offset: int = 0,
     ) -> Sequence[ResourcesUpdate]:
-        with self._lock:
+        async with self._locked():
             return await self.store.query_resources(
                 resources_id=resources_id,
                 resources_id_contains=resources_id_contains,
@@ -152,23 +198,23 @@ class LightningStoreThreaded(LightningStore):
             )
 
     async def add_resources(self, resources: NamedResources) -> ResourcesUpdate:
-        with self._lock:
+        async with self._locked():
             return await self.store.add_resources(resources)
 
     async def update_resources(self, resources_id: str, resources: NamedResources) -> ResourcesUpdate:
-        with self._lock:
+        async with self._locked():
             return await self.store.update_resources(resources_id, resources)
 
     async def get_resources_by_id(self, resources_id: str) -> Optional[ResourcesUpdate]:
-        with self._lock:
+        async with self._locked():
             return await self.store.get_resources_by_id(resources_id)
 
     async def get_latest_resources(self) -> Optional[ResourcesUpdate]:
-        with self._lock:
+        async with self._locked():
             return await self.store.get_latest_resources()
 
     async def add_span(self, span: Span) -> Span:
-        with self._lock:
+        async with self._locked():
             return await self.store.add_span(span)
 
     async def add_otel_span(
@@ -178,17 +224,35 @@ class LightningStoreThreaded(LightningStore):
         readable_span: ReadableSpan,
         sequence_id: int | None = None,
     ) -> Span:
-        with self._lock:
+        async with self._locked():
             return await self.store.add_otel_span(rollout_id, attempt_id, readable_span, sequence_id)
 
+    async def add_spans(self, spans: Sequence[Span]) -> Sequence[Span]:
+        async with self._locked():
+            return await self.store.add_spans(spans)
+
+    async def add_otel_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str,
+        readable_spans: Sequence[ReadableSpan],
+        sequence_id: int | None = None,
+    ) -> Sequence[Span]:
+        async with self._locked():
+            return await self.store.add_otel_spans(rollout_id, attempt_id, readable_spans, sequence_id)
+
     async def wait_for_rollouts(self, *, rollout_ids: List[str], timeout: Optional[float] = None) -> List[Rollout]:
         # This method does not change the state of the store, and it's not thread-safe.
         return await self.store.wait_for_rollouts(rollout_ids=rollout_ids, timeout=timeout)
 
     async def get_next_span_sequence_id(self, rollout_id: str, attempt_id: str) -> int:
-        with self._lock:
+        async with self._locked():
             return await self.store.get_next_span_sequence_id(rollout_id, attempt_id)
 
+    async def get_next_span_sequence_ids(self, rollout_id: str, attempt_id: str, count: int) -> List[int]:
+        async with self._locked():
+            return await self.store.get_next_span_sequence_ids(rollout_id, attempt_id, count)
+
     async def query_spans(
         self,
         rollout_id: str,
@@ -207,8 +271,10 @@ class LightningStoreThreaded(LightningStore):
         offset: int = 0,
         sort_by: Optional[str] = "sequence_id",
         sort_order: Literal["asc", "desc"] = "asc",
+        fields: Optional[Sequence[str]] = None,
+        attributes_prefix: Optional[Sequence[str]] = None,
     ) -> Sequence[Span]:
-        with self._lock:
+        async with self._locked():
             return await self.store.query_spans(
                 rollout_id,
                 attempt_id,
@@ -225,8 +291,35 @@ class LightningStoreThreaded(LightningStore):
                 offset=offset,
                 sort_by=sort_by,
                 sort_order=sort_order,
+                fields=fields,
+                attributes_prefix=attributes_prefix,
             )
 
+    async def iter_spans(
+        self,
+        rollout_id: str,
+        attempt_id: str | Literal["latest"] | None = None,
+        *,
+        after_sequence_id: Optional[int] = None,
+        after_span_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Span]:
+        # The lock is only held while fetching each span, not while the caller consumes it.
+        iterator = self.store.iter_spans(
+            rollout_id,
+            attempt_id,
+            after_sequence_id=after_sequence_id,
+            after_span_id=after_span_id,
+            batch_size=batch_size,
+        )
+        while True:
+            async with self._locked():
+                try:
+                    span = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield span
+
     async def update_rollout(
         self,
         rollout_id: str,
@@ -237,7 +330,7 @@ class LightningStoreThreaded(LightningStore):
         config: RolloutConfig | Unset = UNSET,
         metadata: Optional[Dict[str, Any]] | Unset = UNSET,
     ) -> Rollout:
-        with self._lock:
+        async with self._locked():
             return await self.store.update_rollout(
                 rollout_id=rollout_id,
                 input=input,
@@ -257,7 +350,7 @@ class LightningStoreThreaded(LightningStore):
         last_heartbeat_time: float | Unset = UNSET,
         metadata: Optional[Dict[str, Any]] | Unset = UNSET,
     ) -> Attempt:
-        with self._lock:
+        async with self._locked():
             return await self.store.update_attempt(
                 rollout_id=rollout_id,
                 attempt_id=attempt_id,
@@ -278,7 +371,7 @@ class LightningStoreThreaded(LightningStore):
         limit: int = -1,
         offset: int = 0,
     ) -> Sequence[Worker]:
-        with self._lock:
+        async with self._locked():
             return await self.store.query_workers(
                 status_in=status_in,
                 worker_id_contains=worker_id_contains,
@@ -289,7 +382,7 @@ class LightningStoreThreaded(LightningStore):
             )
 
     async def get_worker_by_id(self, worker_id: str) -> Optional[Worker]:
-        with self._lock:
+        async with self._locked():
             return await self.store.get_worker_by_id(worker_id)
 
     async def update_worker(
@@ -297,7 +390,7 @@ class LightningStoreThreaded(LightningStore):
         worker_id: str,
         heartbeat_stats: Dict[str, Any] | Unset = UNSET,
     ) -> Worker:
-        with self._lock:
+        async with self._locked():
             return await self.store.update_worker(
                 worker_id=worker_id,
                 heartbeat_stats=heartbeat_stats,
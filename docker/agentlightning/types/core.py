@@ -51,6 +51,7 @@ __all__ = [
     "RolloutStatus",
     "RolloutConfig",
     "Rollout",
+    "EnqueueRolloutRequest",
     "Attempt",
     "AttemptedRollout",
     "Hook",
@@ -241,6 +242,24 @@ TaskInput = Any
 """Task input type. Accepts arbitrary payloads."""
 
 
+class EnqueueRolloutRequest(BaseModel):
+    """A single rollout submitted via [`enqueue_rollouts()`][agentlightning.LightningStore.enqueue_rollouts].
+
+    Fields left as `None` fall back to the batch-level defaults passed to `enqueue_rollouts()`.
+    """
+
+    input: TaskInput
+    """Task input used to generate the rollout."""
+    mode: Optional[RolloutMode] = None
+    """Execution mode such as `"train"`, `"val"` or `"test"`."""
+    resources_id: Optional[str] = None
+    """Identifier of the resources required to execute the rollout."""
+    config: Optional[RolloutConfig] = None
+    """Retry and timeout configuration. Overrides the batch-level config."""
+    metadata: Optional[Dict[str, Any]] = None
+    """Metadata merged on top of the batch-level metadata."""
+
+
 class Task(BaseModel):
     """Rollout request served to client agents.
 
@@ -22,7 +22,7 @@ from agentlightning import LLM, AgentLightningServer, NamedResources, RolloutLeg
 from agentlightning.adapter.triplet import TracerTraceToTriplet, TraceToTripletBase
 from agentlightning.llm_proxy import LLMProxy, ModelConfig
 from agentlightning.store.base import LightningStore
-from agentlightning.types import Rollout, RolloutConfig, Task
+from agentlightning.types import EnqueueRolloutRequest, Rollout, RolloutConfig, Task
 
 __all__ = [
     "AgentModeDaemon",
@@ -377,41 +377,47 @@ class AgentModeDaemon:
         num_samples = len(data[keys[0]])
         rollouts_per_sample = self.train_rollout_n if is_train else 1
 
+        samples: List[Dict[str, Any]] = []
         for i in range(num_samples):
             data_id = str(uuid.uuid4())
             original_sample = {key: data[key][i] for key in keys}
             original_sample["data_id"] = data_id
 
             # For training, each sample is rolled out multiple times
-            for _ in range(rollouts_per_sample):
-                task_metadata = {"data_id": data_id, "is_train": is_train}
+            samples.extend([original_sample] * rollouts_per_sample)
 
+        if self.mode == "v0":
+            for original_sample in samples:
                 # Data ID is different from Rollout ID, as one data can have multiple rollouts.
-                if self.mode == "v0":
-                    rollout_id = await self.server.queue_task(
-                        sample=_to_native(original_sample),
-                        mode="train" if is_train else "val",
-                        resources_id=resources_id,
-                        metadata=task_metadata,
-                    )
-                else:
-                    rollout = await self.store.enqueue_rollout(
+                rollout_id = await self.server.queue_task(
+                    sample=_to_native(original_sample),
+                    mode="train" if is_train else "val",
+                    resources_id=resources_id,
+                    metadata={"data_id": original_sample["data_id"], "is_train": is_train},
+                )
+                # Store original sample data to reconstruct batch information later
+                self._task_id_to_original_sample[rollout_id] = original_sample
+                self._total_tasks_queued += 1
+        else:
+            # Enqueue the whole batch in a single store request.
+            rollouts = await self.store.enqueue_rollouts(
+                [
+                    EnqueueRolloutRequest(
                         input=_to_native(original_sample),
-                        mode="train" if is_train else "val",
-                        resources_id=resources_id,
-                        metadata=task_metadata,
-                    )
-                    await self.store.update_rollout(
-                        rollout_id=rollout.rollout_id,
-                        config=RolloutConfig(
-                            unresponsive_seconds=self.llm_timeout_seconds,
-                            timeout_seconds=self.llm_timeout_seconds,
-                        ),
+                        metadata={"data_id": original_sample["data_id"], "is_train": is_train},
                     )
-                    rollout_id = rollout.rollout_id
-
+                    for original_sample in samples
+                ],
+                mode="train" if is_train else "val",
+                resources_id=resources_id,
+                config=RolloutConfig(
+                    unresponsive_seconds=self.llm_timeout_seconds,
+                    timeout_seconds=self.llm_timeout_seconds,
+                ),
+            )
+            for rollout, original_sample in zip(rollouts, samples):
                 # Store original sample data to reconstruct batch information later
-                self._task_id_to_original_sample[rollout_id] = original_sample
+                self._task_id_to_original_sample[rollout.rollout_id] = original_sample
                 self._total_tasks_queued += 1
 
     def set_up_data_and_server(self, data: Dict[str, Any], server_addresses: List[str], is_train: bool = True):
@@ -0,0 +1,147 @@
+"""
+Benchmark: write-ahead journal of InMemoryLightningStore
+
+Fills an in-memory store with synthetic spans, with and without a journal, and restores it after a restart:
+
+1. Hot path: add_spans throughput without a journal and with one (records are serialized on the event loop,
+   the writer thread only does the file I/O)
+2. Catch-up: time for the background writer to flush the journal after the last add_spans
+3. Restore from the journal only (every record replayed)
+4. Restore from a snapshot of the same data
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+from agentlightning.store.memory import InMemoryLightningStore
+from agentlightning.types import OtelResource, Span, SpanContext, TraceStatus
+
+# Spans are never evicted during the benchmark.
+_NO_EVICTION = {"eviction_memory_threshold": 1 << 50, "safe_memory_threshold": 1 << 49}
+
+
+def make_span(rng: random.Random, rollout_id: str, attempt_id: str, sequence_id: int) -> Span:
+    trace_id = f"{rng.getrandbits(128):032x}"
+    span_id = f"{rng.getrandbits(64):016x}"
+    return Span(
+        rollout_id=rollout_id,
+        attempt_id=attempt_id,
+        sequence_id=sequence_id,
+        trace_id=trace_id,
+        span_id=span_id,
+        parent_id=None,
+        name="llm.call",
+        status=TraceStatus(status_code="OK"),
+        attributes={
+            "gen_ai.prompt.0.content": "x" * rng.randint(20, 400),
+            "gen_ai.completion.0.content": "y" * rng.randint(20, 200),
+            "gen_ai.usage.prompt_tokens": rng.randint(10, 4000),
+        },
+        events=[],
+        links=[],
+        start_time=time.time(),
+        end_time=time.time(),
+        context=SpanContext(trace_id=trace_id, span_id=span_id, is_remote=False, trace_state={}),
+        parent=None,
+        resource=OtelResource(attributes={"service.name": "agent"}, schema_url=""),
+    )
+
+
+async def fill(store: InMemoryLightningStore, num_spans: int, spans_per_rollout: int, batch_size: int) -> float:
+    """Add the spans and return the throughput in spans/s, excluding the span construction."""
+    rng = random.Random(0)
+    elapsed = 0.0
+    added = 0
+    while added < num_spans:
+        rollout = await store.start_rollout(input={"index": added})
+        count = min(spans_per_rollout, num_spans - added)
+        spans = [make_span(rng, rollout.rollout_id, rollout.attempt.attempt_id, i + 1) for i in range(count)]
+        start = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            await store.add_spans(spans[offset : offset + batch_size])
+        elapsed += time.perf_counter() - start
+        added += count
+    return num_spans / elapsed
+
+
+def directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+async def restore(directory: str) -> float:
+    # Restore a copy, so that the restored store does not append to the files of the running one.
+    copy = directory + "-restored"
+    shutil.rmtree(copy, ignore_errors=True)
+    shutil.copytree(directory, copy)
+    start = time.perf_counter()
+    store = InMemoryLightningStore(watchdog_interval=None, journal_dir=copy, **_NO_EVICTION)
+    elapsed = time.perf_counter() - start
+    stats = store.collections.restore_stats
+    assert stats is not None
+    print(
+        f"  {elapsed:8.2f} s  ({stats['snapshot_records']} snapshot and {stats['journal_records']} journal records, "
+        f"{await store.collections.spans.size()} spans)"
+    )
+    await store.close()
+    return elapsed
+
+
+async def run(num_spans: int, spans_per_rollout: int, batch_size: int, directory: Optional[str]) -> None:
+    root = tempfile.mkdtemp(prefix="agl-journal-bench-", dir=directory)
+    try:
+        print(f"add_spans throughput ({num_spans} spans, {spans_per_rollout} per rollout, batches of {batch_size}):")
+        baseline = await fill(
+            InMemoryLightningStore(watchdog_interval=None, **_NO_EVICTION), num_spans, spans_per_rollout, batch_size
+        )
+        print(f"  no journal    {baseline:10.0f} spans/s")
+
+        journal_dir = os.path.join(root, "journal")
+        store = InMemoryLightningStore(
+            watchdog_interval=None, journal_dir=journal_dir, journal_snapshot_interval=None, **_NO_EVICTION
+        )
+        journaled = await fill(store, num_spans, spans_per_rollout, batch_size)
+        print(f"  with journal  {journaled:10.0f} spans/s  ({journaled / baseline:.2f}x)")
+        journal = store.collections.journal
+        assert journal is not None
+        start = time.perf_counter()
+        journal.flush()
+        print(f"Writer catch-up after the last add_spans: {time.perf_counter() - start:.2f} s")
+        print(f"Journal size: {directory_size(journal_dir) / 1024**2:.1f} MiB")
+
+        print("Restore from the journal:")
+        await restore(journal_dir)
+
+        # Take a snapshot of the same data, which compacts the journal away.
+        start = time.perf_counter()
+        async with store.collections.atomic():
+            journal.snapshot(store.collections)
+        captured = time.perf_counter() - start
+        journal.flush()
+        print(f"Snapshot: captured in {captured * 1000:.1f} ms, written in {time.perf_counter() - start:.2f} s")
+        print(f"Snapshot size: {directory_size(journal_dir) / 1024**2:.1f} MiB")
+        await store.close()
+
+        print("Restore from the snapshot:")
+        await restore(journal_dir)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spans", type=int, default=1_000_000, help="Number of synthetic spans")
+    parser.add_argument("--spans-per-rollout", type=int, default=100, help="Number of spans of each rollout")
+    parser.add_argument("--batch-size", type=int, default=10, help="Number of spans per add_spans call")
+    parser.add_argument("--directory", default=None, help="Parent directory of the journal (system temp by default)")
+    args = parser.parse_args()
+    asyncio.run(run(args.spans, args.spans_per_rollout, args.batch_size, args.directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark: InMemoryLightningStore under many concurrent writers
+
+Every writer appends spans to its own rollout with `add_span`, while runners claim rollouts with
+`dequeue_rollout` and, optionally, a reader keeps scanning a large rollout with `query_spans`.
+Writers run either as tasks of one event loop or as threads sharing a LightningStoreThreaded facade
+(as in the shared-memory execution strategy).
+
+Reported per scenario: add_span throughput, add_span and dequeue_rollout latency (p50 / p99).
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, List
+
+from agentlightning.store.base import LightningStore
+from agentlightning.store.memory import InMemoryLightningStore
+from agentlightning.store.threading import LightningStoreThreaded
+from agentlightning.types import AttemptedRollout, Span
+
+# Spans are never evicted during the benchmark.
+_NO_EVICTION = {"eviction_memory_threshold": 1 << 50, "safe_memory_threshold": 1 << 49}
+
+
+def make_span(rollout: AttemptedRollout, sequence_id: int, rng: random.Random) -> Span:
+    return Span.from_attributes(
+        rollout_id=rollout.rollout_id,
+        attempt_id=rollout.attempt.attempt_id,
+        sequence_id=sequence_id,
+        attributes={"gen_ai.prompt.0.content": "x" * rng.randint(20, 400), "gen_ai.usage.prompt_tokens": 10},
+    )
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1e6
+
+
+class Scenario:
+    def __init__(self, store: LightningStore, writers: int, spans_per_writer: int, reader_spans: int) -> None:
+        self.store = store
+        self.writers = writers
+        self.spans_per_writer = spans_per_writer
+        self.reader_spans = reader_spans
+        self.add_latencies: List[float] = []
+        self.dequeue_latencies: List[float] = []
+        self.stopped = threading.Event()
+        self.spans: List[List[Span]] = []
+        self.big_rollout_id = ""
+
+    async def prepare(self) -> None:
+        rng = random.Random(0)
+        for _ in range(self.writers):
+            rollout = await self.store.start_rollout(input={})
+            self.spans.append([make_span(rollout, i + 1, rng) for i in range(self.spans_per_writer)])
+        for _ in range(200):
+            await self.store.enqueue_rollout(input={})
+        if self.reader_spans:
+            rollout = await self.store.start_rollout(input={})
+            await self.store.add_spans([make_span(rollout, i + 1, rng) for i in range(self.reader_spans)])
+            self.big_rollout_id = rollout.rollout_id
+
+    async def write(self, index: int) -> None:
+        for span in self.spans[index]:
+            start = time.perf_counter()
+            await self.store.add_span(span)
+            self.add_latencies.append(time.perf_counter() - start)
+            # Yield like a real writer awaiting its next span, so that the other tasks get a turn.
+            await asyncio.sleep(0)
+
+    async def claim(self, index: int) -> None:
+        while not self.stopped.is_set():
+            start = time.perf_counter()
+            claimed = await self.store.dequeue_rollout(worker_id=f"runner-{index}")
+            if claimed is None:
+                break
+            self.dequeue_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.001)
+
+    async def read(self) -> None:
+        while not self.stopped.is_set():
+            await self.store.query_spans(self.big_rollout_id)
+            await asyncio.sleep(0)
+
+    def report(self, name: str, elapsed: float) -> None:
+        throughput = len(self.add_latencies) / elapsed
+        print(
+            f"  {name:46s} {throughput:9.0f} spans/s   add_span p50 {percentile(self.add_latencies, 0.5):7.0f} us"
+            f"  p99 {percentile(self.add_latencies, 0.99):8.0f} us   dequeue p50 "
+            f"{percentile(self.dequeue_latencies, 0.5):7.0f} us  p99 {percentile(self.dequeue_latencies, 0.99):8.0f} us"
+        )
+
+
+async def run_asyncio(writers: int, spans_per_writer: int, runners: int, reader_spans: int) -> None:
+    scenario = Scenario(InMemoryLightningStore(**_NO_EVICTION), writers, spans_per_writer, reader_spans)
+    await scenario.prepare()
+    background = [asyncio.create_task(scenario.claim(i)) for i in range(runners)]
+    if reader_spans:
+        background.append(asyncio.create_task(scenario.read()))
+    start = time.perf_counter()
+    await asyncio.gather(*(scenario.write(i) for i in range(writers)))
+    elapsed = time.perf_counter() - start
+    scenario.stopped.set()
+    await asyncio.gather(*background)
+    reader = f", reader over {reader_spans} spans" if reader_spans else ""
+    scenario.report(f"asyncio, {writers} writers{reader}", elapsed)
+
+
+def run_threads(writers: int, spans_per_writer: int, runners: int, reader_spans: int) -> None:
+    store = LightningStoreThreaded(InMemoryLightningStore(**_NO_EVICTION))
+    scenario = Scenario(store, writers, spans_per_writer, reader_spans)
+    asyncio.run(scenario.prepare())
+
+    def in_thread(target: Callable[[], Awaitable[None]]) -> threading.Thread:
+        thread = threading.Thread(target=lambda: asyncio.run(target()), daemon=True)  # type: ignore
+        thread.start()
+        return thread
+
+    background = [in_thread(lambda i=i: scenario.claim(i)) for i in range(runners)]
+    if reader_spans:
+        background.append(in_thread(scenario.read))
+    start = time.perf_counter()
+    threads = [in_thread(lambda i=i: scenario.write(i)) for i in range(writers)]
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    scenario.stopped.set()
+    for thread in background:
+        thread.join()
+    reader = f", reader over {reader_spans} spans" if reader_spans else ""
+    scenario.report(f"threads, {writers} writers{reader}", elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 8, 32], help="Numbers of concurrent writers")
+    parser.add_argument("--spans", type=int, default=4000, help="Total number of spans added per scenario")
+    parser.add_argument("--runners", type=int, default=4, help="Number of concurrent dequeue_rollout loops")
+    parser.add_argument("--reader-spans", type=int, default=20000, help="Spans of the rollout scanned by the reader")
+    parser.add_argument("--mode", choices=["asyncio", "threads", "both"], default="both")
+    args = parser.parse_args()
+
+    for reader_spans in (0, args.reader_spans):
+        for writers in args.writers:
+            spans_per_writer = max(args.spans // writers, 1)
+            if args.mode in ("asyncio", "both"):
+                asyncio.run(run_asyncio(writers, spans_per_writer, args.runners, reader_spans))
+            if args.mode in ("threads", "both"):
+                run_threads(writers, spans_per_writer, args.runners, reader_spans)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: MongoBasedQueue dequeue latency as the queue history grows
+
+Grows the history of consumed items of a queue step by step (inserted directly, in bulk) and,
+at each step, enqueues a fresh batch of items and measures `dequeue` (single items and batches),
+`peek` and `size` against a real MongoDB deployment.
+
+The history is consumed just now, so the TTL index does not delete it during the run: the numbers
+show the cost of a history the TTL monitor has not caught up with yet. With `--compact` the history
+is deleted with `compact()` before each measurement instead; `--no-ttl` skips the TTL index.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, List, Mapping
+
+from pymongo import AsyncMongoClient
+
+from agentlightning.store.collection.mongo import MongoBasedQueue, MongoClientPool
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1e6
+
+
+async def grow_history(queue: MongoBasedQueue[str], partition_id: str, count: int, chunk_size: int = 50000) -> None:
+    collection = await queue.ensure_collection()
+    now = datetime.now(timezone.utc)
+    for start in range(0, count, chunk_size):
+        docs = [
+            {
+                "partition_id": partition_id,
+                "value": f"history-{start + i}",
+                "consumed": True,
+                "consumed_at": now,
+            }
+            for i in range(min(chunk_size, count - start))
+        ]
+        await collection.insert_many(docs, ordered=False)
+
+
+async def run(
+    uri: str,
+    database: str,
+    history_steps: List[int],
+    items: int,
+    batch_size: int,
+    ttl: bool,
+    compact: bool,
+) -> None:
+    client = AsyncMongoClient[Mapping[str, Any]](uri)
+    client_pool = MongoClientPool[Mapping[str, Any]](client)
+    partition_id = "bench-" + uuid.uuid4().hex[:8]
+    queue = MongoBasedQueue(
+        client_pool,
+        database,
+        "bench_rollout_queue",
+        partition_id,
+        str,
+        consumed_ttl=3600 if ttl else None,
+    )
+    try:
+        history = 0
+        for target in history_steps:
+            # Compaction deleted the previous history, so it is grown from scratch.
+            await grow_history(queue, partition_id, target if compact else target - history)
+            history = target
+            if compact:
+                await queue.compact()
+
+            await queue.enqueue([f"item-{i}" for i in range(items)])
+            single: List[float] = []
+            for _ in range(items // 2):
+                start = time.perf_counter()
+                await queue.dequeue(1)
+                single.append(time.perf_counter() - start)
+            batched: List[float] = []
+            while True:
+                start = time.perf_counter()
+                claimed = await queue.dequeue(batch_size)
+                if not claimed:
+                    break
+                batched.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await queue.peek(10)
+            peek_latency = time.perf_counter() - start
+            start = time.perf_counter()
+            await queue.size()
+            size_latency = time.perf_counter() - start
+
+            print(
+                f"  history {history:>9d}: dequeue(1) p50 {percentile(single, 0.5):7.0f} us "
+                f"p99 {percentile(single, 0.99):7.0f} us | dequeue({batch_size}) p50 "
+                f"{percentile(batched, 0.5):7.0f} us | peek {peek_latency * 1e6:7.0f} us "
+                f"| size {size_latency * 1e6:7.0f} us"
+            )
+    finally:
+        await client_pool.close()
+        if database.startswith("bench"):
+            await client.drop_database(database)
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/?replicaSet=rs0")
+    parser.add_argument(
+        "--database", default="bench_agentlightning", help="Dropped at the end if it starts with 'bench'"
+    )
+    parser.add_argument(
+        "--history", type=int, nargs="+", default=[0, 10000, 100000, 1000000], help="Consumed items at each step"
+    )
+    parser.add_argument("--items", type=int, default=400, help="Items enqueued and dequeued at each step")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--no-ttl", action="store_true", help="Do not create the TTL index on consumed items")
+    parser.add_argument("--compact", action="store_true", help="Compact the history before each measurement")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run(
+            args.mongo_uri,
+            args.database,
+            sorted(args.history),
+            args.items,
+            args.batch_size,
+            not args.no_ttl,
+            args.compact,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: server round trips per store operation of MongoLightningStore
+
+Runs a small mix of store operations (start_rollout, add_span, query_spans, get_rollout_by_id,
+update_attempt) against a real MongoDB deployment (transactions need a replica set) and counts the
+commands sent to the server per operation, by command name.
+
+With `--invalidate-each-op`, the provisioning cache of the client pool is cleared before every
+operation, so that each operation creates the collections and indexes (`create`, `createIndexes`)
+on its way in, as an uncached provisioning path would. Compare the two runs to see the round trips
+saved by provisioning once per pool.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Mapping
+
+from pymongo import AsyncMongoClient
+from pymongo.monitoring import CommandFailedEvent, CommandListener, CommandStartedEvent, CommandSucceededEvent
+
+from agentlightning.store.mongo import MongoLightningStore
+from agentlightning.types import Span
+
+
+class CommandCounter(CommandListener):
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def started(self, event: CommandStartedEvent) -> None:
+        self.counts[event.command_name] += 1
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        pass
+
+
+async def run(uri: str, database: str, iterations: int, invalidate_each_op: bool) -> None:
+    counter = CommandCounter()
+    client = AsyncMongoClient[Mapping[str, Any]](uri, event_listeners=[counter])
+    partition_id = "bench-" + uuid.uuid4().hex[:8]
+    store = MongoLightningStore(client=client, database_name=database, partition_id=partition_id)
+    client_pool = store._client_pool  # pyright: ignore[reportPrivateUsage]
+    try:
+        # Warm up: provision everything once so that the first iteration is not special.
+        rollout = await store.start_rollout(input={})
+
+        counts: Dict[str, Counter[str]] = {}
+        elapsed: Dict[str, float] = {}
+
+        async def measure(name: str, operation: Callable[[], Awaitable[Any]]) -> None:
+            if invalidate_each_op:
+                client_pool.invalidate_collections()
+            counter.counts.clear()
+            start = time.perf_counter()
+            await operation()
+            elapsed[name] = elapsed.get(name, 0.0) + time.perf_counter() - start
+            counts.setdefault(name, Counter()).update(counter.counts)
+
+        for i in range(iterations):
+            span = Span.from_attributes(
+                rollout_id=rollout.rollout_id,
+                attempt_id=rollout.attempt.attempt_id,
+                sequence_id=i + 1,
+                attributes={"iteration": i},
+            )
+            await measure("start_rollout", lambda: store.start_rollout(input={}))
+            await measure("add_span", lambda: store.add_span(span))
+            await measure("query_spans", lambda: store.query_spans(rollout.rollout_id))
+            await measure("get_rollout_by_id", lambda: store.get_rollout_by_id(rollout.rollout_id))
+            await measure(
+                "update_attempt",
+                lambda: store.update_attempt(rollout.rollout_id, rollout.attempt.attempt_id, status="running"),
+            )
+
+        mode = "provisioning before every op" if invalidate_each_op else "provisioning cached per pool"
+        print(f"  {mode}, {iterations} iterations")
+        for name, op_counts in counts.items():
+            total = sum(op_counts.values()) / iterations
+            detail = ", ".join(f"{command} {count / iterations:.1f}" for command, count in op_counts.most_common())
+            print(f"    {name:20s} {elapsed[name] / iterations * 1e6:8.0f} us  {total:5.1f} commands  ({detail})")
+    finally:
+        await store.close()
+        if database.startswith("bench"):
+            await client.drop_database(database)
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/?replicaSet=rs0")
+    parser.add_argument(
+        "--database", default="bench_agentlightning", help="Dropped at the end if it starts with 'bench'"
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--invalidate-each-op", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.mongo_uri, args.database, args.iterations, args.invalidate_each_op))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: per-span ingestion latency of MongoLightningStore
+
+Adds spans one by one with `add_span` to a few rollouts, against a real MongoDB deployment
+(transactions need a replica set, e.g. `mongod --replSet rs0` after `rs.initiate()`).
+A command listener counts the commands sent to the server per `add_span`, by command name,
+which shows where the round trips go (lookups, counts, writes, transaction commits).
+
+Reported: add_span latency (p50 / p99) and the average number of commands per add_span.
+Use `--span-write-mode fast` to compare with the non-transactional span write path.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import Counter
+from typing import Any, List, Mapping
+
+from pymongo import AsyncMongoClient
+from pymongo.monitoring import CommandFailedEvent, CommandListener, CommandStartedEvent, CommandSucceededEvent
+
+from agentlightning.store.mongo import MongoLightningStore, MongoSpanWriteMode
+from agentlightning.types import AttemptedRollout, Span
+
+
+class CommandCounter(CommandListener):
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def started(self, event: CommandStartedEvent) -> None:
+        self.counts[event.command_name] += 1
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        pass
+
+
+def make_span(rollout: AttemptedRollout, sequence_id: int, rng: random.Random) -> Span:
+    return Span.from_attributes(
+        rollout_id=rollout.rollout_id,
+        attempt_id=rollout.attempt.attempt_id,
+        sequence_id=sequence_id,
+        attributes={"gen_ai.prompt.0.content": "x" * rng.randint(20, 400), "gen_ai.usage.prompt_tokens": 10},
+    )
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1e6
+
+
+async def run(
+    uri: str,
+    database: str,
+    rollouts: int,
+    spans_per_rollout: int,
+    background_spans: int,
+    span_write_mode: MongoSpanWriteMode,
+) -> None:
+    counter = CommandCounter()
+    client = AsyncMongoClient[Mapping[str, Any]](uri, event_listeners=[counter])
+    partition_id = "bench-" + uuid.uuid4().hex[:8]
+    store = MongoLightningStore(
+        client=client, database_name=database, partition_id=partition_id, span_write_mode=span_write_mode
+    )
+    rng = random.Random(0)
+    try:
+        # Existing spans of other rollouts make the counts and skips visible.
+        if background_spans:
+            rollout = await store.start_rollout(input={})
+            await store.add_spans([make_span(rollout, i + 1, rng) for i in range(background_spans)])
+
+        started = [await store.start_rollout(input={}) for _ in range(rollouts)]
+        spans = [make_span(rollout, i + 1, rng) for rollout in started for i in range(spans_per_rollout)]
+
+        counter.counts.clear()
+        latencies: List[float] = []
+        for span in spans:
+            start = time.perf_counter()
+            await store.add_span(span)
+            latencies.append(time.perf_counter() - start)
+
+        print(
+            f"  {len(spans)} spans over {rollouts} rollouts ({background_spans} background spans, {span_write_mode}): "
+            f"add_span p50 {percentile(latencies, 0.5):7.0f} us  p99 {percentile(latencies, 0.99):8.0f} us"
+        )
+        print(f"  commands per add_span: {sum(counter.counts.values()) / len(spans):.2f}")
+        for name, count in counter.counts.most_common():
+            print(f"    {name:24s} {count / len(spans):6.2f}")
+    finally:
+        await store.close()
+        if database.startswith("bench"):
+            await client.drop_database(database)
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/?replicaSet=rs0")
+    parser.add_argument(
+        "--database", default="bench_agentlightning", help="Dropped at the end if it starts with 'bench'"
+    )
+    parser.add_argument("--rollouts", type=int, default=4)
+    parser.add_argument("--spans", type=int, default=500, help="Spans added per rollout")
+    parser.add_argument("--background-spans", type=int, default=20000)
+    parser.add_argument("--span-write-mode", choices=["transaction", "fast"], default="transaction")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run(args.mongo_uri, args.database, args.rollouts, args.spans, args.background_spans, args.span_write_mode)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: span size estimators used by InMemoryLightningStore eviction
+
+Compares the default `estimate_span_size` with the full `estimate_model_size` walk on
+synthetic OpenTelemetry-shaped spans (LLM calls with prompts/completions, tool calls, events):
+
+1. Accuracy: ratio of the fast estimate to the full walk, per span and in total
+2. Overhead: microseconds per span for each estimator
+3. End to end: add_spans throughput of the in-memory store with each estimator
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Callable, List
+
+from agentlightning.store.memory import InMemoryLightningStore, estimate_model_size, estimate_span_size
+from agentlightning.types import Event, OtelResource, Span, SpanContext, TraceStatus
+
+
+def make_span(rng: random.Random, rollout_id: str, attempt_id: str, sequence_id: int) -> Span:
+    trace_id = f"{rng.getrandbits(128):032x}"
+    span_id = f"{rng.getrandbits(64):016x}"
+    kind = rng.choice(["llm", "llm", "tool", "agent"])
+    attributes = {"agentlightning.kind": kind}
+    events: List[Event] = []
+    if kind == "llm":
+        for i in range(rng.randint(1, 6)):
+            attributes[f"gen_ai.prompt.{i}.role"] = rng.choice(["system", "user", "assistant"])
+            attributes[f"gen_ai.prompt.{i}.content"] = "x" * rng.randint(50, 8000)
+        attributes["gen_ai.completion.0.content"] = "y" * rng.randint(20, 4000)
+        attributes["gen_ai.usage.prompt_tokens"] = rng.randint(10, 4000)
+        attributes["gen_ai.usage.completion_tokens"] = rng.randint(10, 2000)
+        attributes["llm.request.temperature"] = 0.7
+        attributes["prompt_token_ids"] = [rng.randint(0, 50000) for _ in range(rng.randint(0, 200))]
+    elif kind == "tool":
+        attributes["tool.name"] = "search"
+        attributes["tool.parameters"] = "{" + "q" * rng.randint(10, 300) + "}"
+        events.append(Event(name="tool.output", attributes={"output": "z" * rng.randint(10, 2000)}, timestamp=1.0))
+    return Span(
+        rollout_id=rollout_id,
+        attempt_id=attempt_id,
+        sequence_id=sequence_id,
+        trace_id=trace_id,
+        span_id=span_id,
+        parent_id=f"{rng.getrandbits(64):016x}" if rng.random() < 0.8 else None,
+        name=f"{kind}.call",
+        status=TraceStatus(status_code="OK"),
+        attributes=attributes,
+        events=events,
+        links=[],
+        start_time=time.time(),
+        end_time=time.time(),
+        context=SpanContext(trace_id=trace_id, span_id=span_id, is_remote=False, trace_state={}),
+        parent=None,
+        resource=OtelResource(
+            attributes={"service.name": "agent", "agentlightning.rollout_id": rollout_id}, schema_url=""
+        ),
+    )
+
+
+def time_per_span(estimator: Callable[[Span], int], spans: List[Span], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for span in spans:
+            estimator(span)
+        best = min(best, time.perf_counter() - start)
+    return best / len(spans) * 1e6
+
+
+async def add_spans_throughput(spans_by_rollout: int, num_rollouts: int, estimator: Callable[[Span], int]) -> float:
+    store = InMemoryLightningStore(span_size_estimator=estimator, watchdog_interval=None)
+    rng = random.Random(1)
+    batches: List[List[Span]] = []
+    for _ in range(num_rollouts):
+        rollout = await store.start_rollout(input={})
+        batches.append(
+            [make_span(rng, rollout.rollout_id, rollout.attempt.attempt_id, i + 1) for i in range(spans_by_rollout)]
+        )
+    start = time.perf_counter()
+    for batch in batches:
+        await store.add_spans(batch)
+    return spans_by_rollout * num_rollouts / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spans", type=int, default=2000, help="Number of synthetic spans")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    spans = [make_span(rng, "ro-bench", "at-bench", i + 1) for i in range(args.spans)]
+
+    full = [estimate_model_size(span) for span in spans]
+    fast = [estimate_span_size(span) for span in spans]
+    ratios = [f / m for f, m in zip(fast, full)]
+    print(f"Accuracy over {len(spans)} spans (fast / full):")
+    print(f"  total     {sum(fast) / sum(full):.3f}")
+    print(f"  per span  mean {statistics.mean(ratios):.3f}  min {min(ratios):.3f}  max {max(ratios):.3f}")
+
+    full_us = time_per_span(estimate_model_size, spans, args.repeat)
+    fast_us = time_per_span(estimate_span_size, spans, args.repeat)
+    print("Overhead per span:")
+    print(f"  estimate_model_size  {full_us:8.2f} us")
+    print(f"  estimate_span_size   {fast_us:8.2f} us  ({full_us / fast_us:.1f}x faster)")
+
+    print("InMemoryLightningStore.add_spans throughput (20 rollouts x 100 spans):")
+    for name, estimator in [("estimate_model_size", estimate_model_size), ("estimate_span_size", estimate_span_size)]:
+        throughput = asyncio.run(add_spans_throughput(100, 20, estimator))
+        print(f"  {name:20s} {throughput:10.0f} spans/s")
+
+
+if __name__ == "__main__":
+    main()
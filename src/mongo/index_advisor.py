@@ -0,0 +1,56 @@
+"""
+Index advisor: explain the canonical queries of MongoLightningStore
+
+Creates the store collections and indexes (if missing) and runs `explain()` on the lookups,
+filters and sorts issued by the store, printing the winning plan of each query with the indexes
+it uses. Queries that scan the whole collection (COLLSCAN) or sort in memory (SORT) are flagged.
+
+Exits with status 1 if any query scans a whole collection.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Mapping
+
+from pymongo import AsyncMongoClient
+
+from agentlightning.store.collection.mongo import MongoClientPool, MongoLightningCollections
+
+
+async def run(uri: str, database: str, partition_id: str) -> int:
+    client = AsyncMongoClient[Mapping[str, Any]](uri)
+    client_pool = MongoClientPool[Mapping[str, Any]](client)
+    try:
+        collections = MongoLightningCollections(client_pool, database, partition_id)
+        plans = await collections.explain_queries()
+    finally:
+        await client_pool.close()
+        await client.close()
+
+    collection_scans = 0
+    for plan in plans:
+        flags = []
+        if plan["collection_scan"]:
+            flags.append("COLLECTION SCAN")
+            collection_scans += 1
+        if plan["blocking_sort"]:
+            flags.append("BLOCKING SORT")
+        print(f"{plan['collection']:24s} {plan['query']:32s} {' > '.join(plan['stages'])}")
+        print(f"{'':24s} {'':32s} indexes: {', '.join(plan['indexes']) or '-'}  {' '.join(flags)}")
+    print(f"{len(plans)} queries explained, {collection_scans} collection scans")
+    return 1 if collection_scans else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/?replicaSet=rs0")
+    parser.add_argument("--database", default="agentlightning")
+    parser.add_argument("--partition-id", default="default")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.mongo_uri, args.database, args.partition_id)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Check: descending pages past the range-pagination offset keep the documents with a null sort key
+
+Starts rollouts in a fresh partition of MongoLightningStore and finishes most of them, so that more
+than `RANGE_PAGINATION_MIN_OFFSET` rollouts have an `end_time` and the others have none (null).
+Then pages through `query_rollouts(sort_by="end_time", sort_order="desc")`: in MongoDB, nulls sort
+before every other value, so the unfinished rollouts come last, on pages served by a range condition
+instead of `skip()`. Every rollout must be returned exactly once, in the same order as a single query.
+
+Exits with status 1 if a page misses or repeats a rollout.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from typing import Any, List, Mapping
+
+from pymongo import AsyncMongoClient
+
+from agentlightning.store.collection.mongo import RANGE_PAGINATION_MIN_OFFSET
+from agentlightning.store.mongo import MongoLightningStore
+
+
+async def run(uri: str, database: str, finished: int, unfinished: int, page_size: int) -> int:
+    client = AsyncMongoClient[Mapping[str, Any]](uri)
+    partition_id = "check-" + uuid.uuid4().hex[:8]
+    store = MongoLightningStore(client=client, database_name=database, partition_id=partition_id)
+    try:
+        rollouts = [await store.start_rollout(input={"index": i}) for i in range(finished + unfinished)]
+        for rollout in rollouts[:finished]:
+            await store.update_rollout(rollout.rollout_id, status="succeeded")
+
+        expected = [rollout.rollout_id for rollout in await store.query_rollouts(sort_by="end_time", sort_order="desc")]
+        paged: List[str] = []
+        for offset in range(0, len(rollouts), page_size):
+            page = await store.query_rollouts(sort_by="end_time", sort_order="desc", limit=page_size, offset=offset)
+            paged.extend(rollout.rollout_id for rollout in page)
+    finally:
+        await store.close()
+        if database.startswith("check"):
+            await client.drop_database(database)
+        await client.close()
+
+    missing = set(expected) - set(paged)
+    repeated = len(paged) - len(set(paged))
+    print(
+        f"{len(rollouts)} rollouts ({unfinished} with a null end_time), pages of {page_size}: "
+        f"{len(paged)} returned, {len(missing)} missing, {repeated} repeated"
+    )
+    if missing or repeated or paged != expected:
+        print("FAILED: the pages do not match the single query")
+        return 1
+    print("OK")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/?replicaSet=rs0")
+    parser.add_argument(
+        "--database", default="check_agentlightning", help="Dropped at the end if it starts with 'check'"
+    )
+    parser.add_argument("--finished", type=int, default=RANGE_PAGINATION_MIN_OFFSET + 200)
+    parser.add_argument("--unfinished", type=int, default=300)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.mongo_uri, args.database, args.finished, args.unfinished, args.page_size)))
+
+
+if __name__ == "__main__":
+    main()
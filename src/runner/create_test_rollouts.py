@@ -2,7 +2,7 @@
 Test script: Demonstrates how 4 workers share 20 rollouts
 
 This script will:
-1. Create 20 test rollouts (added to the queue using enqueue_rollout)
+1. Create 20 test rollouts (added to the queue using enqueue_rollouts)
 2. Start 4 workers
 3. Observe which rollouts are handled by each worker
 """
@@ -17,15 +17,15 @@ async def create_test_rollouts(num_rollouts: int = 20):
     
     print(f"Creating {num_rollouts} test rollouts and adding them to the queue...")
     
-    for i in range(num_rollouts):
-        # Use enqueue_rollout instead of start_rollout
-        # This will add the rollout to the queue so that workers can process it
-        await store.enqueue_rollout(
-            input={"prompt": f"Task {i+1}", "task_id": i+1},
-            mode="test",
-            metadata={"batch": "load_balancing_test"}
-        )
-        print(f"Enqueued Task {i+1}")
+    # Use enqueue_rollouts instead of start_rollout
+    # This adds all rollouts to the queue in a single request so that workers can process them
+    rollouts = await store.enqueue_rollouts(
+        [agl.EnqueueRolloutRequest(input={"prompt": f"Task {i+1}", "task_id": i+1}) for i in range(num_rollouts)],
+        mode="test",
+        metadata={"batch": "load_balancing_test"}
+    )
+    for i, rollout in enumerate(rollouts):
+        print(f"Enqueued Task {i+1} ({rollout.rollout_id})")
     
     await store.close()
     print(f"Created and enqueued {num_rollouts} rollouts")
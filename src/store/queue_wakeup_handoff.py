@@ -0,0 +1,67 @@
+"""
+Check: a queue wake-up absorbed by an exiting poller is handed over to the next poller
+
+Two pollers wait on the rollout queue of an InMemoryLightningStore. The first one receives the
+wake-up of an enqueue while it is busy in its claim, then returns without taking the rollout
+(e.g., it got what it wanted elsewhere). The second poller must still be woken up for the queued
+rollout, instead of sleeping until its timeout (which is unbounded without a recheck interval).
+
+Exits with status 1 if the second poller does not get the rollout in time.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Optional
+
+from agentlightning.store.memory import InMemoryLightningStore
+
+
+async def run(wait_timeout: float, max_latency: float) -> int:
+    store = InMemoryLightningStore()
+    claiming = asyncio.Event()
+    second_waiting = asyncio.Event()
+
+    async def first_claim() -> Optional[str]:
+        if not claiming.is_set():
+            claiming.set()
+            # Nothing queued yet: wait in the queue like any poller.
+            return None
+        await second_waiting.wait()
+        # A rollout is queued while this poller is busy claiming: the wake-up goes to this (oldest) poller.
+        await store.enqueue_rollout(input={"task": "handoff"})
+        return "satisfied elsewhere"
+
+    first = asyncio.create_task(store.poll_rollout_queue(first_claim, wait_timeout))
+    await claiming.wait()
+    second = asyncio.create_task(store.dequeue_rollout(wait_timeout=wait_timeout))
+    await asyncio.sleep(0.05)
+    # Wake up the first poller so that it runs its second claim.
+    await store.enqueue_rollout(input={"task": "wake up"})
+    start = time.perf_counter()
+    second_waiting.set()
+
+    await first
+    rollout = await second
+    latency = time.perf_counter() - start
+    await store.stop_watchdog()
+
+    if rollout is None or latency > max_latency:
+        print(f"FAILED: second poller got {rollout and rollout.rollout_id} after {latency:.3f} s")
+        return 1
+    print(f"OK: second poller got {rollout.rollout_id} ({rollout.input}) after {latency:.3f} s")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wait-timeout", type=float, default=10.0)
+    parser.add_argument("--max-latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.wait_timeout, args.max_latency)))
+
+
+if __name__ == "__main__":
+    main()